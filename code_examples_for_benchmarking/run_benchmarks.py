@@ -0,0 +1,251 @@
+"""
+Runs the manual vs. library-based task examples against the SIM7020 emulator and compares them.
+
+Usage:
+    python code_examples_for_benchmarking/run_benchmarks.py [--repeat N] [--latency S] [--sleep-scale F]
+                                                            [--json PATH]
+
+For every task variant the runner records wall time, UART round-trips (command writes),
+bytes written and read, and peak Python memory, then prints a comparison table.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sim7020py.emulator import SIM7020Emulator  # noqa: E402
+from sim7020py.sim7020 import SIM7020  # noqa: E402
+from sim7020py.transport import Transport  # noqa: E402
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APN = "nbiot"
+
+
+class CountingTransport(Transport):
+    """Wraps a transport and counts command lines (round-trips) and bytes in both directions."""
+
+    def __init__(self, inner: Transport):
+        self.inner = inner
+        self.round_trips = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def any(self) -> int:
+        return self.inner.any()
+
+    def readinto(self, buf) -> int | None:
+        nbytes = self.inner.readinto(buf)
+        self.bytes_read += nbytes or 0
+        return nbytes
+
+    def write(self, data) -> int:
+        if data[-1:] == b"\n":  # Commands may be written in pieces; count each line once
+            self.round_trips += 1
+        self.bytes_written += len(data)
+        return self.inner.write(data)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class EmulatedUART:
+    """``machine.UART`` look-alike over a transport, with MicroPython's blocking ``read()`` semantics."""
+
+    def __init__(self, transport: Transport, timeout: int = 5000, timeout_char: int = 10):
+        self.transport = transport
+        self.timeout = timeout
+        self.timeout_char = timeout_char
+
+    def any(self) -> int:
+        return self.transport.any()
+
+    def write(self, data) -> int:
+        return self.transport.write(data)
+
+    def read(self, nbytes: int | None = None) -> bytes | None:
+        """Waits up to ``timeout`` ms for data, then reads until the line is idle for ``timeout_char`` ms."""
+        data = b""
+        deadline = time.monotonic() + self.timeout / 1000
+        while time.monotonic() < deadline and (nbytes is None or len(data) < nbytes):
+            available = self.transport.any()
+            if not available:
+                time.sleep(0.001)
+                continue
+            buf = bytearray(available if nbytes is None else min(available, nbytes - len(data)))
+            data += bytes(buf[:self.transport.readinto(buf) or 0])
+            deadline = time.monotonic() + self.timeout_char / 1000
+        return data or None
+
+
+class Pin:
+    """``machine.Pin`` stand-in that only remembers its value."""
+
+    OUT = 1
+    IN = 0
+
+    def __init__(self, pin_id, mode=None):
+        self.pin_id = pin_id
+        self._value = 0
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = value
+
+
+def board_modules(sleep_scale: float) -> dict:
+    """Builds the ``machine`` and ``utime`` modules the MicroPython examples import."""
+    machine = types.ModuleType("machine")
+    machine.Pin = Pin
+    machine.UART = EmulatedUART
+
+    utime = types.ModuleType("utime")
+    utime.sleep = lambda seconds: time.sleep(seconds * sleep_scale)
+    utime.sleep_ms = lambda ms: time.sleep(ms * sleep_scale / 1000)
+    utime.ticks_ms = lambda: int(time.monotonic() * 1000)
+    utime.ticks_diff = lambda end, start: end - start
+    return {"machine": machine, "utime": utime}
+
+
+def load_example(path: str, namespace: dict) -> types.ModuleType:
+    """Executes an example file with the globals it assumes already defined."""
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(namespace)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_emulator(task: str, latency: float) -> SIM7020Emulator:
+    """Creates an emulator in the state each task expects."""
+    emulator = SIM7020Emulator(default_latency=latency, valid_apns=(APN,))
+    if task == "b":
+        emulator.apn = APN
+        emulator.attached = True  # Data transmission starts on an attached module
+    return emulator
+
+
+# Task -> (directory, title, {variant: (file, function, arguments)}); "manual" drives the UART directly,
+# every other variant gets a SIM7020 instance
+TASKS = {
+    "a": ("task_a_network_initialization", "network initialization", {
+        "manual": ("a_manual.py", "manual_initialize_network", (APN,)),
+        "library": ("a_library_based.py", "library_initialize_network", (APN,)),
+        "attach": ("a_library_based.py", "library_attach_network", (APN,)),
+    }),
+    "b": ("task_b_data_transmission", "data transmission", {
+        "manual": ("b_manual.py", "manual_mqtt_publish", ("broker.example", 1883, "bench", "ds/Bench", "hello")),
+        "library": ("b_library_based.py", "library_mqtt_publish",
+                    ("broker.example", 1883, "bench", "ds/Bench", "hello")),
+    }),
+    "c": ("task_c_error_handling", "error handling", {
+        "manual": ("c_manual.py", "manual_error_handling", ()),
+        "library": ("c_library_based.py", "library_error_handling", ()),
+    }),
+}
+
+
+def run_once(task: str, variant: str, latency: float) -> dict:
+    """Runs one example against a fresh emulator and returns its measurements."""
+    directory, _, variants = TASKS[task]
+    filename, function, args = variants[variant]
+    transport = CountingTransport(make_emulator(task, latency))
+    namespace = {"pwr_key": Pin(14, Pin.OUT)}
+    if variant == "manual":
+        namespace["uart"] = EmulatedUART(transport)
+    else:
+        namespace["sim7020"] = SIM7020(transport=transport, timeout=5)
+    transport.round_trips = transport.bytes_written = transport.bytes_read = 0
+
+    module = load_example(os.path.join(HERE, directory, filename), namespace)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = getattr(module, function)(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "result": result,
+        "wall_time_s": elapsed,
+        "round_trips": transport.round_trips,
+        "bytes_written": transport.bytes_written,
+        "bytes_read": transport.bytes_read,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(repeat: int = 3, latency: float = 0.05, sleep_scale: float = 0.0) -> list[dict]:
+    """
+    Runs every task variant ``repeat`` times and reports the median of each metric.
+
+    Args:
+        repeat (int, optional): Runs per example. Defaults to 3.
+        latency (float, optional): Emulated reply latency per command in seconds. Defaults to 0.05.
+        sleep_scale (float, optional): Factor applied to the examples' ``utime.sleep`` calls. Defaults to 0.0.
+
+    Returns:
+        list[dict]: One record per task and variant.
+    """
+    records = []
+    saved = {name: sys.modules.get(name) for name in ("machine", "utime")}
+    sys.modules.update(board_modules(sleep_scale))
+    try:
+        for task, (_, title, variants) in TASKS.items():
+            for variant in variants:
+                runs = [run_once(task, variant, latency) for _ in range(repeat)]
+                record = {"task": task, "title": title, "variant": variant,
+                          "result": all(run["result"] for run in runs)}
+                for key in ("wall_time_s", "round_trips", "bytes_written", "bytes_read", "peak_memory_bytes"):
+                    record[key] = statistics.median(run[key] for run in runs)
+                records.append(record)
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return records
+
+
+def format_table(records: list[dict]) -> str:
+    """Renders the records as a fixed-width comparison table."""
+    header = (f"{'task':<26} {'variant':<8} {'ok':<3} {'wall [s]':>9} {'trips':>6} "
+              f"{'tx [B]':>7} {'rx [B]':>7} {'peak mem [B]':>13}")
+    lines = [header, "-" * len(header)]
+    for record in records:
+        lines.append(f"{record['task'] + ' ' + record['title']:<26} {record['variant']:<8} "
+                     f"{'yes' if record['result'] else 'no':<3} {record['wall_time_s']:>9.3f} "
+                     f"{record['round_trips']:>6} {record['bytes_written']:>7} {record['bytes_read']:>7} "
+                     f"{record['peak_memory_bytes']:>13}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per example (median is reported)")
+    parser.add_argument("--latency", type=float, default=0.05, help="emulated reply latency per command [s]")
+    parser.add_argument("--sleep-scale", type=float, default=0.0,
+                        help="factor applied to utime.sleep() in the examples (1.0 = real time)")
+    parser.add_argument("--json", metavar="PATH", help="also write the records as JSON")
+    args = parser.parse_args()
+
+    records = run_benchmarks(args.repeat, args.latency, args.sleep_scale)
+    print(format_table(records))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(records, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,20 @@
 # Assumes the library is initialized
-from gsm_nbiot_lib import SIM7020
 import utime
 
-# Assumes UART_PORT, UART_BAUDRATE, PWR_EN_PIN are defined
-# sim7020 = SIM7020(UART_PORT, UART_BAUDRATE, "some_apn", PWR_EN_PIN)
+# Assumes sim7020 and pwr_key are defined (run_benchmarks.py injects both)
+# sim7020 = SIM7020(uart=uart, baudrate=UART_BAUDRATE, timeout=5)
+# pwr_key = Pin(14, Pin.OUT)
 
 def library_initialize_network(apn):
     try:
         # 1. Power on the module
-        sim7020.power_on(PWR_EN_PIN)
+        pwr_key.value(1)  # noqa: F821
         utime.sleep(2)
         
-        # 2. Check readiness, set APN, and connect
-        sim7020.at.send_command("AT")   # Check readiness
-        sim7020.configure_apn()         # CFUN0→APN→CFUN1→CGATT?→CGCONTRDP
-        sim7020.connect_network()
+        # 2. Check readiness, enable RF, set APN, and connect: the same commands as the manual variant
+        sim7020.initialize()            # AT, then CFUN=1
+        sim7020.set_apn(apn)            # CGDCONT
+        sim7020.connect_network()       # CGATT=1
         
         print("Network initialization successful.")
         return True
@@ -23,3 +23,17 @@ def library_initialize_network(apn):
         return False
 
 
+def library_attach_network(apn):
+    try:
+        # 1. Power on the module
+        pwr_key.value(1)  # noqa: F821
+        utime.sleep(2)
+        
+        # 2. Probe the state and run only the missing steps as one chained line
+        sim7020.attach(apn)             # CGATT?;CGDCONT?;CEREG? → CFUN=1;CGDCONT;CGATT=1
+        
+        print("Network initialization successful.")
+        return True
+    except Exception as e:
+        print(f"Error during network initialization: {e}")
+        return False
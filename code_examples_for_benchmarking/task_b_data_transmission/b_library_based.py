@@ -1,10 +1,10 @@
 # Assumes sim7020 and config variables are defined
-from gsm_nbiot_lib import MQTTClient
+from sim7020py import MQTTClient
 
 def library_mqtt_publish(broker, port, client_id, topic, message):
     try:
         # 1. Initialize the MQTT client
-        mqtt_client = MQTTClient(sim7020.at, broker, port, client_id, "")
+        mqtt_client = MQTTClient(sim7020.at_command, broker, port, client_id, "")
         
         # 2. Connect to the broker
         mqtt_client.connect()
@@ -16,4 +16,4 @@ def library_mqtt_publish(broker, port, client_id, topic, message):
         return True
     except Exception as e:
         print(f"Error during MQTT publish: {e}")
-        return False
\ No newline at end of file
+        return False
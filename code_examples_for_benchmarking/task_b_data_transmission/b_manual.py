@@ -1,4 +1,6 @@
 # Assumes uart is initialized and network is available
+import utime
+
 def manual_mqtt_publish(broker, port, client_id, topic, message):
     # 1. Configure the MQTT broker connection
     cmd_new = f'AT+CMQNEW="{broker}","{port}",12000,1024\r\n'
@@ -1,12 +1,12 @@
 # Assumes sim7020 is initialized
-from gsm_nbiot_lib import ATCommandError
+from sim7020py import ATCommandError
 
 def library_error_handling():
     invalid_apn = "invalid.apn"
     
     try:
         # The library encapsulates response validation
-        sim7020.configure_apn()
+        sim7020.set_apn(invalid_apn)
         
         # The connect_network() method will raise an exception on failure
         sim7020.connect_network()
@@ -18,5 +18,3 @@ def library_error_handling():
         print(f"Successfully caught network attachment error: {e}")
         return True
 
-from gsm_nbiot_lib import ATCommandError
-
@@ -1,4 +1,6 @@
 # Assumes uart is initialized
+import utime
+
 def manual_error_handling():
     invalid_apn = "invalid.apn"
     
@@ -1,4 +1,4 @@
-from sim7020py import ATCommandError, SIM7020, BlynkIntegration, save_state, load_state, parse_response
+from sim7020py import ATCommandError, SIM7020, BlynkIntegration, MQTTClient, save_state, load_state, parse_response
 import utime
 from machine import Pin, UART, deepsleep, lightsleep
 
@@ -27,6 +27,8 @@ print(uart)
 # Создание экземпляров SIM7020 и BlynkIntegration с увеличенным таймаутом
 sim_7020 = SIM7020(uart=uart, baudrate=UART_BAUDRATE, timeout=5)
 blynk = BlynkIntegration(uart=uart, apn=APN, blynk_token=BLYNK_TOKEN, timeout=5)
+mqtt = MQTTClient(sim_7020.at_command, BROKER_ADDRESS, 1883, DEVICE_NAME, DEVICE_SECRET, username="device",
+                  keepalive=45, version=3)
 
 
 # Функции управления питанием SIM7020
@@ -87,8 +89,10 @@ def send_and_process(cmd):
 # Настройка MQTT подключения
 def mqtt_connect():
     send_and_process("AT+CSQ")  # Проверка качества сигнала
-    send_and_process(f'AT+CMQNEW="{BROKER_ADDRESS}","1883",12000,1024')
-    send_and_process(f'AT+CMQCON=0,3,"{DEVICE_NAME}",45,1,0,"device","{DEVICE_SECRET}"')
+    try:
+        mqtt.connect()  # Соединение создаётся заново только после его разрыва
+    except ATCommandError as e:
+        print(f"Ошибка: {e}")
 
 
 # Управление состоянием лампы
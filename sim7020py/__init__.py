@@ -2,11 +2,35 @@ from .sim7020 import SIM7020
 from .blynk_integration import BlynkIntegration
 from .utils import save_state, load_state, parse_response, retry_operation, handle_timeout, extract_json_data
 from .commands import ATCommandError
+from .errors import ResponseTimeout, ParseError, ModemError, CMEError, SIMError, NetworkError, PDPError
+from .mqtt import MQTTClient
+from .httpclient import HTTPSession
+from .outbox import Outbox
+from .flashqueue import FlashQueue
+from .retry import RetryPolicy
+from .profiles import CommandProfile, register_profile
+from .latency import LatencyEstimator
+from .metrics import CommandMetrics
 
 __all__ = [
     "SIM7020",
     "BlynkIntegration",
     "ATCommandError",
+    "ResponseTimeout",
+    "ModemError",
+    "CMEError",
+    "SIMError",
+    "NetworkError",
+    "PDPError",
+    "MQTTClient",
+    "HTTPSession",
+    "Outbox",
+    "FlashQueue",
+    "RetryPolicy",
+    "CommandProfile",
+    "register_profile",
+    "LatencyEstimator",
+    "CommandMetrics",
     "save_state",
     "load_state",
     "parse_response",
@@ -0,0 +1,513 @@
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+import binascii
+
+from .commands import ATCommandError, ResponseCollector
+from .errors import ParseError
+from .urc import URCDispatcher, parse_mqtt_message
+from .blynk_integration import get_path, parse_pin_value, update_path
+from .sim7020 import PROBE_COMMAND, attach_plan
+from .logger import get_logger, level_of
+from .profiles import profile_for
+from .retry import RetryPolicy
+from .utils import parse_signal_quality
+
+logger = get_logger("sim7020py.aio")
+
+
+class AsyncATCommand:
+    """Non-blocking counterpart of ATCommand built on asyncio (CPython) or uasyncio (MicroPython) streams."""
+
+    def __init__(self, reader, writer=None, timeout: int = 1):
+        """
+        Initializes the engine over an already opened stream pair.
+
+        A background task owns the reader: lines belonging to the running command are handed
+        to it, everything else is dispatched as an unsolicited result code.
+
+        Args:
+            reader: Stream with an awaitable ``readline()``.
+            writer (optional): Stream with ``write()`` and awaitable ``drain()``. Defaults to the reader.
+            timeout (int, optional): Timeout for response waiting in seconds. Defaults to 1.
+        """
+        self.reader = reader
+        self.writer = writer if writer is not None else reader
+        self.timeout = timeout
+        self.urc = URCDispatcher()
+        self._lock = asyncio.Lock()
+        self._done = asyncio.Event()
+        self._collector = None
+        self._reader_task = None
+
+    @classmethod
+    def from_uart(cls, uart, timeout: int = 1) -> "AsyncATCommand":
+        """
+        Wraps a MicroPython ``machine.UART`` in a uasyncio stream.
+
+        Args:
+            uart (UART): Initialized UART instance.
+            timeout (int, optional): Timeout for response waiting in seconds. Defaults to 1.
+
+        Returns:
+            AsyncATCommand: Engine reading and writing through the UART.
+        """
+        stream = asyncio.StreamReader(uart)
+        return cls(stream, stream, timeout)
+
+    @classmethod
+    async def open_connection(cls, host: str, port: int, timeout: int = 1) -> "AsyncATCommand":
+        """
+        Connects to a modem exposed over TCP (e.g. a serial-to-network bridge).
+
+        Args:
+            host (str): Host name or address.
+            port (int): TCP port.
+            timeout (int, optional): Timeout for response waiting in seconds. Defaults to 1.
+
+        Returns:
+            AsyncATCommand: Engine reading and writing through the connection.
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, timeout)
+
+    def start(self) -> None:
+        """
+        Starts the background reader task if it is not running yet.
+        """
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """
+        Drains the stream forever, routing each line to the pending command or the URC dispatcher.
+        """
+        while True:
+            raw_line = await self.reader.readline()
+            if not raw_line:
+                break  # Stream closed
+            try:
+                line = raw_line.decode().strip()
+                if not line:
+                    continue
+                collector = self._collector
+                if collector is None:
+                    self.urc.dispatch(line)
+                elif collector.feed(line):
+                    self._done.set()
+            except Exception as e:  # A bad line must not stop the reader, or every later command times out
+                logger.error("Failed to process line %s: %s", raw_line, e)
+
+    async def send_command(self, command: str, expected_response: str = "OK",
+                           terminator: str | None = None, timeout: float | None = None) -> list[str]:
+        """
+        Sends an AT command and waits for a response without blocking other tasks.
+
+        Args:
+            command (str): AT command to send.
+            expected_response (str, optional): Expected response. Defaults to "OK".
+            terminator (str | None, optional): Additional line prefix that ends the response. Defaults to None
+                (the profile's terminator, see ``profiles``).
+            timeout (float | None, optional): Maximum wait in seconds. Defaults to None (the profile's timeout,
+                or the engine's ``timeout`` for commands without one).
+
+        Returns:
+            list[str]: Response from the module.
+
+        Raises:
+            ATCommandError: If the expected response is not received.
+        """
+        profile = profile_for(command, self.timeout)
+        if timeout is None:
+            timeout = self.timeout if profile.timeout is None else profile.timeout
+        self.start()
+        async with self._lock:
+            collector = ResponseCollector(command, self.urc, terminator or profile.terminator)
+            self._done.clear()
+            self._collector = collector
+            try:
+                self.writer.write((command + "\r\n").encode())  # Send the command
+                await self.writer.drain()
+                await asyncio.wait_for(self._done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._collector = None
+        return collector.result(expected_response)
+
+    def register_urc(self, prefix: str, handler) -> None:
+        """
+        Registers a handler for unsolicited result codes with the given prefix.
+
+        Args:
+            prefix (str): URC prefix including the colon, e.g. "+CMQPUB:".
+            handler (Callable[[str], None]): Called with the full URC line.
+        """
+        self.urc.register(prefix, handler)
+
+    async def check_connection(self) -> bool:
+        """
+        Checks the connection with the module using the AT command.
+
+        Returns:
+            bool: True if the module responds, False otherwise.
+        """
+        try:
+            response = await self.send_command("AT")
+            return "OK" in response
+        except ATCommandError:
+            return False
+
+    async def get_signal_quality(self) -> tuple[int, int]:
+        """
+        Requests the signal quality from the module (AT+CSQ command).
+
+        Returns:
+            tuple[int, int]: Signal quality (RSSI and BER).
+
+        Raises:
+            ATCommandError: If signal quality cannot be retrieved; the typed error of the failure, or ParseError
+                if the reply has no ``+CSQ`` line.
+        """
+        signal = parse_signal_quality(await self.send_command("AT+CSQ"))
+        if signal is None:
+            raise ParseError("Failed to retrieve signal quality")
+        return signal
+
+    async def set_apn(self, apn: str) -> None:
+        """
+        Sets the APN (Access Point Name) for network connection.
+
+        Args:
+            apn (str): The APN name.
+        """
+        await self.send_command(f'AT+CGDCONT=1,"IP","{apn}"')
+
+    async def connect_network(self) -> None:
+        """
+        Connects to the network (AT+CGATT=1 command).
+        """
+        await self.send_command("AT+CGATT=1")
+
+    async def disconnect_network(self) -> None:
+        """
+        Disconnects from the network (AT+CGATT=0 command).
+        """
+        await self.send_command("AT+CGATT=0")
+
+    async def close(self) -> None:
+        """
+        Stops the reader task and closes the stream.
+        """
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self.writer.close()
+        if hasattr(self.writer, "wait_closed"):
+            await self.writer.wait_closed()
+
+
+class AsyncSIM7020:
+    """Asynchronous variant of SIM7020 driving the module through an AsyncATCommand."""
+
+    def __init__(self, at_command: AsyncATCommand):
+        """
+        Initializes the SIM7020 over an asynchronous AT command engine.
+
+        Args:
+            at_command (AsyncATCommand): Engine connected to the module.
+        """
+        self.at_command = at_command
+        self._mqtt_callbacks = {}
+
+    async def initialize(self) -> None:
+        """
+        Checks the connection and enables the RF part of the module.
+
+        Raises:
+            ATCommandError: If connection to the SIM7020 module cannot be established.
+        """
+        if not await self.at_command.check_connection():
+            raise ATCommandError("Failed to establish connection with SIM7020 module")
+
+        logger.info("SIM7020 module successfully connected")
+        await self.enable_rf()
+
+    async def attach(self, apn: str) -> None:
+        """
+        Brings the module onto the network, running only the steps the probed state still needs
+        (see ``SIM7020.attach``).
+
+        Args:
+            apn (str): APN name for the network.
+
+        Raises:
+            ATCommandError: If the module does not respond or any step fails.
+        """
+        try:
+            steps = attach_plan(await self.at_command.send_command(PROBE_COMMAND), apn)
+        except ATCommandError:
+            if not await self.at_command.check_connection():
+                raise ATCommandError("Failed to establish connection with SIM7020 module")
+            steps = attach_plan([], apn)
+        if not steps:
+            logger.info("Already attached with APN '%s'", apn)
+            return
+        await self.at_command.send_command(steps[0] + "".join(";" + step[2:] for step in steps[1:]))
+        logger.info("Attached to network with APN '%s'", apn)
+
+    async def enable_rf(self) -> None:
+        """
+        Включает радиомодуль RF, отправляя команду AT+CFUN=1.
+        """
+        try:
+            await self.at_command.send_command("AT+CFUN=1", expected_response="OK")
+            logger.info("AT+CFUN=1 успешно отправлена")
+        except ATCommandError as e:
+            logger.error("Ошибка при отправке AT+CFUN=1: %s", e)
+
+    async def set_apn(self, apn: str) -> None:
+        """
+        Sets the APN for network connection.
+
+        Args:
+            apn (str): APN name for the network.
+        """
+        await self.at_command.set_apn(apn)
+        logger.info("APN '%s' successfully set", apn)
+
+    async def connect_network(self) -> None:
+        """
+        Connects the module to the NB-IoT network.
+        """
+        await self.at_command.connect_network()
+        logger.info("Network connection established")
+
+    async def disconnect_network(self) -> None:
+        """
+        Disconnects the module from the NB-IoT network.
+        """
+        await self.at_command.disconnect_network()
+        logger.info("Network disconnection completed")
+
+    async def get_signal_quality(self) -> tuple[int, int]:
+        """
+        Retrieves the signal quality metrics from the module.
+
+        Returns:
+            tuple[int, int]: RSSI (Received Signal Strength Indicator) and BER (Bit Error Rate).
+        """
+        rssi, ber = await self.at_command.get_signal_quality()
+        logger.info("Signal quality: RSSI=%s, BER=%s", rssi, ber)
+        return rssi, ber
+
+    async def close(self) -> None:
+        """
+        Terminates usage of the module and closes the stream.
+        """
+        await self.at_command.close()
+        logger.info("Connection with the module closed")
+
+    async def mqtt_new(self, broker_address: str, port: int = 1883, keepalive: int = 12000, buffer_size: int = 1024):
+        """
+        Создает новое MQTT-соединение.
+
+        Args:
+            broker_address (str): Адрес MQTT-брокера.
+            port (int, optional): Порт для подключения. Defaults to 1883.
+            keepalive (int, optional): Интервал keepalive. Defaults to 12000.
+            buffer_size (int, optional): Размер буфера. Defaults to 1024.
+        """
+        cmd = f'AT+CMQNEW="{broker_address}","{port}",{keepalive},{buffer_size}'
+        await self.at_command.send_command(cmd, expected_response="OK")
+        logger.info("MQTT-соединение создано")
+
+    async def mqtt_connect(self, client_id: str, clean_session: int = 1, keepalive: int = 12000, username: str = "",
+                           password: str = ""):
+        """
+        Подключается к MQTT-брокеру.
+
+        Args:
+            client_id (str): Идентификатор клиента.
+            clean_session (int, optional): Флаг чистой сессии. Defaults to 1.
+            keepalive (int, optional): Интервал keepalive. Defaults to 12000.
+            username (str, optional): Имя пользователя. Defaults to "".
+            password (str, optional): Пароль. Defaults to "".
+        """
+        cmd = f'AT+CMQCON=0,{clean_session},"{client_id}",{keepalive},1,0,"{username}","{password}"'
+        await self.at_command.send_command(cmd, expected_response="OK")
+        logger.info("Подключение к MQTT-брокеру выполнено")
+
+    async def mqtt_publish(self, topic: str, message: str, qos: int = 1, retain: int = 0):
+        """
+        Публикует сообщение в MQTT-топик.
+
+        Args:
+            topic (str): Топик для публикации.
+            message (str): Сообщение для отправки.
+            qos (int, optional): QoS уровень. Defaults to 1.
+            retain (int, optional): Флаг retain. Defaults to 0.
+        """
+        hex_message = binascii.hexlify(message.encode()).decode()
+        cmd = f'AT+CMQPUB=0,"{topic}",{qos},{retain},0,{len(hex_message)},"{hex_message}"'
+        await self.at_command.send_command(cmd, expected_response="OK")
+        logger.info("Сообщение опубликовано в топик %s: %s", topic, message)
+
+    async def mqtt_disconnect(self, mqtt_id: int = 0):
+        """
+        Отключается от MQTT-брокера и освобождает MQTT-соединение модуля.
+
+        Args:
+            mqtt_id (int, optional): Идентификатор MQTT-соединения. Defaults to 0.
+        """
+        await self.at_command.send_command(f"AT+CMQDISCON={mqtt_id}", expected_response="OK")
+        logger.info("Отключение от MQTT-брокера выполнено")
+
+    async def mqtt_subscribe(self, topic: str, qos: int = 1, callback=None):
+        """
+        Подписывается на MQTT-топик.
+
+        Args:
+            topic (str): Топик для подписки.
+            qos (int, optional): QoS уровень. Defaults to 1.
+            callback (Callable[[str, bytes], None] | None, optional): Вызывается для каждого входящего
+                сообщения топика фоновой задачей чтения. Defaults to None.
+        """
+        cmd = f'AT+CMQSUB=0,"{topic}",{qos}'
+        await self.at_command.send_command(cmd, expected_response="OK")
+        if callback is not None:
+            if not self._mqtt_callbacks:
+                self.at_command.register_urc("+CMQPUB:", self._on_mqtt_message)
+            self._mqtt_callbacks[topic] = callback
+        logger.info("Подписка на топик %s выполнена", topic)
+
+    def _on_mqtt_message(self, line: str):
+        """
+        Доставляет входящее MQTT-сообщение (URC +CMQPUB) подписчику топика.
+
+        Args:
+            line (str): Строка URC.
+        """
+        try:
+            topic, payload = parse_mqtt_message(line)
+        except ValueError:
+            logger.error("Некорректный URC: %s", line)
+            return
+        callback = self._mqtt_callbacks.get(topic)
+        if callback is not None:
+            callback(topic, payload)
+
+
+class AsyncBlynkIntegration:
+    """Asynchronous variant of BlynkIntegration; retries wait with ``await`` instead of blocking."""
+
+    def __init__(self, at_command: AsyncATCommand, apn: str, blynk_token: str, max_retries: int = 3,
+                 server: str = "blynk.cloud", retry_policy: RetryPolicy | None = None):
+        """
+        Initializes Blynk integration with APN settings and access token.
+
+        Args:
+            at_command (AsyncATCommand): Engine connected to the SIM7020.
+            apn (str): APN name for network connection.
+            blynk_token (str): Access token for Blynk.
+            max_retries (int, optional): Maximum retries for data send/receive failures. Defaults to 3.
+            server (str, optional): Blynk server host name. Defaults to "blynk.cloud".
+            retry_policy (RetryPolicy | None, optional): Retries of failed requests, awaited with ``acall()``.
+                Defaults to None (``max_retries`` attempts with jittered exponential backoff from 1 s).
+        """
+        self.sim7020 = AsyncSIM7020(at_command)
+        self.apn = apn
+        self.blynk_token = blynk_token
+        self.max_retries = max_retries
+        self.retry = retry_policy or RetryPolicy(max_retries, base_delay=1.0, async_sleep=asyncio.sleep)
+        self.server = server
+        self.connected = False  # Tracks connection status
+
+    def log(self, level: str, message: str, *args):
+        """
+        Logs a message through the module logger.
+
+        Args:
+            level (int | str): Level constant or name in any case, e.g. "INFO" or "warning"; an unknown name
+                logs at INFO.
+            message (str): Message or %-style format string, formatted only if the level is enabled.
+            *args: Format arguments.
+        """
+        logger.log(level_of(level), message, *args)
+
+    async def connect(self):
+        """
+        Connects to the network and initializes the connection with Blynk.
+        """
+        try:
+            await self.sim7020.attach(self.apn)
+            self.connected = True
+            logger.info("Connected to network and Blynk")
+        except Exception as e:
+            logger.error("Connection error: %s", e)
+            self.connected = False
+
+    async def ensure_connection(self):
+        """
+        Checks the connection and attempts reconnection if necessary.
+        """
+        if not self.connected:
+            logger.info("Attempting reconnection...")
+            await self.connect()
+
+    async def send_value(self, virtual_pin: int, value: str):
+        """
+        Sends data to a specified virtual pin in Blynk.
+
+        Args:
+            virtual_pin (int): The virtual pin number in Blynk.
+            value (str): The value to send.
+        """
+        await self.ensure_connection()
+
+        command = f'AT+HTTPGET="http://{self.server}{update_path(self.blynk_token, virtual_pin, value)}"'
+        try:
+            await self.retry.acall(self.sim7020.at_command.send_command, command, expected_response="OK")
+            logger.info("Value %s sent to virtual pin %s", value, virtual_pin)
+        except Exception as e:
+            logger.error("Failed to send value to virtual pin %s: %s", virtual_pin, e)
+
+    async def get_value(self, virtual_pin: int):
+        """
+        Retrieves data from a specified virtual pin in Blynk.
+
+        Args:
+            virtual_pin (int): The virtual pin number in Blynk.
+
+        Returns:
+            str | None: The retrieved value, or None if an error occurred.
+        """
+        await self.ensure_connection()
+
+        command = f'AT+HTTPGET="http://{self.server}{get_path(self.blynk_token, [virtual_pin])}"'
+        async def fetch():
+            return parse_pin_value(await self.sim7020.at_command.send_command(command, expected_response="OK"))
+
+        try:
+            data = await self.retry.acall(fetch)
+        except Exception as e:
+            logger.error("Failed to retrieve data from virtual pin %s: %s", virtual_pin, e)
+            return None
+        logger.info("Retrieved value %s from virtual pin %s", data, virtual_pin)
+        return data
+
+    async def disconnect(self):
+        """
+        Disconnects from Blynk and the NB-IoT network.
+        """
+        await self.sim7020.disconnect_network()
+        self.connected = False
+        logger.info("Disconnected from Blynk and NB-IoT network")
+
+    async def close(self):
+        """
+        Closes the connection with the SIM7020 module.
+        """
+        await self.sim7020.close()
+        logger.info("Closed connection with SIM7020")
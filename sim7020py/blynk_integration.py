@@ -1,54 +1,290 @@
 from .sim7020 import SIM7020
-from machine import UART
-import time
+from .commands import UART, ATCommandError
+from .errors import ParseError
+import json
+from .logger import get_logger, level_of
+from .httpclient import HTTPSession
+from .outbox import Outbox
+from .parsers import parse_http
+from .retry import RetryPolicy
+from .utils import ticks_ms, ticks_diff
+
+logger = get_logger("sim7020py.blynk")
+
+# Characters sent unescaped in URL query values
+_URL_SAFE = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_.~"
+
+
+def _pin_name(virtual_pin) -> str:
+    """Formats a virtual pin as Blynk's query parameter name, e.g. 3 -> "V3"."""
+    virtual_pin = str(virtual_pin)
+    return virtual_pin if virtual_pin.startswith("V") else "V" + virtual_pin
+
+
+def _url_value(value) -> str:
+    """Percent-encodes a value for use in a URL query string."""
+    return "".join(char if char in _URL_SAFE else "".join(f"%{byte:02X}" for byte in char.encode())
+                   for char in str(value))
+
+
+def update_path(token: str, virtual_pin, value) -> str:
+    """Path and query setting one pin through Blynk's HTTP API, e.g. ``/external/api/update?token=t&V1=25``."""
+    return f"/external/api/update?token={token}&{_pin_name(virtual_pin)}={_url_value(value)}"
+
+
+def get_path(token: str, virtual_pins) -> str:
+    """Path and query reading pins through Blynk's HTTP API, e.g. ``/external/api/get?token=t&V1&V2``."""
+    return f"/external/api/get?token={token}" + "".join("&" + _pin_name(pin) for pin in virtual_pins)
+
+
+def check_status(http):
+    """
+    Checks the status of an HTTP response.
+
+    Args:
+        http (HTTPResponse): The response.
+
+    Returns:
+        HTTPResponse: The same response.
+
+    Raises:
+        ATCommandError: If the server answered with an HTTP error status.
+    """
+    if http.status is not None and http.status != 200:
+        raise ATCommandError(f"HTTP {http.status}: {http.body}")
+    return http
+
+
+def check_http(response: list[str]):
+    """
+    Parses the reply to an AT+HTTPGET command and checks the HTTP status.
+
+    Args:
+        response (list[str]): Reply lines to the AT+HTTPGET command.
+
+    Returns:
+        HTTPResponse: The parsed reply.
+
+    Raises:
+        ATCommandError: If the server answered with an HTTP error status.
+    """
+    return check_status(parse_http(response))
+
+
+def _pin_value(body: str) -> str:
+    """Extracts a single pin value: bare (``25``), quoted (``"25"``) or the first element of an array (``["25"]``)."""
+    body = body.strip()
+    if body.startswith("["):
+        body = body[1:-1].split(",", 1)[0]
+    return body.strip().strip('"')
+
+
+def _pin_values(body: str, names: list) -> dict:
+    """
+    Maps the body of a Blynk ``/external/api/get`` reply to pin name -> value.
+
+    Blynk answers a read of one pin with the bare value and a read of several pins with a JSON object keyed by
+    pin name; a JSON array in request order is accepted as well.
+
+    Args:
+        body (str): Response body.
+        names (list): Requested pin names, e.g. ``["V0", "V1"]``.
+
+    Returns:
+        dict: Pin name (upper case) -> value (str), without pins the server returned no value for.
+
+    Raises:
+        ParseError: If the body is none of the above.
+    """
+    body = body.strip()
+    if len(names) == 1 and not body.startswith("{"):
+        return {names[0]: _pin_value(body)}
+    try:
+        values = json.loads(body)
+    except ValueError:
+        values = None
+    if isinstance(values, list) and len(values) == len(names):
+        values = dict(zip(names, values))
+    if not isinstance(values, dict):
+        raise ParseError(f"Unexpected Blynk reply: {body}")
+    return {str(name).upper(): str(value) for name, value in values.items() if value is not None}
+
+
+def parse_pin_value(response: list[str]) -> str:
+    """
+    Extracts a pin value from the reply to a Blynk read of a single pin (see ``get_path``).
+
+    Blynk answers with the bare value; a quoted value or a JSON array such as ``["25"]`` is accepted as well, and
+    for multi-value pins the first element is returned.
+
+    Args:
+        response (list[str]): Reply lines to the AT+HTTPGET command.
+
+    Returns:
+        str: The value.
+
+    Raises:
+        ATCommandError: If the server answered with an HTTP error status.
+    """
+    return _pin_value(check_http(response).body)
 
 
 class BlynkIntegration:
     """Class for integrating with the Blynk platform using the SIM7020 module."""
 
-    def __init__(self, uart: UART, apn: str, blynk_token: str, baudrate: int = 9600, timeout: int = 1,
-                 max_retries: int = 3):
+    def __init__(self, uart: UART = None, apn: str = "", blynk_token: str = "", baudrate: int = 9600,
+                 timeout: int = 1, max_retries: int = 3, server: str = "blynk.cloud", port: str | None = None,
+                 transport=None, queue=None, cache_ttl: float = 0, keep_alive: bool = False, retry_policy=None):
         """
         Initializes Blynk integration with APN settings and access token.
 
         Args:
-            uart (UART): UART object for SIM7020.
+            uart (UART, optional): UART object for SIM7020. Defaults to None.
             apn (str): APN name for network connection.
             blynk_token (str): Access token for Blynk.
             baudrate (int, optional): UART connection speed. Defaults to 9600.
             timeout (int, optional): Response timeout in seconds. Defaults to 1.
             max_retries (int, optional): Maximum retries for data send/receive failures. Defaults to 3.
+            server (str, optional): Blynk server host name. Defaults to "blynk.cloud".
+            port (str | None, optional): Host port instead of a UART (see ``open_transport``). Defaults to None.
+            transport (Transport | None, optional): Ready-made transport. Defaults to None.
+            queue (FlashQueue | None, optional): Stores values that could not be sent and resends them
+                after the next successful ``connect()``. Defaults to None (such values are lost).
+            cache_ttl (float, optional): Seconds a value read from Blynk is served from the local cache.
+                MQTT downlink messages invalidate it early. Defaults to 0 (no caching).
+            keep_alive (bool, optional): Send all requests over one persistent HTTP session (AT+CHTTPSEND)
+                created at connect time, instead of a one-shot AT+HTTPGET per request. Defaults to False.
+            retry_policy (RetryPolicy | None, optional): Retries of failed requests. Defaults to None
+                (``max_retries`` attempts with jittered exponential backoff from 1 s).
         """
-        self.sim7020 = SIM7020(uart, baudrate, timeout)
+        self.sim7020 = SIM7020(uart, baudrate, timeout, port=port, transport=transport)
+        self.server = server
         self.apn = apn
         self.blynk_token = blynk_token
         self.max_retries = max_retries
+        self.retry = retry_policy or RetryPolicy(max_retries, base_delay=1.0)
         self.connected = False  # Tracks connection status
+        self.queue = queue
+        self.cache_ttl_ms = int(cache_ttl * 1000)
+        self._cache = {}  # Pin name -> (value, tick when read)
+        if self.cache_ttl_ms:
+            self.sim7020.at_command.register_urc("+CMQPUB:", self._on_downlink)
+        self.http = HTTPSession(self.sim7020.at_command, f"http://{server}") if keep_alive else None
+
+    def log(self, level: str, message: str, *args):
+        """
+        Logs a message through the module logger.
 
-    def log(self, level: str, message: str):
-        """Simple logger to simulate a logging module."""
-        print(f"[{level}] {message}")
+        Args:
+            level (int | str): Level constant or name in any case, e.g. "INFO" or "warning"; an unknown name
+                logs at INFO.
+            message (str): Message or %-style format string, formatted only if the level is enabled.
+            *args: Format arguments.
+        """
+        logger.log(level_of(level), message, *args)
 
     def connect(self):
         """
         Connects to the network and initializes the connection with Blynk.
         """
         try:
-            self.sim7020.initialize()
-            self.sim7020.set_apn(self.apn)
-            self.sim7020.connect_network()
+            self.sim7020.attach(self.apn)
+            if self.http is not None:
+                self.http.open()
             self.connected = True
-            self.log("INFO", "Connected to network and Blynk")
+            logger.info("Connected to network and Blynk")
         except Exception as e:
-            self.log("ERROR", f"Connection error: {e}")
+            logger.error("Connection error: %s", e)
             self.connected = False
+            return
+        if self.queue:
+            self.flush_queue()
+
+    def flush_queue(self) -> int:
+        """
+        Sends the values stored in the queue while the connection was down, oldest first.
+
+        Returns:
+            int: Number of values sent; the rest stay queued if sending fails.
+        """
+        try:
+            sent = self.queue.drain(self._send_records)
+        except ATCommandError as e:
+            logger.warning("Queue drain interrupted, %d values left: %s", len(self.queue), e)
+            return 0
+        logger.info("Sent %d queued values", sent)
+        return sent
+
+    def _send_records(self, records: list):
+        """
+        Sends queued ``[virtual_pin, value]`` records, as many per batch request as possible without
+        reordering updates of the same pin.
+
+        Args:
+            records (list): Records taken from the queue.
+
+        Raises:
+            ATCommandError: If a value cannot be sent.
+        """
+        values = {}
+        for virtual_pin, value in records:
+            if virtual_pin in values:
+                self._batch_update(values)
+                values = {}
+            values[virtual_pin] = value
+        if values:
+            self._batch_update(values)
+
+    def _get(self, path: str):
+        """
+        Sends a GET request to the Blynk server, over the persistent session if ``keep_alive`` is set.
+
+        Args:
+            path (str): Path and query, e.g. "/external/api/get?token=<token>&V0".
+
+        Returns:
+            HTTPResponse: The response.
+
+        Raises:
+            ATCommandError: If the request fails or the server answers with an HTTP error status.
+        """
+        if self.http is not None:
+            return check_status(self.http.get(path))
+        return check_http(self.sim7020.at_command.send_command(f'AT+HTTPGET="http://{self.server}{path}"',
+                                                                expected_response="OK"))
+
+    def _update(self, virtual_pin: int, value: str):
+        """
+        Sends one value to a virtual pin, without retries.
+
+        Args:
+            virtual_pin (int): The virtual pin number in Blynk.
+            value (str): The value to send.
+
+        Raises:
+            ATCommandError: If the request fails.
+        """
+        self._get(update_path(self.blynk_token, virtual_pin, value))
+
+    def _batch_update(self, values: dict):
+        """
+        Sends several pin values in one request to Blynk's batch update endpoint, without retries.
+
+        Args:
+            values (dict): Virtual pin -> value.
+
+        Raises:
+            ATCommandError: If the request fails.
+        """
+        query = "".join(f"&{_pin_name(pin)}={_url_value(value)}" for pin, value in values.items())
+        self._get(f"/external/api/batch/update?token={self.blynk_token}{query}")
 
     def ensure_connection(self):
         """
         Checks the connection and attempts reconnection if necessary.
         """
         if not self.connected:
-            self.log("INFO", "Attempting reconnection...")
+            logger.info("Attempting reconnection...")
             self.connect()
 
     def send_value(self, virtual_pin: int, value: str):
@@ -60,24 +296,170 @@ class BlynkIntegration:
             value (str): The value to send.
         """
         self.ensure_connection()
+        if not self.connected and self.queue is not None:
+            self._enqueue(virtual_pin, value)  # No point in retrying without a network
+            return
+
+        try:
+            self.retry.call(self._update, virtual_pin, value)
+            self._remember(virtual_pin, value)
+            logger.info("Value %s sent to virtual pin %s", value, virtual_pin)
+            return
+        except Exception as e:
+            logger.error("Failed to send value to virtual pin %s: %s", virtual_pin, e)
+        if self.queue is not None:
+            self.connected = False  # Reconnect, and drain the queue, before the next send
+            self._enqueue(virtual_pin, value)
+
+    def send_values(self, values: dict):
+        """
+        Sends several virtual pin values in one HTTP request (Blynk batch update).
+
+        Args:
+            values (dict): Virtual pin -> value, e.g. ``{0: 21.5, 1: "on"}``.
+        """
+        if not values:
+            return
+        self.ensure_connection()
+        if not self.connected and self.queue is not None:
+            for virtual_pin, value in values.items():
+                self._enqueue(virtual_pin, value)
+            return
+
+        try:
+            self.retry.call(self._batch_update, values)
+            for virtual_pin, value in values.items():
+                self._remember(virtual_pin, value)
+            logger.info("Values sent to %d virtual pins", len(values))
+            return
+        except Exception as e:
+            logger.error("Failed to send values to %d virtual pins: %s", len(values), e)
+        if self.queue is not None:
+            self.connected = False
+            for virtual_pin, value in values.items():
+                self._enqueue(virtual_pin, value)
+
+    def _enqueue(self, virtual_pin: int, value: str):
+        """
+        Stores a value that could not be sent in the queue.
+
+        Args:
+            virtual_pin (int): The virtual pin number in Blynk.
+            value (str): The value.
+        """
+        if self.queue.put([virtual_pin, value]):
+            logger.info("Queued value %s for virtual pin %s (%d queued)", value, virtual_pin, len(self.queue))
+
+    def outbox(self, window: float = 1.0, max_latency: float = 5.0, max_items: int = 16) -> Outbox:
+        """
+        Creates a queue that coalesces pin updates: ``put(pin, value)`` keeps only the latest value per pin
+        and sends the pending pins in one batch request once the window expires. Call its ``poll()``
+        from the main loop.
+
+        Args:
+            window (float, optional): Quiet time in seconds before sending. Defaults to 1.0.
+            max_latency (float, optional): Maximum age of a pending value in seconds. Defaults to 5.0.
+            max_items (int, optional): Number of pending pins that triggers an immediate send. Defaults to 16.
+
+        Returns:
+            Outbox: The queue.
+        """
+        return Outbox(self.send_values, window, max_latency, max_items)
+
+    def _remember(self, virtual_pin, value):
+        """
+        Stores a pin value in the cache, if caching is enabled.
+
+        Args:
+            virtual_pin (int | str): The virtual pin.
+            value (Any): Its current value.
+        """
+        if self.cache_ttl_ms:
+            self._cache[_pin_name(virtual_pin)] = (str(value), ticks_ms())
+
+    def _cached(self, virtual_pin):
+        """
+        Looks up a pin value that is still fresh.
 
-        # Assumes the variable self.blynk_server_ip is defined
-        # If not, it should be added to the configuration
-        command = f'AT+HTTPGET="http://{self.sim7020.at_command.broker_address}/{self.blynk_token}/update/{virtual_pin}?value={value}"'
-        for attempt in range(self.max_retries):
-            try:
-                self.sim7020.at_command.send_command(command, expected_response="OK")
-                self.log("INFO", f"Value {value} sent to virtual pin {virtual_pin}")
-                return
-            except Exception as e:
-                self.log("WARNING", f"Attempt {attempt + 1} failed: {e}")
-                time.sleep(1)
+        Args:
+            virtual_pin (int | str): The virtual pin.
+
+        Returns:
+            str | None: The cached value, or None if missing or expired.
+        """
+        entry = self._cache.get(_pin_name(virtual_pin))
+        if entry is None or ticks_diff(ticks_ms(), entry[1]) >= self.cache_ttl_ms:
+            return None
+        return entry[0]
+
+    def invalidate(self, virtual_pin=None):
+        """
+        Drops cached values so the next read goes to Blynk.
+
+        Args:
+            virtual_pin (int | str | None, optional): Pin to drop. Defaults to None (all pins).
+        """
+        if virtual_pin is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(_pin_name(virtual_pin), None)
 
-        self.log("ERROR", f"Failed to send value to virtual pin {virtual_pin} after {self.max_retries} attempts")
+    def _on_downlink(self, line: str):
+        """
+        Invalidates the cache when an MQTT downlink arrives: only the pin named by the topic's last word
+        (e.g. "downlink/ds/Integer V0"), or every pin if the topic names none.
+
+        Args:
+            line (str): ``+CMQPUB`` URC line.
+        """
+        topic = line.split('"')[1] if line.count('"') >= 2 else ""
+        word = topic.replace("/", " ").split(" ")[-1]
+        if len(word) > 1 and word[0] in "Vv" and word[1:].isdigit():
+            self.invalidate(word[1:])
+        else:
+            self.invalidate()
+
+    def get_values(self, virtual_pins: list) -> dict:
+        """
+        Retrieves several virtual pins; pins not in the cache are fetched together in one request.
+
+        Args:
+            virtual_pins (list): Virtual pins, e.g. ``[0, 1, 2]``.
+
+        Returns:
+            dict: Virtual pin -> value (str) for every pin that could be read.
+        """
+        values = {}
+        missing = []
+        for virtual_pin in virtual_pins:
+            value = self._cached(virtual_pin)
+            if value is None:
+                missing.append(virtual_pin)
+            else:
+                values[virtual_pin] = value
+        if not missing:
+            return values
+
+        self.ensure_connection()
+        names = [_pin_name(pin) for pin in missing]
+        path = get_path(self.blynk_token, missing)
+        try:
+            fetched = self.retry.call(lambda: _pin_values(self._get(path).body, names))
+        except Exception as e:
+            logger.error("Failed to retrieve %d virtual pins: %s", len(missing), e)
+            return values
+
+        for virtual_pin, name in zip(missing, names):
+            value = fetched.get(name)
+            if value is not None:
+                values[virtual_pin] = value
+                self._remember(virtual_pin, value)
+        logger.info("Retrieved %d virtual pins", len(missing))
+        return values
 
     def get_value(self, virtual_pin: int):
         """
-        Retrieves data from a specified virtual pin in Blynk.
+        Retrieves data from a specified virtual pin in Blynk, served from the cache while fresh.
 
         Args:
             virtual_pin (int): The virtual pin number in Blynk.
@@ -85,34 +467,50 @@ class BlynkIntegration:
         Returns:
             str | None: The retrieved value, or None if an error occurred.
         """
+        if self.cache_ttl_ms:
+            value = self._cached(virtual_pin)
+            if value is not None:
+                return value
         self.ensure_connection()
 
-        # Similarly, assumes self.blynk_server_ip is defined
-        command = f'AT+HTTPGET="http://{self.sim7020.at_command.broker_address}/{self.blynk_token}/get/{virtual_pin}"'
-        for attempt in range(self.max_retries):
-            try:
-                response = self.sim7020.at_command.send_command(command, expected_response="OK")
-                data = response[-1].split()[-1]  # Example of response parsing
-                self.log("INFO", f"Retrieved value {data} from virtual pin {virtual_pin}")
-                return data
-            except Exception as e:
-                self.log("WARNING", f"Attempt {attempt + 1} failed: {e}")
-                time.sleep(1)
-
-        self.log("ERROR", f"Failed to retrieve data from virtual pin {virtual_pin} after {self.max_retries} attempts")
-        return None
+        path = get_path(self.blynk_token, [virtual_pin])
+        try:
+            data = self.retry.call(lambda: _pin_value(self._get(path).body))
+        except Exception as e:
+            logger.error("Failed to retrieve data from virtual pin %s: %s", virtual_pin, e)
+            return None
+        self._remember(virtual_pin, data)
+        logger.info("Retrieved value %s from virtual pin %s", data, virtual_pin)
+        return data
 
     def disconnect(self):
         """
         Disconnects from Blynk and the NB-IoT network.
         """
+        if self.http is not None:
+            self.http.close()
         self.sim7020.disconnect_network()
         self.connected = False
-        self.log("INFO", "Disconnected from Blynk and NB-IoT network")
+        logger.info("Disconnected from Blynk and NB-IoT network")
 
     def close(self):
         """
         Closes the connection with the SIM7020 module.
         """
         self.sim7020.close()
-        self.log("INFO", "Closed connection with SIM7020")
+        logger.info("Closed connection with SIM7020")
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the per-command metrics of the module.
+
+        Returns:
+            dict: Command key -> counters and latency histogram (see ``CommandMetrics.stats``).
+        """
+        return self.sim7020.stats()
+
+    def reset_stats(self) -> None:
+        """
+        Clears the per-command metrics of the module.
+        """
+        self.sim7020.reset_stats()
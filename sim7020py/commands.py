@@ -1,37 +1,327 @@
 import time
-from machine import UART
+try:
+    from machine import UART
+except ImportError:  # Running on a host
+    UART = None
+from .transport import Transport, UARTTransport, open_transport
+from .ringbuffer import RingBuffer, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_ERROR
+from .urc import URCDispatcher, line_prefix
+from .errors import ATCommandError, ModemError, ParseError, ResponseTimeout, error_from_response
+from .logger import get_logger
+from .parsers import Record, find
+from .profiles import PROFILES, profile_for
+from .latency import command_key
+from .metrics import CommandMetrics, OUTCOME_OK, OUTCOME_ERROR, OUTCOME_TIMEOUT
+from .utils import ticks_ms, ticks_diff, hexlify_into
 
+logger = get_logger("sim7020py.commands")
 
-class ATCommandError(Exception):
-    """Exception for AT command errors."""
-    pass
+FINAL_RESPONSES = ("OK", "ERROR", "SEND OK", "SEND FAIL")
+
+# Longest command line accepted when concatenating commands with ";"
+MAX_COMMAND_LINE = 256
+
+# +CME ERROR codes the modem may report for a chained line it cannot parse (besides a plain ERROR)
+CHAIN_SYNTAX_CME_CODES = (4, 50)
+
+# Size of the preallocated buffer payloads are hex-encoded through by ``send_hex_command``
+HEX_BUFFER_SIZE = 128
+
+# Commands that must not share a line with others (long payloads or data-mode prompts)
+NO_CONCAT_PREFIXES = ("AT+CMQPUB", "AT+HTTP", "AT+CHTTPSEND", "AT+SEND")
+
+
+def is_final_response(line: str, terminator: str | None = None) -> bool:
+    """
+    Checks whether a response line terminates an AT command reply.
+
+    Args:
+        line (str): A single, stripped response line.
+        terminator (str | None, optional): Additional line prefix that ends the reply. Defaults to None.
+
+    Returns:
+        bool: True if no further lines belong to the reply.
+    """
+    if line in FINAL_RESPONSES or line.startswith("+CME ERROR"):
+        return True
+    return terminator is not None and line.startswith(terminator)
+
+
+class BatchResult:
+    """Outcome of a single command executed as part of a batch."""
+
+    __slots__ = ("command", "response", "error")
+
+    def __init__(self, command: str, response: list[str] | None = None, error: Exception | None = None):
+        """
+        Args:
+            command (str): The command.
+            response (list[str] | None, optional): Reply lines, None if the command did not run. Defaults to None.
+            error (Exception | None, optional): Error raised by the command. Defaults to None.
+        """
+        self.command = command
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the command ran and succeeded."""
+        return self.response is not None and self.error is None
+
+    def __repr__(self):
+        return f"BatchResult({self.command!r}, ok={self.ok})"
+
+
+def first_failure(results: list[BatchResult]) -> BatchResult | None:
+    """
+    Finds the first command of a batch that failed.
+
+    Args:
+        results (list[BatchResult]): Results returned by ``ATCommand.send_batch``.
+
+    Returns:
+        BatchResult | None: The failed result, or None if every command succeeded.
+    """
+    for result in results:
+        if result.error is not None:
+            return result
+    return None
+
+
+def _can_concatenate(command: str) -> bool:
+    """Only extended commands without payloads may be chained with ";"."""
+    if not command.startswith("AT+"):
+        return False
+    for prefix in NO_CONCAT_PREFIXES:
+        if command.startswith(prefix):
+            return False
+    return True
+
+
+class ResponseCollector:
+    """Accumulates the reply to a single command; shared by the blocking and asyncio engines."""
+
+    def __init__(self, command: str, urc: URCDispatcher, terminator: str | None = None,
+                 max_size: int | None = None, overflow: int = OVERFLOW_DROP_OLDEST):
+        """
+        Starts collecting the reply to a command.
+
+        Args:
+            command (str): The command that was sent.
+            urc (URCDispatcher): Dispatcher receiving unsolicited lines.
+            terminator (str | None, optional): Additional line prefix that ends the reply. Defaults to None.
+            max_size (int | None, optional): Maximum total length of the reply lines. Defaults to None (unbounded).
+            overflow (int, optional): ``OVERFLOW_*`` policy applied when the reply exceeds ``max_size``.
+                Defaults to OVERFLOW_DROP_OLDEST.
+        """
+        self.command = command
+        self.urc = urc
+        self.terminator = terminator
+        self.max_size = max_size
+        self.overflow = overflow
+        self.lines = []
+        self.size = 0
+        self.truncated = False
+        self.finished = False
+
+    def feed(self, line: str) -> bool:
+        """
+        Consumes one response line.
+
+        Args:
+            line (str): A single, stripped, non-empty line.
+
+        Returns:
+            bool: True once the final result code has been received.
+        """
+        if self.finished or self.urc.is_urc(line, self.command):
+            self.urc.dispatch(line)  # Unsolicited, or trailing the final result code
+            return self.finished
+
+        self.finished = is_final_response(line, self.terminator)
+        if self.max_size is not None and self.size + len(line) > self.max_size:
+            self._overflow(line)
+        else:
+            self.lines.append(line)
+            self.size += len(line)
+        return self.finished
+
+    def _overflow(self, line: str) -> None:
+        """
+        Applies the overflow policy to a line that does not fit into ``max_size``.
+
+        The final result code is always kept so the reply can still be validated.
+
+        Args:
+            line (str): The line that does not fit.
+
+        Raises:
+            ATCommandError: Under OVERFLOW_ERROR.
+        """
+        if self.overflow == OVERFLOW_ERROR:
+            raise ATCommandError(f"Response to '{self.command}' exceeds {self.max_size} bytes")
+        self.truncated = True
+        if self.overflow == OVERFLOW_DROP_NEWEST and not self.finished:
+            return
+        while self.lines and self.size + len(line) > self.max_size:
+            self.size -= len(self.lines.pop(0))
+        self.lines.append(line)
+        self.size += len(line)
+
+    def result(self, expected_response: str = "OK") -> list[str]:
+        """
+        Validates the collected reply.
+
+        Args:
+            expected_response (str, optional): Expected response. Defaults to "OK".
+
+        Returns:
+            list[str]: Response from the module.
+
+        Raises:
+            ATCommandError: If the expected response is not received: a ``CMEError`` subclass for
+                ``+CME ERROR: <n>``, ``ModemError`` for ``ERROR``, ``ParseError`` for another finished reply and
+                ``ResponseTimeout`` if the reply never finished.
+        """
+        logger.debug("Parsed response lines: %s", self.lines)
+        if expected_response not in self.lines:
+            raise error_from_response(self.lines, self.command, expected_response, self.finished)
+        return self.lines
 
 
 class ATCommand:
-    """Class for sending and handling AT commands for the SIM7020 module via UART."""
+    """Class for sending and handling AT commands for the SIM7020 module over a UART or host transport."""
 
-    def __init__(self, uart: UART, baudrate: int = 9600, timeout: int = 1):
+    def __init__(self, uart: UART = None, baudrate: int = 9600, timeout: int = 1, rx_buffer_size: int = 512,
+                 max_response_size: int = 4096, overflow: int = OVERFLOW_DROP_OLDEST, port: str | None = None,
+                 transport: Transport | None = None, profiles: dict | None = None, latency=None,
+                 metrics=True):
         """
-        Initializes a connection with the module via UART.
+        Initializes a connection with the module.
+
+        Exactly one of ``uart``, ``port`` or ``transport`` selects how the module is reached:
+        a MicroPython UART, a host port specification (see ``open_transport``), or any ``Transport``.
 
         Args:
-            uart (UART): UART instance from the machine module.
+            uart (UART, optional): UART instance from the machine module. Defaults to None.
             baudrate (int, optional): Data transfer rate. Defaults to 9600.
-            timeout (int, optional): Timeout for response waiting in seconds. Defaults to 1.
+            timeout (int, optional): Timeout for response waiting in seconds, for commands without a profile.
+                Defaults to 1.
+            rx_buffer_size (int, optional): Size of the preallocated receive ring buffer. Defaults to 512.
+            max_response_size (int, optional): Maximum total length of one reply. Defaults to 4096.
+            overflow (int, optional): ``OVERFLOW_*`` policy for the receive buffer and over-long replies.
+                Defaults to OVERFLOW_DROP_OLDEST.
+            port (str | None, optional): Host serial device, "socket://host:port" or "pty:/dev/pts/N".
+                Defaults to None.
+            transport (Transport | None, optional): Ready-made transport. Defaults to None.
+            profiles (dict | None, optional): Command name -> ``CommandProfile`` with per-command timeouts,
+                settle times and terminators. Defaults to None (the shared ``profiles.PROFILES``).
+            latency (LatencyEstimator | None, optional): Learns each command's round-trip time and shortens
+                its timeout accordingly, never beyond the profile's. Defaults to None (fixed timeouts).
+            metrics (CommandMetrics | bool, optional): Per-command counters and latency histogram; True creates
+                them, False disables them. Defaults to True.
+
+        Raises:
+            ValueError: If no way to reach the module is given.
         """
-        self.uart = uart
+        if transport is None:
+            if port is not None:
+                transport = open_transport(port, baudrate, timeout)
+            elif uart is not None:
+                transport = UARTTransport(uart, baudrate, timeout)
+            else:
+                raise ValueError("One of uart, port or transport is required")
+        self.transport = transport
         self.baudrate = baudrate
         self.timeout = timeout
-        self.uart.init(baudrate=self.baudrate, timeout=self.timeout)
+        self.max_response_size = max_response_size
+        self.overflow = overflow
+        self.profiles = PROFILES if profiles is None else profiles
+        self.latency = latency
+        self.metrics = CommandMetrics() if metrics is True else (metrics or None)
+        self._rx_bytes = 0  # Bytes read from the transport so far
+        self._before_hooks = []
+        self._after_hooks = []
+        self._hooked = False  # Whether any hook is registered; commands skip all hook work otherwise
+        self._late = None  # (tick, grace_ms) after a timeout: the module may still send that command's result
+        self.urc = URCDispatcher()
+        self._rx = RingBuffer(rx_buffer_size, overflow)
+        self._hex_buf = bytearray(HEX_BUFFER_SIZE)
 
-    def send_command(self, command: str, expected_response: str = "OK", delay: float = 0.5) -> list[str]:
+    def send_command(self, command: str, expected_response: str = "OK", delay: float | None = None,
+                     terminator: str | None = None, timeout: float | None = None, wait_urc: bool = False) -> list[str]:
         """
         Sends an AT command and waits for a response.
 
+        Reading stops as soon as a final result code (see ``FINAL_RESPONSES``, ``+CME ERROR: <n>``)
+        or the terminator is received; the timeout is only an upper bound. Settle time, terminator
+        and timeout default to the command's profile (see ``profiles``).
+
         Args:
             command (str): AT command to send.
             expected_response (str, optional): Expected response. Defaults to "OK".
-            delay (float, optional): Delay before reading the response in seconds. Defaults to 0.5.
+            delay (float | None, optional): Settle time before reading the response in seconds. Defaults to None
+                (the profile's ``min_wait``).
+            terminator (str | None, optional): Additional line prefix that ends the response. Defaults to None
+                (the profile's terminator).
+            timeout (float | None, optional): Maximum wait in seconds. Defaults to None (the profile's timeout,
+                or the engine's ``timeout`` for commands without one, shortened by the learned latency).
+            wait_urc (bool, optional): Also wait for the URC completing the operation (the profile's ``urc``),
+                within the profile's timeout from sending. Defaults to False.
+
+        Returns:
+            list[str]: Response from the module, followed by the completing URC if ``wait_urc`` is set.
+
+        Raises:
+            ATCommandError: If the expected response is not received.
+            ResponseTimeout: If ``wait_urc`` is set and the completing URC does not arrive in time.
+        """
+        profile = profile_for(command, self.timeout, self.profiles)
+        if wait_urc and profile.urc is not None:
+            return self._send_and_wait_urc(command, expected_response, delay, terminator, timeout, profile)
+        self.poll()  # Route anything that arrived between commands before it pollutes this reply
+        if delay is None:
+            delay = profile.min_wait
+        maximum = self.timeout if profile.timeout is None else profile.timeout
+        if timeout is None:
+            timeout = self._timeout(command, maximum)
+        return self._transact(command, expected_response, terminator or profile.terminator, timeout, delay,
+                              grace=max(0, maximum - timeout))
+
+    def _send_and_wait_urc(self, command: str, expected_response: str, delay: float | None,
+                           terminator: str | None, timeout: float | None, profile) -> list[str]:
+        """
+        Sends a command, then waits for the URC completing it (``profile.urc``), see ``send_command``.
+        """
+        start_time = ticks_ms()
+        limit = (self.timeout if profile.timeout is None else profile.timeout) * 1000
+        received = []
+        handler = received.append
+        self.urc.register(profile.urc, handler)  # Before sending: the URC may trail the reply in the same read
+        try:
+            lines = self.send_command(command, expected_response, delay, terminator, timeout)
+            while not received:
+                remaining = limit - ticks_diff(ticks_ms(), start_time)
+                if remaining <= 0:
+                    raise ResponseTimeout(f"No {profile.urc} after '{command}'")
+                self.poll(remaining / 1000)
+        finally:
+            self.urc.unregister(profile.urc, handler)
+        return lines + received[:1]
+
+    def send_hex_command(self, header: str, payload, trailer: str = '"', expected_response: str = "OK") -> list[str]:
+        """
+        Sends a command whose last parameter is a hex-encoded payload, e.g. AT+CMQPUB.
+
+        The command line is written in pieces: the header, the payload hex-encoded chunk by chunk through a
+        preallocated buffer, then the trailer. Neither the hex string nor the full command line is ever
+        built, so peak memory does not grow with the payload size.
+
+        Args:
+            header (str): Command up to the payload, e.g. 'AT+CMQPUB=0,"topic",1,0,0,10,"'.
+            payload (bytes | bytearray | memoryview | str): Payload; strings are sent UTF-8 encoded.
+            trailer (str, optional): Text following the payload. Defaults to '"'.
+            expected_response (str, optional): Expected response. Defaults to "OK".
 
         Returns:
             list[str]: Response from the module.
@@ -39,25 +329,405 @@ class ATCommand:
         Raises:
             ATCommandError: If the expected response is not received.
         """
-        self.uart.write((command + "\r\n").encode())  # Send the command
-        time.sleep(delay)  # Wait for the response
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.poll()
+        profile = profile_for(header, self.timeout, self.profiles)
+        maximum = self.timeout if profile.timeout is None else profile.timeout
+        timeout = self._timeout(header, maximum)
+        return self._transact(header, expected_response, None, timeout, 0, payload, trailer, maximum - timeout)
+
+    def _write(self, command: str, payload=None, trailer: str = '"') -> int:
+        """
+        Writes a command line, with a hex-encoded payload between ``command`` and ``trailer`` if given.
+
+        Args:
+            command (str): The command, or the header preceding the payload.
+            payload (bytes | bytearray | memoryview | None, optional): Payload to hex-encode chunk by chunk
+                through the preallocated buffer. Defaults to None (plain command).
+            trailer (str, optional): Text following the payload. Defaults to '"'.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        if payload is None:
+            self.transport.write((command + "\r\n").encode())  # Send the command
+            return len(command) + 2
+        buf = self._hex_buf
+        view = memoryview(buf)
+        chunk = len(buf) // 2
+        self.transport.write(command.encode())
+        for start in range(0, len(payload), chunk):
+            written = hexlify_into(payload, buf, start, min(start + chunk, len(payload)))
+            self.transport.write(view[:written])
+        self.transport.write((trailer + "\r\n").encode())
+        return len(command) + 2 * len(payload) + len(trailer) + 2
+
+    def _timeout(self, command: str, maximum: float | None) -> float:
+        """
+        Picks the timeout of a command: the learned one if latency learning is enabled, capped by ``maximum``.
+
+        Args:
+            command (str): The command (or its header).
+            maximum (float | None): Profile timeout; None for the engine's ``timeout``.
 
-        response = b""
-        start_time = time.ticks_ms()
+        Returns:
+            float: Timeout in seconds.
+        """
+        if maximum is None:
+            maximum = self.timeout
+        if self.latency is None:
+            return maximum
+        return self.latency.timeout(command_key(command), maximum)
 
-        while time.ticks_diff(time.ticks_ms(), start_time) < self.timeout * 1000:
-            if self.uart.any():  # Check if data is available
-                data = self.uart.read(self.uart.any())
-                response += data
-                print(f"Received data: {data}")  # Print received data
+    def _transact(self, command: str, expected_response: str, terminator: str | None, timeout: float,
+                  delay: float = 0, payload=None, trailer: str = '"', grace: float = 0) -> list[str]:
+        """
+        Writes a command and reads its reply.
 
-        response_lines = response.decode().splitlines()
-        print(f"Parsed response lines: {response_lines}")  # Print parsed response lines
+        Everything from the before hooks to the end of the reply runs under one ``try``, so the after hooks
+        and the metrics see every command that was started, also when writing or reading fails.
 
-        if expected_response not in response_lines:
-            raise ATCommandError(f"Expected response '{expected_response}' not received")
+        Args:
+            command (str): The command, or the header preceding a payload.
+            expected_response (str): Expected response.
+            terminator (str | None): Additional line prefix that ends the response.
+            timeout (float): Maximum wait for the reply in seconds.
+            delay (float, optional): Settle time before reading the reply in seconds. Defaults to 0.
+            payload (bytes | bytearray | memoryview | None, optional): Hex-encoded payload (see ``_write``).
+                Defaults to None.
+            trailer (str, optional): Text following the payload. Defaults to '"'.
+            grace (float, optional): Seconds beyond ``timeout`` the module may still answer, e.g. up to the
+                profile's maximum when the timeout was learned. Defaults to 0.
 
-        return response_lines
+        Returns:
+            list[str]: Response from the module.
+
+        Raises:
+            ATCommandError: If the expected response is not received.
+        """
+        if self._late is not None:
+            self._drain_late()
+        holding = self.urc.hold()  # URC handlers run once the reply is complete, so they may send commands
+        start_time = ticks_ms()  # Metrics and hooks include writing the payload and the settle time
+        if self._hooked:
+            self._begin(command, start_time)
+        outcome = OUTCOME_ERROR
+        sent = 0
+        rx_start = self._rx_bytes
+        try:
+            sent = self._write(command, payload, trailer)
+            if delay:
+                time.sleep(delay)  # Give slow commands time to settle
+            lines = self._collect(command, expected_response, terminator, timeout, ticks_ms())
+            outcome = OUTCOME_OK
+            return lines
+        except ResponseTimeout:
+            outcome = OUTCOME_TIMEOUT
+            self._late = (ticks_ms(), int(grace * 1000))
+            raise
+        finally:
+            if self.metrics is not None or self._hooked:
+                end_time = ticks_ms()
+                received = self._rx_bytes - rx_start
+                if self.metrics is not None:
+                    self.metrics.record(command_key(command), outcome, ticks_diff(end_time, start_time), sent,
+                                        received)
+                if self._hooked:
+                    self._end(command, start_time, end_time, outcome, sent, received)
+            if holding:
+                self.urc.release()
+
+    def _drain_late(self) -> None:
+        """
+        Discards the late result of a timed-out command before the next one is written, so it cannot be taken
+        for the next command's reply. Waits for it while the module may still send it; URCs are dispatched.
+        """
+        since, grace = self._late
+        self._late = None
+        while True:
+            for line in self._read_lines():
+                if is_final_response(line):
+                    logger.warning("Discarding late result: %s", line)
+                    return
+                if self.urc.is_urc(line):
+                    self.urc.dispatch(line)
+                else:
+                    logger.debug("Discarding late line: %s", line)
+            remaining = grace - ticks_diff(ticks_ms(), since)
+            if remaining <= 0:
+                return
+            self.transport.wait(remaining)
+
+    def _collect(self, command: str, expected_response: str, terminator: str | None, timeout: float,
+                 start_time: int) -> list[str]:
+        """
+        Reads the reply to a command that has just been written.
+
+        Args:
+            command (str): The command (or its header) that was sent.
+            expected_response (str): Expected response.
+            terminator (str | None): Additional line prefix that ends the response.
+            timeout (float): Maximum wait in seconds.
+            start_time (int): Tick from which the timeout runs: the end of the write and settle time, which the
+                modem's response time (and thus the learned latency) does not include.
+
+        Returns:
+            list[str]: Response from the module.
+
+        Raises:
+            ATCommandError: If the expected response is not received.
+        """
+        collector = ResponseCollector(command, self.urc, terminator, self.max_response_size, self.overflow)
+        limit = timeout * 1000
+
+        while not collector.finished:
+            lines = self._read_lines()
+            for line in lines:
+                collector.feed(line)
+            remaining = limit - ticks_diff(ticks_ms(), start_time)
+            if remaining <= 0:
+                break
+            if not lines and not collector.finished:
+                self.transport.wait(int(remaining))  # Sleep until the modem sends more
+
+        if self.latency is not None:
+            if collector.finished:
+                self.latency.observe(command_key(command), ticks_diff(ticks_ms(), start_time))
+            else:
+                self.latency.backoff(command_key(command))
+
+        if not collector.finished and len(self._rx):
+            partial = self._rx.read(len(self._rx)).decode().strip()  # e.g. a "> " data prompt
+            if partial:
+                collector.lines.append(partial)
+
+        return collector.result(expected_response)
+
+    def add_hook(self, before=None, after=None) -> None:
+        """
+        Registers profiling hooks called around every command, e.g. to trace transactions or toggle a GPIO
+        for a scope. Without hooks, commands do no hook work at all.
+
+        Args:
+            before (Callable[[str, int], None] | None, optional): Called with the command and the tick just
+                before it is written. Defaults to None.
+            after (Callable[[str, int, int, int, int, int], None] | None, optional): Called with the command,
+                start tick, end tick, outcome (``metrics.OUTCOME_*``), bytes sent and bytes received once the
+                reply is complete or timed out. Defaults to None.
+        """
+        if before is not None:
+            self._before_hooks.append(before)
+        if after is not None:
+            self._after_hooks.append(after)
+        self._hooked = bool(self._before_hooks or self._after_hooks)
+
+    def remove_hook(self, before=None, after=None) -> None:
+        """
+        Unregisters hooks added with ``add_hook``; hooks that are not registered are ignored.
+
+        Args:
+            before (Callable | None, optional): Before hook to remove. Defaults to None.
+            after (Callable | None, optional): After hook to remove. Defaults to None.
+        """
+        if before in self._before_hooks:
+            self._before_hooks.remove(before)
+        if after in self._after_hooks:
+            self._after_hooks.remove(after)
+        self._hooked = bool(self._before_hooks or self._after_hooks)
+
+    def _begin(self, command: str, start_time: int) -> None:
+        """Runs the before hooks of a command about to be written."""
+        for hook in self._before_hooks:
+            try:
+                hook(command, start_time)
+            except Exception as e:
+                logger.error("Before hook failed for %s: %s", command, e)
+
+    def _end(self, command: str, start_time: int, end_time: int, outcome: int, sent: int, received: int) -> None:
+        """Runs the after hooks of a completed command."""
+        for hook in self._after_hooks:
+            try:
+                hook(command, start_time, end_time, outcome, sent, received)
+            except Exception as e:
+                logger.error("After hook failed for %s: %s", command, e)
+
+    def _read_lines(self) -> list[str]:
+        """
+        Reads whatever the transport has buffered and returns the complete lines received so far.
+
+        Partial lines are kept until the rest arrives, so a line split across reads or
+        across two commands is never lost.
+
+        Returns:
+            list[str]: Complete, stripped, non-empty lines.
+
+        Raises:
+            ATCommandError: If the receive buffer overflows under OVERFLOW_ERROR.
+        """
+        available = self.transport.any()  # Check if data is available
+        if available:
+            try:
+                received = self._rx.fill(self.transport, available)
+            except OverflowError as e:
+                self._rx.clear()
+                raise ATCommandError(f"Receive buffer overflow: {e}")
+            self._rx_bytes += received
+            logger.debug("Received %d bytes", received)
+
+        lines = []
+        while True:
+            raw_line = self._rx.readline()
+            if raw_line is None:
+                return lines
+            line = raw_line.decode().strip()
+            if line:
+                lines.append(line)
+
+    def poll(self, timeout: float = 0) -> int:
+        """
+        Drains the transport and dispatches every complete line as an unsolicited result code.
+
+        Call this from the main loop to receive URCs (e.g. MQTT downlink) while no command is running.
+
+        Args:
+            timeout (float, optional): Seconds to sleep waiting for a line if none is pending. Defaults to 0.
+
+        Returns:
+            int: Number of lines dispatched.
+        """
+        lines = self._read_lines()
+        if not lines and timeout > 0 and self.transport.wait(int(timeout * 1000)):
+            lines = self._read_lines()
+        for line in lines:
+            if self._late is not None and is_final_response(line):
+                logger.warning("Discarding late result: %s", line)  # Of a command that timed out
+                self._late = None
+                continue
+            self.urc.dispatch(line)
+        return len(lines)
+
+    def register_urc(self, prefix: str, handler) -> None:
+        """
+        Registers a handler for unsolicited result codes with the given prefix.
+
+        Args:
+            prefix (str): URC prefix including the colon, e.g. "+CMQPUB:".
+            handler (Callable[[str], None]): Called with the full URC line.
+        """
+        self.urc.register(prefix, handler)
+
+    def wait_for_urc(self, prefix: str, timeout: float | None = None) -> str | None:
+        """
+        Blocks until a URC with the given prefix arrives, dispatching any others meanwhile.
+
+        Args:
+            prefix (str): URC prefix including the colon.
+            timeout (float | None, optional): Maximum wait in seconds. Defaults to the instance timeout.
+
+        Returns:
+            str | None: The URC line, or None if it did not arrive in time.
+        """
+        received = []
+        handler = received.append
+        self.urc.register(prefix, handler)
+        try:
+            start_time = ticks_ms()
+            limit = (self.timeout if timeout is None else timeout) * 1000
+            while not received:
+                remaining = limit - ticks_diff(ticks_ms(), start_time)
+                if remaining <= 0:
+                    break
+                self.poll(remaining / 1000)
+        finally:
+            self.urc.unregister(prefix, handler)
+        return received[0] if received else None
+
+    def send_batch(self, commands: list[str], concatenate: bool = True,
+                   stop_on_error: bool = True) -> list[BatchResult]:
+        """
+        Executes a sequence of commands with as few round-trips as possible.
+
+        Consecutive extended commands are chained on one line (``AT+CFUN=1;+CGDCONT=...``) up to
+        ``MAX_COMMAND_LINE`` characters; the rest are sent back-to-back. Info lines of a chained reply
+        are attributed to the command with the matching name. The modem aborts a chained line at the
+        first failing command without saying which one it was, so a line rejected with ``ERROR`` (or a
+        ``+CME ERROR`` in ``CHAIN_SYNTAX_CME_CODES``) is replayed command by command to pinpoint it;
+        chain only commands that are safe to repeat. Any other failure of a chained line is raised.
+
+        Args:
+            commands (list[str]): AT commands in execution order.
+            concatenate (bool, optional): Chain commands on one line where possible. Defaults to True.
+            stop_on_error (bool, optional): Skip the remaining commands after a failure. Defaults to True.
+
+        Returns:
+            list[BatchResult]: One result per command, in order; use ``first_failure`` to find the culprit.
+
+        Raises:
+            ATCommandError: If a chained line times out (``ResponseTimeout``: the modem may have run part of
+                it) or fails with any other error than the ones replayed.
+        """
+        results = [BatchResult(command) for command in commands]
+        index = 0
+        while index < len(results):
+            group = [results[index]]
+            if concatenate and _can_concatenate(group[0].command):
+                length = len(group[0].command)
+                for result in results[index + 1:]:
+                    length += len(result.command) - 1  # "AT+X" becomes ";+X"
+                    if not _can_concatenate(result.command) or length > MAX_COMMAND_LINE:
+                        break
+                    group.append(result)
+            index += len(group)
+
+            if len(group) == 1 or not self._send_chained(group):
+                for result in group:
+                    try:
+                        result.response = self.send_command(result.command)
+                    except ATCommandError as e:
+                        result.error = e
+                        if stop_on_error:
+                            break
+
+            if stop_on_error and first_failure(group) is not None:
+                break
+        return results
+
+    def _send_chained(self, group: list[BatchResult]) -> bool:
+        """
+        Sends a group of commands as one concatenated line.
+
+        Args:
+            group (list[BatchResult]): Results to fill in; all commands must be chainable.
+
+        Returns:
+            bool: True if the line succeeded, False if it has to be replayed command by command.
+
+        Raises:
+            ATCommandError: If the line fails otherwise than with ``ERROR`` or a ``CHAIN_SYNTAX_CME_CODES`` code.
+        """
+        line = group[0].command + "".join(";" + result.command[2:] for result in group[1:])
+        try:
+            response = self.send_command(line)
+        except ModemError as e:
+            if type(e) is ModemError or e.code in CHAIN_SYNTAX_CME_CODES:
+                return False
+            raise
+
+        for result in group:
+            result.response = []
+        for reply_line in response[:-1]:
+            owner = group[0]
+            prefix = line_prefix(reply_line)
+            if prefix is not None:
+                for result in group:
+                    if result.command[2:].startswith(prefix[:-1]):
+                        owner = result
+                        break
+            owner.response.append(reply_line)
+        for result in group:
+            result.response.append(response[-1])
+        return True
 
     def check_connection(self) -> bool:
         """
@@ -72,6 +742,33 @@ class ATCommand:
         except ATCommandError:
             return False
 
+    def query(self, command: str, prefix: str | None = None) -> Record:
+        """
+        Sends a command and parses its information response into a typed record (see ``parsers``).
+
+        Args:
+            command (str): AT command to send, e.g. "AT+CSQ" or "AT+CGATT?".
+            prefix (str | None, optional): Prefix of the information line. Defaults to the command name,
+                e.g. "+CGATT:" for "AT+CGATT?".
+
+        Returns:
+            Record: The parsed information response.
+
+        Raises:
+            ATCommandError: If the command fails (the typed error from ``send_command``), or ParseError if its
+                reply has no parsable information line.
+        """
+        if prefix is None:
+            prefix = command[2:].split("=", 1)[0].rstrip("?") + ":"
+        response = self.send_command(command)
+        try:
+            record = find(response, prefix)
+        except ValueError as e:
+            raise ParseError(str(e)) from e
+        if record is None:
+            raise ParseError(f"No '{prefix}' line in the response to '{command}'")
+        return record
+
     def get_signal_quality(self) -> tuple[int, int]:
         """
         Requests the signal quality from the module (AT+CSQ command).
@@ -80,17 +777,10 @@ class ATCommand:
             tuple[int, int]: Signal quality (RSSI and BER).
 
         Raises:
-            ATCommandError: If signal quality cannot be retrieved.
+            ATCommandError: If signal quality cannot be retrieved; the typed error of the failure (see ``query``).
         """
-        response = self.send_command("AT+CSQ")
-
-        for line in response:
-            if line.startswith("+CSQ:"):
-                _, signal_info = line.split(": ")
-                rssi, ber = map(int, signal_info.split(","))
-                return rssi, ber
-
-        raise ATCommandError("Failed to retrieve signal quality")
+        signal = self.query("AT+CSQ")
+        return signal.rssi, signal.ber
 
     def set_apn(self, apn: str) -> None:
         """
@@ -115,6 +805,6 @@ class ATCommand:
 
     def close(self) -> None:
         """
-        Closes the UART connection.
+        Closes the connection to the module.
         """
-        self.uart.deinit()  # Deinitialize UART
+        self.transport.close()
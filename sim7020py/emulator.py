@@ -0,0 +1,489 @@
+import binascii
+import os
+import select
+import threading
+import time
+
+from .mqtt import topic_matches
+from .transport import Transport
+
+
+class _ModemError(Exception):
+    """Carries the error line the emulated module answers with."""
+
+
+class SIM7020Emulator(Transport):
+    """
+    Host-side emulator of the SIM7020 AT dialect used by this library.
+
+    The emulator is itself a ``Transport``, so it can be handed to ``ATCommand(transport=...)``
+    for in-process tests, or exposed to other processes with ``serve_pty()`` / ``serve_socket()``.
+    Replies become readable only after the configured per-command latency has elapsed.
+    """
+
+    def __init__(self, latency: dict | None = None, default_latency: float = 0.0, echo: bool = False,
+                 signal: tuple[int, int] = (15, 99), valid_apns: tuple | None = None, http_handler=None):
+        """
+        Initializes a powered-on module in full functionality mode, not attached to the network.
+
+        Args:
+            latency (dict | None, optional): Reply latency in seconds per command name, e.g. {"+CGATT": 2.0}.
+                Defaults to None.
+            default_latency (float, optional): Latency for commands without an entry. Defaults to 0.0.
+            echo (bool, optional): Echo received command lines, like ATE1. Defaults to False.
+            signal (tuple[int, int], optional): RSSI and BER reported by AT+CSQ. Defaults to (15, 99).
+            valid_apns (tuple | None, optional): APNs that allow attachment; None accepts any. Defaults to None.
+            http_handler (Callable[[str], tuple[int, str]] | None, optional): Maps a URL to status and body.
+                Defaults to an in-memory Blynk pin store.
+        """
+        self.latency = dict(latency or {})
+        self.default_latency = default_latency
+        self.echo = echo
+        self.signal = signal
+        self.valid_apns = valid_apns
+        self.http_handler = http_handler or self._blynk_handler
+        self.errors = {}  # Command name -> forced error line, e.g. {"+CGATT": "+CME ERROR: 30"}
+        self.pins = {}  # Virtual pin store behind the default HTTP handler
+        self.commands = []  # Every command line received, for assertions and benchmarks
+        self.cfun = 1
+        self.apn = ""
+        self.attached = False
+        self.mqtt = {}  # Client id -> {"host", "port", "connected", "subscriptions"}
+        self.published = []  # (topic, payload) of every CMQPUB
+        self.http_clients = {}  # Client id -> {"url", "connected"}
+        self._rx = b""
+        self._urcs_after_reply = []  # URCs triggered by a command, emitted once its reply is out
+        self._out = []  # (ready_time, bytes) in delivery order
+        self._lock = threading.Lock()
+        self._scheduled = threading.Condition(self._lock)  # Notified whenever output is scheduled
+        self._stop = None
+
+    # -- Transport interface ------------------------------------------------------------------
+
+    def any(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(len(data) for ready, data in self._out if ready <= now)
+
+    def readinto(self, buf) -> int | None:
+        now = time.monotonic()
+        nbytes = 0
+        with self._lock:
+            while self._out and self._out[0][0] <= now and nbytes < len(buf):
+                ready, data = self._out[0]
+                chunk = min(len(data), len(buf) - nbytes)
+                buf[nbytes:nbytes + chunk] = data[:chunk]
+                nbytes += chunk
+                if chunk < len(data):
+                    self._out[0] = (ready, data[chunk:])
+                else:
+                    self._out.pop(0)
+        return nbytes or None
+
+    def wait(self, timeout_ms: int) -> bool:
+        deadline = time.monotonic() + timeout_ms / 1000
+        with self._scheduled:
+            while True:
+                now = time.monotonic()
+                if self._out and self._out[0][0] <= now:
+                    return True
+                if now >= deadline:
+                    return False
+                wake = min(deadline, self._out[0][0]) if self._out else deadline
+                self._scheduled.wait(wake - now)
+
+    def write(self, data) -> int:
+        self._rx += bytes(data)
+        while True:
+            end = self._rx.find(b"\r")
+            if end < 0:
+                break
+            line = self._rx[:end].decode().strip()
+            self._rx = self._rx[end + 1:]
+            if line:
+                self._execute(line)
+        return len(data)
+
+    def close(self) -> None:
+        self.stop()
+
+    # -- Scripting ----------------------------------------------------------------------------
+
+    def inject_urc(self, line: str, delay: float = 0.0) -> None:
+        """
+        Emits an unsolicited result code.
+
+        Args:
+            line (str): URC line, e.g. "+CEREG: 1".
+            delay (float, optional): Seconds from now until it is readable. Defaults to 0.0.
+        """
+        self._schedule([line], delay)
+
+    def publish_downlink(self, topic: str, payload: bytes, delay: float = 0.0) -> None:
+        """
+        Delivers an MQTT message to the module as a ``+CMQPUB`` URC.
+
+        Args:
+            topic (str): Topic name.
+            payload (bytes): Message payload.
+            delay (float, optional): Seconds from now until it is readable. Defaults to 0.0.
+        """
+        hex_payload = binascii.hexlify(payload).decode()
+        self.inject_urc(f'+CMQPUB: 0,"{topic}",1,0,0,{len(hex_payload)},"{hex_payload}"', delay)
+
+    def drop_mqtt(self, client_id: int = 0, delay: float = 0.0) -> None:
+        """
+        Emulates the broker closing an MQTT connection: the client is released and ``+CMQDISCON`` is emitted.
+
+        Args:
+            client_id (int, optional): MQTT client handle. Defaults to 0.
+            delay (float, optional): Seconds from now until the URC is readable. Defaults to 0.0.
+        """
+        self.mqtt.pop(client_id, None)
+        self.inject_urc(f"+CMQDISCON: {client_id}", delay)
+
+    def drop_http(self, client_id: int = 0, delay: float = 0.0) -> None:
+        """
+        Emulates the server closing a persistent HTTP connection: ``+CHTTPERR`` is emitted.
+
+        Args:
+            client_id (int, optional): HTTP client handle. Defaults to 0.
+            delay (float, optional): Seconds from now until the URC is readable. Defaults to 0.0.
+        """
+        if client_id in self.http_clients:
+            self.http_clients[client_id]["connected"] = False
+        self.inject_urc(f"+CHTTPERR: {client_id},-2", delay)
+
+    # -- Command handling ---------------------------------------------------------------------
+
+    def _schedule(self, lines: list[str], delay: float) -> None:
+        with self._lock:
+            ready = time.monotonic() + delay
+            if self._out:
+                ready = max(ready, self._out[-1][0])  # Replies never overtake each other
+            self._out.append((ready, "".join(f"\r\n{line}\r\n" for line in lines).encode()))
+            self._scheduled.notify_all()
+
+    def _execute(self, line: str) -> None:
+        """
+        Runs one command line, which may chain several commands with ";".
+        """
+        self.commands.append(line)
+        reply = [line] if self.echo else []
+        delay = 0.0
+        if line.upper() == "AT":
+            reply.append("OK")
+        elif line.upper() in ("ATE0", "ATE1"):
+            self.echo = line.upper() == "ATE1"
+            reply.append("OK")
+        elif line.upper().startswith("AT+"):
+            parts = line[2:].split(";")
+            for part in parts:
+                name = part.split("=", 1)[0].rstrip("?")
+                delay += self.latency.get(name, self.default_latency)
+                try:
+                    reply.extend(self.handle(part))
+                except _ModemError as e:
+                    reply.append(str(e))
+                    break
+                except (ValueError, IndexError):  # Malformed arguments
+                    reply.append("ERROR")
+                    break
+            else:
+                reply.append("OK")
+        else:
+            reply.append("ERROR")
+        self._schedule(reply, delay)
+        for urc in self._urcs_after_reply:
+            self._schedule([urc], 0.0)
+        self._urcs_after_reply = []
+
+    def handle(self, command: str) -> list[str]:
+        """
+        Executes a single extended command.
+
+        Args:
+            command (str): Command without the "AT" prefix, e.g. "+CGATT=1".
+
+        Returns:
+            list[str]: Information lines preceding the final OK.
+
+        Raises:
+            _ModemError: With the error line (e.g. "+CME ERROR: 30") if the command fails.
+        """
+        name, _, args = command.partition("=")
+        query = name.endswith("?")
+        name = name.rstrip("?")
+        if name in self.errors:
+            raise _ModemError(self.errors[name])
+        handler = getattr(self, "_cmd_" + name[1:].lower(), None)
+        if handler is None:
+            raise _ModemError("ERROR")
+        return handler(query, _split_args(args)) or []
+
+    def _cmd_cfun(self, query, args):
+        if query:
+            return [f"+CFUN: {self.cfun}"]
+        self.cfun = int(args[0])
+        if self.cfun != 1:
+            self.attached = False
+
+    def _cmd_cgdcont(self, query, args):
+        if query:
+            return [f'+CGDCONT: 1,"IP","{self.apn}",,0,0,0,0,0,0'] if self.apn else []
+        self.apn = args[2]
+
+    def _cmd_cgatt(self, query, args):
+        if query:
+            return [f"+CGATT: {int(self.attached)}"]
+        if args[0] == "0":
+            self.attached = False
+            return None
+        if self.cfun != 1:
+            raise _ModemError("+CME ERROR: 30")  # No network service
+        if not self.apn or (self.valid_apns is not None and self.apn not in self.valid_apns):
+            raise _ModemError("+CME ERROR: 33")  # Requested service option not subscribed
+        self.attached = True
+        self._urcs_after_reply.append("+CEREG: 1")
+
+    def _cmd_cereg(self, query, args):
+        if query:
+            return [f"+CEREG: 0,{1 if self.attached else 2}"]
+
+    def _cmd_csq(self, query, args):
+        return [f"+CSQ: {self.signal[0]},{self.signal[1]}"]
+
+    def _cmd_cgcontrdp(self, query, args):
+        if not self.attached:
+            return []
+        return [f'+CGCONTRDP: 1,5,"{self.apn}","10.0.0.2.255.255.255.0"']
+
+    def _require_attached(self):
+        if not self.attached:
+            raise _ModemError("+CME ERROR: 30")
+
+    def _cmd_cmqnew(self, query, args):
+        self._require_attached()
+        client_id = len(self.mqtt)
+        self.mqtt[client_id] = {"host": args[0], "port": args[1], "connected": False, "subscriptions": []}
+        return [f"+CMQNEW: {client_id}"]
+
+    def _client(self, client_id):
+        client = self.mqtt.get(int(client_id))
+        if client is None:
+            raise _ModemError("ERROR")
+        return client
+
+    def _cmd_cmqcon(self, query, args):
+        if query:
+            return [f'+CMQCON: {client_id},{int(client["connected"])},"{client["host"]}","{client["port"]}"'
+                    for client_id, client in self.mqtt.items()]
+        self._client(args[0])["connected"] = True
+
+    def _cmd_cmqsub(self, query, args):
+        client = self._client(args[0])
+        if not client["connected"]:
+            raise _ModemError("ERROR")
+        client["subscriptions"].append(args[1])
+
+    def _cmd_cmqunsub(self, query, args):
+        client = self._client(args[0])
+        if args[1] in client["subscriptions"]:
+            client["subscriptions"].remove(args[1])
+
+    def _cmd_cmqpub(self, query, args):
+        client = self._client(args[0])
+        if not client["connected"]:
+            raise _ModemError("ERROR")
+        payload = binascii.unhexlify(args[6])
+        self.published.append((args[1], payload))
+        if any(topic_matches(pattern, args[1]) for pattern in client["subscriptions"]):
+            hex_payload = args[6]
+            self._urcs_after_reply.append(
+                f'+CMQPUB: {args[0]},"{args[1]}",1,0,0,{len(hex_payload)},"{hex_payload}"')
+
+    def _cmd_cmqdiscon(self, query, args):
+        self.mqtt.pop(int(args[0]), None)
+
+    def _cmd_httpget(self, query, args):
+        self._require_attached()
+        status, body = self.http_handler(args[0])
+        return [f"+HTTPGET: {status},{len(body)}", body]
+
+    def _cmd_chttpcreate(self, query, args):
+        client_id = 0
+        while client_id in self.http_clients:
+            client_id += 1
+        self.http_clients[client_id] = {"url": args[0], "connected": False}
+        return [f"+CHTTPCREATE: {client_id}"]
+
+    def _http_client(self, client_id):
+        client = self.http_clients.get(int(client_id))
+        if client is None:
+            raise _ModemError("ERROR")
+        return client
+
+    def _cmd_chttpcon(self, query, args):
+        self._require_attached()
+        self._http_client(args[0])["connected"] = True
+
+    def _cmd_chttpsend(self, query, args):
+        client = self._http_client(args[0])
+        if not client["connected"] or not self.attached:
+            raise _ModemError("ERROR")
+        status, body = self.http_handler(client["url"].rstrip("/") + args[2])
+        hex_body = binascii.hexlify(body.encode()).decode()
+        self._urcs_after_reply.append(
+            f'+CHTTPNMIH: {args[0]},{status},{len(body)},"Content-Type: application/json"')
+        self._urcs_after_reply.append(f'+CHTTPNMIC: {args[0]},0,{len(body)},{len(body)},"{hex_body}"')
+
+    def _cmd_chttpdiscon(self, query, args):
+        self._http_client(args[0])["connected"] = False
+
+    def _cmd_chttpdestroy(self, query, args):
+        self.http_clients.pop(int(args[0]), None)
+
+    def _blynk_handler(self, url: str) -> tuple[int, str]:
+        """
+        Emulates Blynk's HTTP API: the updates ``/external/api/update?token=<t>&V1=<v>`` and
+        ``/external/api/batch/update?token=<t>&V1=<v>&V2=<v>``, the pin read ``/external/api/get?token=<t>&V1&V2``
+        (a bare value for one pin, a JSON object for several), and the legacy ``/<token>/update/<pin>?value=<v>``
+        and ``/<token>/get/<pin>``.
+        """
+        path = url.split("://", 1)[-1].split("/", 1)[-1]
+        path, _, query = path.partition("?")
+        parts = path.split("/")
+        if path == "external/api/update" or path == "external/api/batch/update":
+            params = [param.partition("=") for param in query.split("&")]
+            if not any(name == "token" and value for name, _, value in params):
+                return 400, '{"error":{"message":"Invalid token."}}'
+            for name, _, value in params:
+                if name.startswith("V"):
+                    self.pins[name[1:]] = _unquote(value)
+            return 200, ""
+        if path == "external/api/get":
+            names = [param for param in query.split("&") if param.startswith("V")]
+            missing = [name for name in names if name[1:] not in self.pins]
+            if missing:
+                return 400, f'{{"error":{{"message":"Requested pin {missing[0]} doesn\'t exist."}}}}'
+            if len(names) == 1:
+                return 200, self.pins[names[0][1:]]  # Blynk answers a single pin with the bare value
+            return 200, "{" + ",".join(f'"{name}":"{self.pins[name[1:]]}"' for name in names) + "}"
+        if len(parts) == 3 and parts[1] == "update":
+            self.pins[parts[2]] = query.partition("value=")[2]
+            return 200, ""
+        if len(parts) == 3 and parts[1] == "get":
+            if parts[2] not in self.pins:
+                return 400, "Requested pin doesn't exist in the app."
+            return 200, f'["{self.pins[parts[2]]}"]'
+        return 404, ""
+
+    # -- Serving ------------------------------------------------------------------------------
+
+    def serve_pty(self) -> str:
+        """
+        Exposes the emulator on a new pseudo-terminal, served from a background thread.
+
+        Returns:
+            str: Path of the terminal to open, e.g. with ``ATCommand(port="pty:" + path)``.
+        """
+        import pty
+        import tty
+
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        path = os.ttyname(slave)
+        self._start(lambda: os.read(master, 1024), lambda data: os.write(master, data), master,
+                    lambda: (os.close(master), os.close(slave)))
+        return path
+
+    def serve_socket(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """
+        Accepts a single TCP client and serves the emulator to it from a background thread.
+
+        Args:
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): TCP port, 0 for any free one. Defaults to 0.
+
+        Returns:
+            tuple[str, int]: The address to connect to, e.g. with ``ATCommand(port=f"socket://{host}:{port}")``.
+        """
+        import socket
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host, port))
+        server.listen(1)
+        address = server.getsockname()
+
+        def serve():
+            conn, _ = server.accept()
+            server.close()
+            self._loop(lambda: conn.recv(1024), conn.sendall, conn, conn.close)
+
+        self._stop = threading.Event()
+        threading.Thread(target=serve, daemon=True).start()
+        return address
+
+    def _start(self, read, write, readable, close) -> None:
+        self._stop = threading.Event()
+        threading.Thread(target=self._loop, args=(read, write, readable, close), daemon=True).start()
+
+    def _loop(self, read, write, readable, close) -> None:
+        buf = bytearray(1024)
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    next_ready = self._out[0][0] if self._out else None
+                wait = 0.05 if next_ready is None else max(0.0, min(0.05, next_ready - time.monotonic()))
+                if select.select([readable], [], [], wait)[0]:
+                    data = read()
+                    if not data:
+                        break
+                    self.write(data)
+                nbytes = self.readinto(buf)
+                if nbytes:
+                    write(bytes(buf[:nbytes]))
+        finally:
+            close()
+
+    def stop(self) -> None:
+        """
+        Stops a background server started with ``serve_pty()`` or ``serve_socket()``.
+        """
+        if self._stop is not None:
+            self._stop.set()
+
+
+def _unquote(value: str) -> str:
+    """Decodes %XX escapes in a URL query value."""
+    if "%" not in value:
+        return value
+    data = bytearray()
+    i = 0
+    while i < len(value):
+        if value[i] == "%":
+            data.append(int(value[i + 1:i + 3], 16))
+            i += 3
+        else:
+            data += value[i].encode()
+            i += 1
+    return data.decode()
+
+
+def _split_args(args: str) -> list[str]:
+    """Splits a comma-separated AT argument list, honouring and removing double quotes."""
+    result = []
+    current = ""
+    quoted = False
+    for char in args:
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            result.append(current)
+            current = ""
+        else:
+            current += char
+    if args:
+        result.append(current)
+    return result
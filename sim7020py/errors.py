@@ -0,0 +1,152 @@
+class ATCommandError(Exception):
+    """Exception for AT command errors."""
+
+    # Whether repeating the command may succeed; subclasses and CME codes refine this
+    retryable = True
+
+    def __init__(self, message: str = "", code: int | None = None):
+        """
+        Args:
+            message (str, optional): Description of the failure. Defaults to "".
+            code (int | None, optional): Numeric ``+CME ERROR`` code, if the module reported one. Defaults to None.
+        """
+        super().__init__(message)
+        self.code = code
+
+
+class ResponseTimeout(ATCommandError):
+    """The module sent no final result code in time; the command may or may not have run."""
+
+
+class ParseError(ATCommandError):
+    """The reply arrived but could not be understood; repeating the request would get the same answer."""
+
+    retryable = False
+
+
+class ModemError(ATCommandError):
+    """The module rejected the command with a plain ``ERROR``, giving no reason."""
+
+
+class CMEError(ModemError):
+    """The module rejected the command with ``+CME ERROR: <code>``."""
+
+    def __init__(self, message: str = "", code: int | None = None):
+        super().__init__(message, code)
+        self.retryable = code in RETRYABLE_CME_CODES
+
+
+class SIMError(CMEError):
+    """SIM card missing, locked or faulty (CME codes 10-18)."""
+
+
+class NetworkError(CMEError):
+    """No network service, or the network refused registration (CME codes 30-32, 103-113)."""
+
+
+class PDPError(CMEError):
+    """The packet data context or service was refused, e.g. an invalid APN (CME codes 33, 132-150)."""
+
+
+# Known +CME ERROR codes (3GPP TS 27.007 and SIMCom extensions): code -> (description, exception class)
+CME_ERRORS = {
+    0: ("phone failure", CMEError),
+    3: ("operation not allowed", CMEError),
+    4: ("operation not supported", CMEError),
+    10: ("SIM not inserted", SIMError),
+    11: ("SIM PIN required", SIMError),
+    12: ("SIM PUK required", SIMError),
+    13: ("SIM failure", SIMError),
+    14: ("SIM busy", SIMError),
+    15: ("SIM wrong", SIMError),
+    16: ("incorrect password", SIMError),
+    17: ("SIM PIN2 required", SIMError),
+    18: ("SIM PUK2 required", SIMError),
+    20: ("memory full", CMEError),
+    23: ("memory failure", CMEError),
+    30: ("no network service", NetworkError),
+    31: ("network timeout", NetworkError),
+    32: ("network not allowed, emergency calls only", NetworkError),
+    33: ("requested service option not subscribed", PDPError),
+    50: ("incorrect parameters", CMEError),
+    100: ("unknown", CMEError),
+    103: ("illegal MS", NetworkError),
+    106: ("illegal ME", NetworkError),
+    107: ("GPRS services not allowed", NetworkError),
+    111: ("PLMN not allowed", NetworkError),
+    112: ("location area not allowed", NetworkError),
+    113: ("roaming not allowed in this location area", NetworkError),
+    132: ("service option not supported", PDPError),
+    133: ("requested service option not subscribed", PDPError),
+    134: ("service option temporarily out of order", PDPError),
+    148: ("unspecified GPRS error", PDPError),
+    149: ("PDP authentication failure", PDPError),
+    150: ("invalid mobile class", PDPError),
+}
+
+# Codes describing a transient condition; every other code needs a configuration change or user action
+RETRYABLE_CME_CODES = (0, 14, 30, 31, 100, 134, 148)
+
+
+def cme_error(code: int | None, command: str = "", text: str = "") -> CMEError:
+    """
+    Builds the exception for a ``+CME ERROR`` reply.
+
+    Args:
+        code (int | None): Numeric code, or None if the module reported a verbose text (AT+CMEE=2).
+        command (str, optional): The failed command, for the message. Defaults to "".
+        text (str, optional): Verbose error text. Defaults to "".
+
+    Returns:
+        CMEError: Instance of the subclass matching the code.
+    """
+    description, error_class = CME_ERRORS.get(code, (text or "unknown error", CMEError))
+    if code is None:
+        return error_class(f"'{command}' failed: +CME ERROR: {description}")
+    return error_class(f"'{command}' failed: +CME ERROR: {code} ({description})", code)
+
+
+def error_from_response(lines: list[str], command: str = "", expected_response: str = "OK",
+                        finished: bool | None = None) -> ATCommandError:
+    """
+    Classifies a reply that lacks the expected response.
+
+    Args:
+        lines (list[str]): Collected reply lines.
+        command (str, optional): The command, for the message. Defaults to "".
+        expected_response (str, optional): The response that was expected. Defaults to "OK".
+        finished (bool | None, optional): Whether the reply ended on a final result code or terminator.
+            Defaults to None (finished if it contains "OK").
+
+    Returns:
+        ATCommandError: CMEError (or a subclass) for ``+CME ERROR``, ModemError for ``ERROR``, ParseError for
+            a finished reply without the expected response, ResponseTimeout if the reply never finished.
+    """
+    for line in reversed(lines):
+        if line.startswith("+CME ERROR"):
+            text = line.split(":", 1)[-1].strip()
+            try:
+                return cme_error(int(text), command)
+            except ValueError:
+                return cme_error(None, command, text)
+        if line == "ERROR" or line == "SEND FAIL":
+            return ModemError(f"'{command}' failed: {line}")
+    if finished is None:
+        finished = "OK" in lines
+    if finished:
+        return ParseError(f"Expected response '{expected_response}' to '{command}' not received")
+    return ResponseTimeout(f"No response to '{command}'")
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Retry predicate for ``RetryPolicy``: transient modem errors, timeouts and I/O errors are retried;
+    SIM, subscription and configuration errors are not.
+
+    Args:
+        error (Exception): The failure.
+
+    Returns:
+        bool: True if repeating the operation may succeed.
+    """
+    return getattr(error, "retryable", True)
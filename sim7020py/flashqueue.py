@@ -0,0 +1,225 @@
+import binascii
+import json
+import os
+
+from .logger import get_logger
+from .ringbuffer import OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_ERROR
+
+logger = get_logger("sim7020py.flashqueue")
+
+# Overflow policy specific to FlashQueue: keep every second record to make room, halving the resolution
+OVERFLOW_DOWNSAMPLE = 3
+
+
+def _encode(record) -> str:
+    """Serializes a record as ``<crc32 of payload, 8 hex digits> <json payload>\\n``."""
+    payload = json.dumps(record)
+    return f"{binascii.crc32(payload.encode()) & 0xFFFFFFFF:08x} {payload}\n"
+
+
+def _sync(f) -> None:
+    """
+    Makes what was written to an open file durable: ``fsync`` of that file where available (CPython),
+    otherwise ``os.sync()`` (MicroPython), which would flush every filesystem on a host.
+    """
+    f.flush()
+    if hasattr(os, "fsync"):
+        os.fsync(f.fileno())
+    elif hasattr(os, "sync"):
+        os.sync()
+
+
+def _decode(line: str):
+    """
+    Parses one stored line.
+
+    Raises:
+        ValueError: If the line is torn or its checksum does not match.
+    """
+    if len(line) < 10 or not line.endswith("\n") or line[8] != " ":
+        raise ValueError("Torn record")
+    payload = line[9:-1]
+    if int(line[:8], 16) != binascii.crc32(payload.encode()) & 0xFFFFFFFF:
+        raise ValueError("Checksum mismatch")
+    return json.loads(payload)
+
+
+class FlashQueue:
+    """
+    Bounded, append-only FIFO of JSON records on flash that survives resets and power loss.
+
+    Each record is one line ``<crc32> <json>``; a record torn by a power cut or corrupted on flash fails its
+    checksum and is dropped when the queue is opened. Appending never rewrites the file; draining removes
+    the file, and only overflow handling or a partial drain rewrites it (into a temporary file that
+    replaces the original in one rename).
+    """
+
+    def __init__(self, filename: str = "queue.dat", max_records: int = 256, overflow: int = OVERFLOW_DOWNSAMPLE):
+        """
+        Opens the queue, recovering the records stored by a previous run.
+
+        Args:
+            filename (str, optional): Queue file. Defaults to "queue.dat".
+            max_records (int, optional): Capacity. Defaults to 256.
+            overflow (int, optional): OVERFLOW_DOWNSAMPLE, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST or
+                OVERFLOW_ERROR, applied when a record is put into a full queue. Defaults to OVERFLOW_DOWNSAMPLE.
+        """
+        self.filename = filename
+        self.max_records = max_records
+        self.overflow = overflow
+        self.dropped = 0
+        self._recover()
+        records, damaged = self._load()
+        self.count = len(records)
+        if damaged:
+            logger.warning("Dropped %d damaged records from %s", damaged, filename)
+            self._rewrite(records)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _recover(self) -> None:
+        """
+        Completes a rewrite interrupted between removing the queue file and renaming the temporary file over
+        it (filesystems that cannot rename over an existing file), which would otherwise leave only the
+        temporary file.
+        """
+        try:
+            os.stat(self.filename)
+            return
+        except OSError:
+            pass
+        try:
+            os.rename(self.filename + ".tmp", self.filename)
+        except OSError:
+            return  # No interrupted rewrite
+        logger.warning("Recovered %s from an interrupted rewrite", self.filename)
+
+    def _load(self) -> tuple[list, int]:
+        """
+        Reads all intact records.
+
+        Returns:
+            tuple[list, int]: The records, oldest first, and the number of damaged lines skipped.
+        """
+        records = []
+        damaged = 0
+        try:
+            with open(self.filename) as f:
+                for line in f:
+                    try:
+                        records.append(_decode(line))
+                    except ValueError:
+                        damaged += 1
+        except OSError:
+            pass  # No queue file yet
+        return records, damaged
+
+    def _rewrite(self, records: list) -> None:
+        """
+        Atomically replaces the queue file with ``records``.
+
+        Args:
+            records (list): Records to keep, oldest first.
+        """
+        if not records:
+            self._remove()
+            return
+        temporary = self.filename + ".tmp"
+        with open(temporary, "w") as f:
+            for record in records:
+                f.write(_encode(record))
+            _sync(f)  # The new contents must be durable before they replace the old file
+        try:
+            os.rename(temporary, self.filename)
+        except OSError:  # Filesystems that cannot rename over an existing file
+            self._remove()
+            os.rename(temporary, self.filename)
+        self.count = len(records)
+
+    def _remove(self) -> None:
+        """
+        Deletes the queue file.
+        """
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+        self.count = 0
+
+    def put(self, record) -> bool:
+        """
+        Appends a record, applying the overflow policy if the queue is full.
+
+        Args:
+            record (Any): JSON-serializable record.
+
+        Returns:
+            bool: False if the record was discarded (OVERFLOW_DROP_NEWEST).
+
+        Raises:
+            OverflowError: If the queue is full under OVERFLOW_ERROR.
+        """
+        if self.count >= self.max_records:
+            if self.overflow == OVERFLOW_ERROR:
+                raise OverflowError(f"Queue {self.filename} is full")
+            if self.overflow == OVERFLOW_DROP_NEWEST:
+                self.dropped += 1
+                return False
+            records = self._load()[0]
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                kept = records[len(records) - self.max_records + 1:]
+            else:
+                kept = records[::2]  # Keep the first, third, ... record: the same span at half the resolution
+            self.dropped += len(records) - len(kept)
+            self._rewrite(kept)
+        with open(self.filename, "a") as f:
+            f.write(_encode(record))
+            _sync(f)  # Make the record durable before the caller forgets it
+        self.count += 1
+        return True
+
+    def peek(self, count: int | None = None) -> list:
+        """
+        Returns the oldest records without removing them.
+
+        Args:
+            count (int | None, optional): Maximum number of records. Defaults to None (all).
+
+        Returns:
+            list: Records, oldest first.
+        """
+        records = self._load()[0]
+        return records if count is None else records[:count]
+
+    def drain(self, send, batch_size: int = 16) -> int:
+        """
+        Hands the queued records to ``send`` in batches, oldest first, removing them once sent.
+
+        Args:
+            send (Callable[[list], None]): Delivers a batch of records; raises to stop draining.
+            batch_size (int, optional): Maximum records per ``send`` call. Defaults to 16.
+
+        Returns:
+            int: Number of records sent.
+
+        Raises:
+            Exception: Whatever ``send`` raises; the unsent records stay queued.
+        """
+        records = self._load()[0]
+        sent = 0
+        try:
+            while sent < len(records):
+                batch = records[sent:sent + batch_size]
+                send(batch)
+                sent += len(batch)
+        finally:
+            if sent:
+                self._rewrite(records[sent:])
+        return sent
+
+    def clear(self) -> None:
+        """
+        Removes all records.
+        """
+        self._remove()
@@ -0,0 +1,196 @@
+from .commands import ATCommand, ATCommandError
+from .errors import ResponseTimeout
+from .logger import get_logger
+from .parsers import HTTPClient, HTTPContent, HTTPHeaders, HTTPResponse, find, parse_line
+from .profiles import profile_for
+from .utils import ticks_ms, ticks_diff
+
+logger = get_logger("sim7020py.httpclient")
+
+# Request methods accepted by AT+CHTTPSEND
+METHOD_GET = 0
+METHOD_POST = 1
+METHOD_PUT = 2
+METHOD_DELETE = 3
+
+
+class HTTPSession:
+    """
+    Persistent HTTP client owning one AT+CHTTPCREATE handle of the module.
+
+    The module keeps the TCP connection to the server open between requests, so a request costs one
+    AT+CHTTPSEND and the ``+CHTTPNMIH``/``+CHTTPNMIC`` URCs carrying the response, instead of the DNS
+    lookup and TCP handshake of every one-shot AT+HTTPGET. A failed request reconnects once and is retried.
+    """
+
+    def __init__(self, at_command: ATCommand, base_url: str, timeout: float | None = None):
+        """
+        Initializes the session; nothing is sent to the module until ``open()`` or the first request.
+
+        Args:
+            at_command (ATCommand): Command engine of the module, e.g. ``SIM7020.at_command``.
+            base_url (str): Scheme and host of the server, e.g. "http://blynk.cloud".
+            timeout (float | None, optional): Maximum wait for a response in seconds, from sending the request.
+                Defaults to None (the timeout of the AT+CHTTPSEND profile).
+        """
+        self.at_command = at_command
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.client_id = None  # Handle returned by AT+CHTTPCREATE
+        self.connected = False
+        self._headers = None  # +CHTTPNMIH of the pending request
+        self._content = []  # +CHTTPNMIC chunks of the pending request
+        self._done = False
+        self._error = None
+        at_command.register_urc("+CHTTPNMIH:", self._on_headers)
+        at_command.register_urc("+CHTTPNMIC:", self._on_content)
+        at_command.register_urc("+CHTTPERR:", self._on_error)
+
+    def open(self) -> None:
+        """
+        Creates the module-side client and connects it to the server; does nothing while connected.
+
+        Raises:
+            ATCommandError: If the module cannot create the client or connect.
+        """
+        if self.connected:
+            return
+        if self.client_id is None:
+            handle = find(self.at_command.send_command(f'AT+CHTTPCREATE="{self.base_url}"'), "+CHTTPCREATE:")
+            self.client_id = handle.client_id if handle is not None else 0
+        try:
+            self.at_command.send_command(f"AT+CHTTPCON={self.client_id}")
+        except ATCommandError:
+            self.close()
+            raise
+        self.connected = True
+        logger.info("HTTP session %s connected to %s", self.client_id, self.base_url)
+
+    def close(self) -> None:
+        """
+        Disconnects and releases the module-side client so the next ``open()`` starts from AT+CHTTPCREATE.
+        """
+        if self.client_id is not None:
+            for command in (f"AT+CHTTPDISCON={self.client_id}", f"AT+CHTTPDESTROY={self.client_id}"):
+                try:
+                    self.at_command.send_command(command)
+                except ATCommandError:
+                    pass  # Already disconnected or released by the module
+        self.client_id = None
+        self.connected = False
+
+    def get(self, path: str) -> HTTPResponse:
+        """
+        Sends a GET request over the session, connecting on demand.
+
+        Args:
+            path (str): Path and query, e.g. "/external/api/get?token=<token>&V0".
+
+        Returns:
+            HTTPResponse: Status, body length and body.
+
+        Raises:
+            ATCommandError: If the request fails again after reconnecting.
+        """
+        return self.request(METHOD_GET, path)
+
+    def request(self, method: int, path: str) -> HTTPResponse:
+        """
+        Sends a request over the session; on failure the session is reconnected and the request retried once.
+
+        Args:
+            method (int): METHOD_GET, METHOD_POST, METHOD_PUT or METHOD_DELETE.
+            path (str): Path and query, e.g. "/external/api/get?token=<token>&V0".
+
+        Returns:
+            HTTPResponse: Status, body length and body.
+
+        Raises:
+            ATCommandError: If the request fails again after reconnecting.
+        """
+        self.open()
+        try:
+            return self._send(method, path)
+        except ATCommandError as e:
+            logger.warning("HTTP session %s failed, reconnecting: %s", self.client_id, e)
+        self.close()
+        self.open()
+        return self._send(method, path)
+
+    def _send(self, method: int, path: str) -> HTTPResponse:
+        """
+        Sends one request and collects the response URCs.
+
+        Raises:
+            ATCommandError: If the module rejects the request or reports an error.
+            ResponseTimeout: If the response, or the last chunk of its body, does not arrive in time.
+        """
+        self._headers = None
+        self._content = []
+        self._done = False
+        self._error = None
+        command = f'AT+CHTTPSEND={self.client_id},{method},"{path}"'
+        timeout = self.timeout
+        if timeout is None:
+            timeout = profile_for(command, self.at_command.timeout, self.at_command.profiles).timeout
+            if timeout is None:
+                timeout = self.at_command.timeout
+        start_time = ticks_ms()
+        self.at_command.send_command(command)
+        while not self._done and self._error is None:
+            remaining = timeout * 1000 - ticks_diff(ticks_ms(), start_time)
+            if remaining <= 0:
+                break
+            self.at_command.poll(remaining / 1000)
+        if self._error is not None:
+            self.connected = False
+            raise ATCommandError(f"HTTP error {self._error}")
+        if not self._done:  # Nothing, or a body cut short: the connection state is unknown, so reconnect next time
+            self.connected = False
+            if self._headers is None:
+                raise ResponseTimeout(f"No HTTP response within {timeout} s")
+            raise ResponseTimeout(f"Incomplete HTTP response within {timeout} s")
+        body = b"".join(self._content).decode()
+        status = self._headers.status if self._headers is not None else None
+        return HTTPResponse(status, len(body), body)
+
+    def _parse(self, line: str, record_class):
+        """
+        Parses a URC of this session.
+
+        Args:
+            line (str): URC line.
+            record_class (type): Expected record type.
+
+        Returns:
+            Record | None: The record, or None if the line is malformed or belongs to another client.
+        """
+        try:
+            record = parse_line(line)
+        except ValueError:
+            logger.error("Malformed URC: %s", line)
+            return None
+        if not isinstance(record, record_class) or record.client_id != self.client_id:
+            return None
+        return record
+
+    def _on_headers(self, line: str) -> None:
+        """Stores the status and headers of the pending request (``+CHTTPNMIH``); completes an empty one."""
+        headers = self._parse(line, HTTPHeaders)
+        if headers is not None:
+            self._headers = headers
+            self._done = headers.length == 0
+
+    def _on_content(self, line: str) -> None:
+        """Collects a body chunk of the pending request (``+CHTTPNMIC``); the last one completes it."""
+        content = self._parse(line, HTTPContent)
+        if content is not None:
+            self._content.append(content.content or b"")
+            self._done = not content.more
+
+    def _on_error(self, line: str) -> None:
+        """Records a failure of the pending request or of the connection (``+CHTTPERR``)."""
+        error = self._parse(line, HTTPClient)
+        if error is not None:
+            self._error = error.error
+            self.connected = False
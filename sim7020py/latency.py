@@ -0,0 +1,137 @@
+import json
+
+from .logger import get_logger
+from .profiles import command_name
+from .utils import save_state, load_state
+
+logger = get_logger("sim7020py.latency")
+
+
+def command_key(command: str) -> str:
+    """
+    Names the latency class of a command line: the profile key, or the keys of a chained line joined by ";".
+
+    Args:
+        command (str): Command line as sent, e.g. "AT+CGATT=1" or "AT+CGATT?;+CEREG?".
+
+    Returns:
+        str: E.g. "AT+CGATT" or "AT+CGATT?;+CEREG?".
+    """
+    parts = command.split(";")
+    if len(parts) == 1 or not all(part.startswith("+") for part in parts[1:]):
+        return command_name(command)
+    return ";".join([command_name(parts[0])] + [command_name(part)[2:] for part in parts[1:]])
+
+
+class LatencyEstimator:
+    """
+    Learns the round-trip time of each command type and derives timeouts from it, like TCP's retransmission
+    timer (RFC 6298): a smoothed RTT and its mean deviation are updated from every reply, and the timeout is
+    ``srtt + k * rttvar``, kept between ``min_timeout`` and the command's configured maximum. Each timeout
+    doubles the command's timeout until its next reply is measured.
+
+    The estimates can be persisted in a state file so they survive reboots and deep sleep.
+    """
+
+    def __init__(self, filename: str | None = None, alpha: float = 0.125, beta: float = 0.25, k: float = 4,
+                 min_timeout: float = 1.0, save_every: int = 0):
+        """
+        Args:
+            filename (str | None, optional): State file to load the estimates from and save them to.
+                Defaults to None (not persisted).
+            alpha (float, optional): Gain of the smoothed RTT. Defaults to 0.125.
+            beta (float, optional): Gain of the RTT deviation. Defaults to 0.25.
+            k (float, optional): Deviations added to the smoothed RTT. Defaults to 4.
+            min_timeout (float, optional): Lower bound of a learned timeout in seconds, like RFC 6298's minimum
+                RTO; it absorbs jitter the estimate has not seen yet. Defaults to 1.0.
+            save_every (int, optional): Save after this many new samples; 0 saves only on ``save()``, sparing
+                the flash. Defaults to 0.
+        """
+        self.filename = filename
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.min_timeout_ms = int(min_timeout * 1000)
+        self.save_every = save_every
+        self.estimates = {}  # Command key -> [srtt_ms, rttvar_ms]
+        self._backoff = {}  # Command key -> timeout multiplier after consecutive timeouts; not persisted
+        self._unsaved = 0
+        if filename is not None:
+            self.load()
+
+    def observe(self, key: str, rtt_ms: int) -> None:
+        """
+        Feeds the round-trip time of a completed command.
+
+        Args:
+            key (str): Command key (see ``command_key``).
+            rtt_ms (int): Time from sending the command to its final result code.
+        """
+        self._backoff.pop(key, None)
+        estimate = self.estimates.get(key)
+        if estimate is None:
+            self.estimates[key] = [rtt_ms, rtt_ms / 2]
+        else:
+            estimate[1] += self.beta * (abs(estimate[0] - rtt_ms) - estimate[1])
+            estimate[0] += self.alpha * (rtt_ms - estimate[0])
+        self._sample()
+
+    def backoff(self, key: str) -> None:
+        """
+        Doubles the timeout of a command that timed out, up to 64 times the learned one.
+
+        Args:
+            key (str): Command key.
+        """
+        if key in self.estimates:
+            self._backoff[key] = min(64, self._backoff.get(key, 1) * 2)
+
+    def timeout(self, key: str, maximum: float) -> float:
+        """
+        Returns the learned timeout of a command type.
+
+        Args:
+            key (str): Command key.
+            maximum (float): Configured maximum in seconds, also used while nothing has been learned.
+
+        Returns:
+            float: Timeout in seconds.
+        """
+        estimate = self.estimates.get(key)
+        if estimate is None:
+            return maximum
+        timeout_ms = max(self.min_timeout_ms, estimate[0] + self.k * estimate[1]) * self._backoff.get(key, 1)
+        return min(maximum, timeout_ms / 1000)
+
+    def _sample(self) -> None:
+        self._unsaved += 1
+        if self.save_every and self._unsaved >= self.save_every:
+            self.save()
+
+    def load(self) -> None:
+        """
+        Restores the estimates from the state file; a missing or damaged file starts from scratch.
+        """
+        content = load_state(self.filename)
+        try:
+            estimates = json.loads(content) if content else {}
+        except (TypeError, ValueError):
+            logger.warning("Ignoring damaged latency state in %s", self.filename)
+            estimates = {}
+        self.estimates = estimates if isinstance(estimates, dict) else {}
+
+    def save(self) -> None:
+        """
+        Writes the estimates to the state file, if one is configured.
+        """
+        if self.filename is not None and self._unsaved:
+            save_state(self.filename, json.dumps(self.estimates))
+            self._unsaved = 0
+
+    def reset(self) -> None:
+        """
+        Forgets everything learned.
+        """
+        self.estimates = {}
+        self._backoff = {}
+        self._unsaved += 1
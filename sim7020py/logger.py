@@ -0,0 +1,182 @@
+import os
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+LEVELS.update({"WARN": WARNING, "CRITICAL": ERROR, "FATAL": ERROR})  # Aliases used by other logging APIs
+
+
+def level_of(level, default: int = INFO) -> int:
+    """
+    Resolves a level given as a constant or as a name in any case, including the aliases in ``LEVELS``.
+
+    Args:
+        level (int | str): A level constant or its name, e.g. WARNING, "WARNING" or "warn".
+        default (int, optional): Level for an unknown name. Defaults to INFO.
+
+    Returns:
+        int: The level constant.
+    """
+    return LEVELS.get(level.upper(), default) if isinstance(level, str) else level
+
+
+class ConsoleSink:
+    """Prints records as ``[LEVEL] name: message``."""
+
+    def __call__(self, level: int, name: str, message: str) -> None:
+        print(f"[{LEVEL_NAMES.get(level, level)}] {name}: {message}")
+
+
+class FlashSink:
+    """Appends records to a file on flash, rotating to ``<filename>.1`` once it reaches ``max_bytes``."""
+
+    def __init__(self, filename: str = "log.txt", max_bytes: int = 8192):
+        """
+        Args:
+            filename (str, optional): Log file name. Defaults to "log.txt".
+            max_bytes (int, optional): Size at which the file is rotated. Defaults to 8192.
+        """
+        self.filename = filename
+        self.max_bytes = max_bytes
+        try:
+            self.size = os.stat(filename)[6]
+        except OSError:
+            self.size = 0
+
+    def __call__(self, level: int, name: str, message: str) -> None:
+        line = f"[{LEVEL_NAMES.get(level, level)}] {name}: {message}\n"
+        if self.size + len(line) > self.max_bytes:
+            try:
+                os.remove(self.filename + ".1")
+            except OSError:
+                pass
+            try:
+                os.rename(self.filename, self.filename + ".1")
+            except OSError:
+                pass  # No file yet, e.g. removed since the size was read
+            self.size = 0
+        with open(self.filename, "a") as f:
+            f.write(line)
+        self.size += len(line)
+
+    def read(self) -> list[str]:
+        """
+        Returns:
+            list[str]: Stored records, oldest first.
+        """
+        lines = []
+        for filename in (self.filename + ".1", self.filename):
+            try:
+                with open(filename) as f:
+                    lines.extend(line.rstrip("\n") for line in f)
+            except OSError:
+                pass
+        return lines
+
+
+class Logger:
+    """Leveled logger; records below the level cost one comparison and are never formatted."""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name (str): Logger name shown in every record.
+        """
+        self.name = name
+        self.level = None  # None follows the global level
+
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Args:
+            level (int): Level to check.
+
+        Returns:
+            bool: True if a record at this level would be emitted; use it to guard expensive arguments.
+        """
+        return level >= (_level if self.level is None else self.level)
+
+    def log(self, level: int, message: str, *args) -> None:
+        """
+        Emits a record. ``message`` is %-formatted with ``args`` only if the level is enabled.
+
+        Args:
+            level (int): Record level.
+            message (str): Message or %-style format string.
+            *args: Format arguments.
+        """
+        if level < (_level if self.level is None else self.level):
+            return
+        if args:
+            message = message % args
+        for sink in _sinks:
+            sink(level, self.name, message)
+
+    def debug(self, message: str, *args) -> None:
+        self.log(DEBUG, message, *args)
+
+    def info(self, message: str, *args) -> None:
+        self.log(INFO, message, *args)
+
+    def warning(self, message: str, *args) -> None:
+        self.log(WARNING, message, *args)
+
+    def error(self, message: str, *args) -> None:
+        self.log(ERROR, message, *args)
+
+
+_level = INFO
+_sinks = [ConsoleSink()]
+_loggers = {}
+
+
+def get_logger(name: str) -> Logger:
+    """
+    Returns the shared logger with the given name, creating it on first use.
+
+    Args:
+        name (str): Logger name, e.g. "sim7020py.commands".
+
+    Returns:
+        Logger: The logger.
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
+
+
+def set_level(level) -> None:
+    """
+    Sets the global level for all loggers without an explicit level of their own.
+
+    Args:
+        level (int | str): A level constant or its name in any case, e.g. DEBUG or "debug"; an unknown name
+            sets INFO.
+    """
+    global _level
+    _level = level_of(level)
+
+
+def set_sinks(*sinks) -> None:
+    """
+    Replaces the output sinks. A sink is any callable taking ``(level, name, message)``,
+    e.g. ``ConsoleSink()``, ``FlashSink("log.txt")`` or a function forwarding records elsewhere.
+
+    Args:
+        *sinks: The new sinks; none silences all output.
+    """
+    _sinks[:] = sinks
+
+
+def add_sink(sink) -> None:
+    """
+    Adds an output sink.
+
+    Args:
+        sink (Callable[[int, str, str], None]): The sink.
+    """
+    _sinks.append(sink)
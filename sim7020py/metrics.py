@@ -0,0 +1,91 @@
+import json
+
+# Outcomes of a command
+OUTCOME_OK = 0
+OUTCOME_ERROR = 1
+OUTCOME_TIMEOUT = 2
+
+# Upper bounds of the latency histogram buckets in milliseconds; a last bucket takes everything slower
+LATENCY_BUCKETS = (50, 100, 250, 500, 1000, 2500, 10000)
+
+# Layout of a command's counter row
+CALLS, OK, ERRORS, TIMEOUTS, TX_BYTES, RX_BYTES, TOTAL_MS, MAX_MS, HISTOGRAM = range(9)
+
+FIELDS = ("calls", "ok", "errors", "timeouts", "tx_bytes", "rx_bytes", "total_ms", "max_ms")
+
+
+class CommandMetrics:
+    """
+    Counts calls, outcomes, traffic and latency per command, e.g. "AT+CMQPUB" or "AT+CSQ".
+
+    Each command has one flat list of integers (see ``FIELDS``) followed by a fixed-bucket latency histogram,
+    so recording a call allocates nothing once the command has been seen and the counters are cheap to keep
+    on in production.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets (tuple, optional): Ascending upper bounds of the latency buckets in milliseconds.
+                Defaults to ``LATENCY_BUCKETS``.
+        """
+        self.buckets = buckets
+        self.commands = {}  # Command key -> counter row
+
+    def record(self, key: str, outcome: int, elapsed_ms: int, tx_bytes: int = 0, rx_bytes: int = 0) -> None:
+        """
+        Records one command.
+
+        Args:
+            key (str): Command key (see ``latency.command_key``).
+            outcome (int): OUTCOME_OK, OUTCOME_ERROR or OUTCOME_TIMEOUT.
+            elapsed_ms (int): Time from sending the command to the end of its reply.
+            tx_bytes (int, optional): Bytes written. Defaults to 0.
+            rx_bytes (int, optional): Bytes read while waiting for the reply. Defaults to 0.
+        """
+        row = self.commands.get(key)
+        if row is None:
+            row = self.commands[key] = [0] * (HISTOGRAM + len(self.buckets) + 1)
+        row[CALLS] += 1
+        row[OK + outcome] += 1
+        row[TX_BYTES] += tx_bytes
+        row[RX_BYTES] += rx_bytes
+        row[TOTAL_MS] += elapsed_ms
+        if elapsed_ms > row[MAX_MS]:
+            row[MAX_MS] = elapsed_ms
+        bucket = 0
+        for bound in self.buckets:
+            if elapsed_ms <= bound:
+                break
+            bucket += 1
+        row[HISTOGRAM + bucket] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the counters.
+
+        Returns:
+            dict: Command key -> {"calls", "ok", "errors", "timeouts", "tx_bytes", "rx_bytes", "total_ms",
+                "max_ms", "histogram"}; ``histogram`` counts calls per bucket of ``buckets``, plus one slower.
+        """
+        snapshot = {}
+        for key, row in self.commands.items():
+            entry = dict(zip(FIELDS, row))
+            entry["histogram"] = row[HISTOGRAM:]
+            snapshot[key] = entry
+        return snapshot
+
+    def payload(self) -> str:
+        """
+        Encodes the counters as compact JSON for publishing, e.g. over MQTT.
+
+        Returns:
+            str: ``{"b": [bucket bounds], "c": {command key: [counters in FIELDS order..., histogram...]}}``.
+        """
+        return json.dumps({"b": self.buckets, "c": self.commands}, separators=(",", ":"))
+
+    def reset(self) -> None:
+        """
+        Clears all counters.
+        """
+        self.commands = {}
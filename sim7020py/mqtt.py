@@ -0,0 +1,262 @@
+from .commands import ATCommand, ATCommandError
+from .logger import get_logger
+from .parsers import MQTTMessage, find, find_all, parse_line
+
+logger = get_logger("sim7020py.mqtt")
+
+# MQTT protocol versions accepted by AT+CMQCON
+MQTT_3_1 = 3
+MQTT_3_1_1 = 4
+
+
+def topic_matches(pattern: str, topic: str) -> bool:
+    """
+    Checks a topic name against a subscription filter with ``+`` and ``#`` wildcards.
+
+    Args:
+        pattern (str): Subscription filter, e.g. "downlink/+/V0" or "downlink/#".
+        topic (str): Topic of a received message.
+
+    Returns:
+        bool: True if the message belongs to the subscription.
+    """
+    if pattern == topic:
+        return True
+    pattern_levels = pattern.split("/")
+    topic_levels = topic.split("/")
+    for i in range(len(pattern_levels)):
+        level = pattern_levels[i]
+        if level == "#":
+            return True
+        if i >= len(topic_levels) or (level != "+" and level != topic_levels[i]):
+            return False
+    return len(pattern_levels) == len(topic_levels)
+
+
+class MQTTClient:
+    """MQTT client owning one AT+CMQNEW handle of the module, with its connection state and subscriptions."""
+
+    def __init__(self, at_command: ATCommand, broker: str, port: int = 1883, client_id: str = "",
+                 password: str = "", username: str = "", keepalive: int = 600, clean_session: bool = True,
+                 version: int = MQTT_3_1_1, command_timeout: int = 12000, buffer_size: int = 1024,
+                 callback=None):
+        """
+        Initializes the client; nothing is sent to the module until ``connect()``.
+
+        Args:
+            at_command (ATCommand): Command engine of the module, e.g. ``SIM7020.at_command``.
+            broker (str): Broker host name or address.
+            port (int, optional): Broker port. Defaults to 1883.
+            client_id (str, optional): MQTT client identifier. Defaults to "".
+            password (str, optional): Password. Defaults to "".
+            username (str, optional): User name. Defaults to "".
+            keepalive (int, optional): Keepalive interval in seconds. Defaults to 600.
+            clean_session (bool, optional): Start a clean session on the broker. Defaults to True.
+            version (int, optional): MQTT_3_1 or MQTT_3_1_1. Defaults to MQTT_3_1_1.
+            command_timeout (int, optional): Module-side MQTT command timeout in ms. Defaults to 12000.
+            buffer_size (int, optional): Module-side send/receive buffer size. Defaults to 1024.
+            callback (Callable[[str, bytes], None] | None, optional): Receives messages of subscriptions
+                without their own callback. Defaults to None.
+        """
+        self.at_command = at_command
+        self.broker = broker
+        self.port = port
+        self.client_id = client_id
+        self.password = password
+        self.username = username
+        self.keepalive = keepalive
+        self.clean_session = clean_session
+        self.version = version
+        self.command_timeout = command_timeout
+        self.buffer_size = buffer_size
+        self.callback = callback
+        self.mqtt_id = None  # Handle returned by AT+CMQNEW
+        self.connected = False
+        self.subscriptions = {}  # Topic filter -> (qos, callback)
+        at_command.register_urc("+CMQPUB:", self._on_message)
+        at_command.register_urc("+CMQDISCON:", self._on_disconnect)
+
+    def connect(self) -> None:
+        """
+        Connects to the broker and restores the subscriptions; does nothing while already connected.
+
+        Raises:
+            ATCommandError: If the module cannot create the client or connect.
+        """
+        if self.connected:
+            return
+        if self.mqtt_id is None:
+            self._create()
+        try:
+            self.at_command.send_command(
+                f'AT+CMQCON={self.mqtt_id},{self.version},"{self.client_id}",{self.keepalive},'
+                f'{int(self.clean_session)},0,"{self.username}","{self.password}"')
+        except ATCommandError:
+            self._release()
+            raise
+        self.connected = True
+        logger.info("Connected to MQTT broker %s:%s as '%s'", self.broker, self.port, self.client_id)
+        if self.subscriptions:
+            self._resubscribe()
+
+    def _create(self) -> None:
+        """
+        Creates the module-side client (AT+CMQNEW) and stores its handle.
+        """
+        response = self.at_command.send_command(
+            f'AT+CMQNEW="{self.broker}","{self.port}",{self.command_timeout},{self.buffer_size}')
+        handle = find(response, "+CMQNEW:")
+        self.mqtt_id = handle.mqtt_id if handle is not None else 0
+
+    def _release(self) -> None:
+        """
+        Releases the module-side client so the next ``connect()`` starts from AT+CMQNEW.
+        """
+        if self.mqtt_id is not None:
+            try:
+                self.at_command.send_command(f"AT+CMQDISCON={self.mqtt_id}")
+            except ATCommandError:
+                pass  # Already released by the module
+        self.mqtt_id = None
+        self.connected = False
+
+    def _resubscribe(self) -> None:
+        """
+        Restores all subscriptions after a (re)connect, chained into as few round-trips as possible.
+        """
+        topics = list(self.subscriptions)
+        commands = [f'AT+CMQSUB={self.mqtt_id},"{topic}",{self.subscriptions[topic][0]}' for topic in topics]
+        for topic, result in zip(topics, self.at_command.send_batch(commands, stop_on_error=False)):
+            if not result.ok:
+                logger.error("Failed to restore subscription to %s: %s", topic, result.error)
+
+    def reconnect(self) -> None:
+        """
+        Drops the module-side client and connects again from scratch, restoring the subscriptions.
+
+        Raises:
+            ATCommandError: If the connection cannot be re-established.
+        """
+        self._release()
+        self.connect()
+
+    def is_connected(self) -> bool:
+        """
+        Asks the module whether the client is still connected (AT+CMQCON?) and updates the local state.
+
+        Returns:
+            bool: True if the broker connection is up.
+        """
+        if self.mqtt_id is None:
+            return False
+        try:
+            response = self.at_command.send_command("AT+CMQCON?")
+        except ATCommandError:
+            return self.connected
+        self.connected = False
+        for state in find_all(response, "+CMQCON:"):
+            if state.mqtt_id == self.mqtt_id:
+                self.connected = state.connected
+        return self.connected
+
+    def publish(self, topic: str, payload, qos: int = 1, retain: bool = False) -> None:
+        """
+        Publishes a message, connecting first if necessary and reconnecting once if the publish fails.
+
+        Args:
+            topic (str): Topic name.
+            payload (str | bytes | bytearray | memoryview): Message payload; strings are sent UTF-8 encoded.
+            qos (int, optional): QoS level. Defaults to 1.
+            retain (bool, optional): Retain flag. Defaults to False.
+
+        Raises:
+            ATCommandError: If the message cannot be published.
+        """
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.connect()
+        params = f'"{topic}",{qos},{int(retain)},0,{2 * len(payload)},"'
+        try:
+            self.at_command.send_hex_command(f"AT+CMQPUB={self.mqtt_id},{params}", payload)
+        except ATCommandError as e:
+            logger.warning("Publish to %s failed, reconnecting: %s", topic, e)
+            self.reconnect()
+            self.at_command.send_hex_command(f"AT+CMQPUB={self.mqtt_id},{params}", payload)
+        logger.debug("Published %d bytes to %s", len(payload), topic)
+
+    def subscribe(self, topic: str, qos: int = 1, callback=None) -> None:
+        """
+        Subscribes to a topic filter; the subscription is restored automatically after reconnects.
+
+        Args:
+            topic (str): Topic filter, may contain ``+`` and ``#`` wildcards.
+            qos (int, optional): QoS level. Defaults to 1.
+            callback (Callable[[str, bytes], None] | None, optional): Receives the messages of this
+                subscription from ``ATCommand.poll()``. Defaults to None (use the client callback).
+
+        Raises:
+            ATCommandError: If the module rejects the subscription.
+        """
+        self.subscriptions[topic] = (qos, callback)
+        if self.connected:
+            self.at_command.send_command(f'AT+CMQSUB={self.mqtt_id},"{topic}",{qos}')
+        logger.info("Subscribed to %s", topic)
+
+    def unsubscribe(self, topic: str) -> None:
+        """
+        Removes a subscription.
+
+        Args:
+            topic (str): Topic filter passed to ``subscribe``.
+
+        Raises:
+            ATCommandError: If the module rejects the request.
+        """
+        self.subscriptions.pop(topic, None)
+        if self.connected:
+            self.at_command.send_command(f'AT+CMQUNSUB={self.mqtt_id},"{topic}"')
+
+    def disconnect(self) -> None:
+        """
+        Disconnects from the broker and releases the module-side client; subscriptions are kept for
+        the next ``connect()``.
+        """
+        self._release()
+        logger.info("Disconnected from MQTT broker %s", self.broker)
+
+    def _on_message(self, line: str) -> None:
+        """
+        Delivers a ``+CMQPUB`` URC to the callbacks of matching subscriptions.
+
+        Args:
+            line (str): URC line.
+        """
+        try:
+            message = parse_line(line)
+        except ValueError:
+            logger.error("Malformed URC: %s", line)
+            return
+        if not isinstance(message, MQTTMessage) or message.mqtt_id != self.mqtt_id:
+            return
+        for pattern, (_, callback) in self.subscriptions.items():
+            if topic_matches(pattern, message.topic):
+                callback = callback or self.callback
+                if callback is not None:
+                    callback(message.topic, message.payload)
+                return
+
+    def _on_disconnect(self, line: str) -> None:
+        """
+        Marks the client as disconnected when the module reports ``+CMQDISCON`` for its handle.
+
+        Args:
+            line (str): URC line, e.g. "+CMQDISCON: 0".
+        """
+        try:
+            mqtt_id = int(line.split(":", 1)[1])
+        except ValueError:
+            return
+        if mqtt_id == self.mqtt_id:
+            self.mqtt_id = None
+            self.connected = False
+            logger.warning("MQTT connection to %s closed by the module", self.broker)
@@ -0,0 +1,116 @@
+import json
+
+from .logger import get_logger
+from .utils import ticks_ms, ticks_diff
+
+logger = get_logger("sim7020py.outbox")
+
+
+class Outbox:
+    """
+    Coalesces outgoing values so several updates leave the modem as one transaction.
+
+    ``put()`` records a value under a key (a later value for the same key replaces the earlier one).
+    The pending values are handed to ``send`` in one call once no new value has arrived for ``window``
+    seconds, but never later than ``max_latency`` seconds after the oldest pending value, or as soon as
+    ``max_items`` keys are pending. There is no background task: call ``poll()`` from the main loop.
+    """
+
+    def __init__(self, send, window: float = 1.0, max_latency: float = 5.0, max_items: int = 16, clock=ticks_ms):
+        """
+        Args:
+            send (Callable[[dict], None]): Delivers the pending ``{key: value}`` items as one message.
+            window (float, optional): Quiet time in seconds after the last ``put()`` before flushing. Defaults to 1.0.
+            max_latency (float, optional): Maximum age in seconds of a pending value. Defaults to 5.0.
+            max_items (int, optional): Number of pending keys that triggers an immediate flush. Defaults to 16.
+            clock (Callable[[], int], optional): Millisecond tick source. Defaults to ``ticks_ms``.
+        """
+        self.send = send
+        self.window_ms = int(window * 1000)
+        self.max_latency_ms = int(max_latency * 1000)
+        self.max_items = max_items
+        self.clock = clock
+        self.pending = {}
+        self._first = None  # Tick of the oldest pending value
+        self._last = None  # Tick of the newest pending value
+
+    def put(self, key, value) -> None:
+        """
+        Queues a value, replacing a pending value for the same key.
+
+        Args:
+            key (str | int): Value identifier, e.g. a virtual pin or a JSON field name.
+            value (Any): The value.
+
+        Raises:
+            Exception: Whatever ``send`` raises if this call triggers a flush.
+        """
+        now = self.clock()
+        if not self.pending:
+            self._first = now
+        self._last = now
+        self.pending[key] = value
+        if len(self.pending) >= self.max_items or ticks_diff(now, self._first) >= self.max_latency_ms:
+            self.flush()
+
+    def due(self) -> bool:
+        """
+        Returns:
+            bool: True if the pending values should be sent now.
+        """
+        if not self.pending:
+            return False
+        now = self.clock()
+        return (ticks_diff(now, self._last) >= self.window_ms
+                or ticks_diff(now, self._first) >= self.max_latency_ms)
+
+    def poll(self) -> bool:
+        """
+        Flushes the pending values if the window or the latency bound has expired.
+
+        Returns:
+            bool: True if a message was sent.
+
+        Raises:
+            Exception: Whatever ``send`` raises; the values stay pending.
+        """
+        if self.due():
+            self.flush()
+            return True
+        return False
+
+    def flush(self) -> None:
+        """
+        Sends all pending values now as one message.
+
+        Raises:
+            Exception: Whatever ``send`` raises; the values stay pending for the next attempt.
+        """
+        if not self.pending:
+            return
+        items = self.pending
+        self.pending = {}
+        try:
+            self.send(items)
+        except Exception:
+            items.update(self.pending)  # Values queued meanwhile are newer
+            self.pending = items
+            raise
+        logger.debug("Flushed %d coalesced values", len(items))
+        self._first = self._last = None
+
+
+def json_sender(publish, topic: str):
+    """
+    Builds an ``Outbox`` sender publishing the pending items as one JSON object.
+
+    Args:
+        publish (Callable[[str, str], None]): E.g. ``SIM7020.mqtt_publish`` or ``MQTTClient.publish``.
+        topic (str): Topic of the combined message.
+
+    Returns:
+        Callable[[dict], None]: The sender.
+    """
+    def send(items):
+        publish(topic, json.dumps(items))
+    return send
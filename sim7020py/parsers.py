@@ -0,0 +1,320 @@
+import binascii
+
+
+class Record:
+    """Base class of parsed information responses; fields are the subclass ``__slots__`` in reply order."""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        names = self.__slots__
+        for i in range(len(names)):
+            setattr(self, names[i], values[i] if i < len(values) else None)
+
+    def __eq__(self, other):
+        return type(other) is type(self) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class SignalQuality(Record):
+    """``+CSQ: <rssi>,<ber>``"""
+    __slots__ = ("rssi", "ber")
+
+
+class AttachState(Record):
+    """``+CGATT: <state>``"""
+    __slots__ = ("attached",)
+
+
+class Registration(Record):
+    """``+CEREG: [<n>,]<stat>[,<tac>,<ci>[,<act>]]``; ``n`` is None for the unsolicited form."""
+    __slots__ = ("n", "stat", "tac", "ci", "act")
+
+    @property
+    def registered(self) -> bool:
+        """True when registered on the home network (1) or roaming (5)."""
+        return self.stat in (1, 5)
+
+
+class PDPDefinition(Record):
+    """``+CGDCONT: <cid>,<pdp_type>,<apn>,...``"""
+    __slots__ = ("cid", "pdp_type", "apn")
+
+
+class PDPContext(Record):
+    """``+CGCONTRDP: <cid>,<bearer_id>,<apn>[,<local_address>[,<gateway>[,<dns_primary>[,<dns_secondary>]]]]``"""
+    __slots__ = ("cid", "bearer_id", "apn", "local_address", "gateway", "dns_primary", "dns_secondary")
+
+    @property
+    def ip(self) -> str | None:
+        """The IPv4 address, without the subnet mask the module appends as four more octets."""
+        if self.local_address is None:
+            return None
+        return ".".join(self.local_address.split(".")[:4])
+
+
+class MQTTMessage(Record):
+    """``+CMQPUB: <mqtt_id>,<topic>,<qos>,<retained>,<dup>,<length>,<hex payload>`` with the payload decoded."""
+    __slots__ = ("mqtt_id", "topic", "qos", "retained", "dup", "length", "payload")
+
+
+class MQTTConnection(Record):
+    """``+CMQNEW: <mqtt_id>`` and ``+CMQCON: <mqtt_id>,<connected>,<server>,<port>``"""
+    __slots__ = ("mqtt_id", "connected", "server", "port")
+
+
+class CellInfo(Record):
+    """Serving cell line of ``+CENG``."""
+    __slots__ = ("earfcn", "earfcn_offset", "pci", "cell_id", "rsrp", "rsrq", "rssi", "snr", "band", "tac",
+                 "ecl", "tx_power")
+
+
+class NeighbourCell(Record):
+    """Neighbour cell line of ``+CENG``."""
+    __slots__ = ("earfcn", "earfcn_offset", "pci", "rsrp")
+
+
+class HTTPResponse(Record):
+    """``+HTTPGET: <status>,<length>`` followed by the body lines; see ``parse_http``."""
+    __slots__ = ("status", "length", "body")
+
+
+class HTTPHeaders(Record):
+    """``+CHTTPNMIH: <client_id>,<status>,<length>,<headers>``"""
+    __slots__ = ("client_id", "status", "length", "headers")
+
+    def get(self, name: str) -> str | None:
+        """
+        Looks up a header value, ignoring the case of the name.
+
+        Args:
+            name (str): Header name, e.g. "Content-Type".
+
+        Returns:
+            str | None: The value, or None if the header is missing.
+        """
+        name = name.lower() + ":"
+        for line in self.headers.split("\n"):
+            if line.lower().startswith(name):
+                return line[len(name):].strip()
+        return None
+
+
+class HTTPClient(Record):
+    """``+CHTTPCREATE: <client_id>`` and ``+CHTTPERR: <client_id>,<error>``"""
+    __slots__ = ("client_id", "error")
+
+
+class HTTPContent(Record):
+    """``+CHTTPNMIC: <client_id>,<more>,<total_length>,<length>,<hex content>`` with the content decoded."""
+    __slots__ = ("client_id", "more", "total_length", "length", "content")
+
+
+def split_fields(params: str, maxsplit: int = -1) -> list[str]:
+    """
+    Splits the parameter part of a response line at commas outside double quotes.
+
+    Args:
+        params (str): Text after ``+NAME:``.
+        maxsplit (int, optional): Maximum number of splits; the last field keeps the remainder. Defaults to -1.
+
+    Returns:
+        list[str]: The raw fields, quotes included.
+    """
+    if '"' not in params:
+        return params.split(",", maxsplit)
+    fields = []
+    start = 0
+    quoted = False
+    for i in range(len(params)):
+        char = params[i]
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted and len(fields) != maxsplit:
+            fields.append(params[start:i])
+            start = i + 1
+    fields.append(params[start:])
+    return fields
+
+
+def _str(field: str) -> str:
+    """Field converter removing the surrounding double quotes."""
+    return field.strip('"')
+
+
+def _bool(field: str) -> bool:
+    """Field converter for 0/1 flags."""
+    return field.strip() != "0"
+
+
+def _hex(field: str) -> bytes:
+    """Field converter decoding a quoted hex string."""
+    return binascii.unhexlify(field.strip('"'))
+
+
+def _convert(record_class, converters, fields):
+    """Applies ``converters`` to ``fields`` (empty fields become None) and builds the record."""
+    values = []
+    for i in range(min(len(fields), len(converters))):
+        field = fields[i].strip()
+        values.append(converters[i](field) if field else None)
+    return record_class(*values)
+
+
+def fields(record_class, *converters):
+    """
+    Builds a parser for lines whose comma separated fields map one-to-one onto ``record_class``.
+
+    Args:
+        record_class (type): Record subclass to create.
+        *converters (Callable[[str], Any]): One converter per field, in reply order.
+
+    Returns:
+        Callable[[str], Record]: Parser taking the text after ``+NAME:``.
+    """
+    maxsplit = len(converters) - 1
+
+    def parse(params):
+        return _convert(record_class, converters, split_fields(params, maxsplit))
+    return parse
+
+
+def _parse_cereg(params: str) -> Registration:
+    """Tells the query reply (2 or 5+ fields, leading ``<n>``) from the URC (1 or 4 fields)."""
+    raw = split_fields(params)
+    if len(raw) in (1, 4):
+        raw.insert(0, "")
+    return _convert(Registration, (int, int, _str, _str, int), raw)
+
+
+def _parse_ceng(params: str) -> Record:
+    """Tells the serving cell line from the shorter neighbour cell lines."""
+    raw = split_fields(params)
+    if len(raw) <= 4:
+        return _convert(NeighbourCell, (int, int, int, int), raw)
+    return _convert(CellInfo, (int, int, int, _str, int, int, int, int, int, _str, int, int), raw)
+
+
+def _parse_cgdcont(params: str) -> Record:
+    """Keeps the context id, PDP type and APN, ignoring the address and compression fields."""
+    return _convert(PDPDefinition, (int, _str, _str), split_fields(params))
+
+
+# Response grammars by line prefix
+GRAMMARS = {
+    "+CSQ:": fields(SignalQuality, int, int),
+    "+CGATT:": fields(AttachState, _bool),
+    "+CEREG:": _parse_cereg,
+    "+CGDCONT:": _parse_cgdcont,
+    "+CGCONTRDP:": fields(PDPContext, int, int, _str, _str, _str, _str, _str),
+    "+CMQNEW:": fields(MQTTConnection, int),
+    "+CMQCON:": fields(MQTTConnection, int, _bool, _str, _str),
+    "+CMQPUB:": fields(MQTTMessage, int, _str, int, _bool, _bool, int, _hex),
+    "+CENG:": _parse_ceng,
+    "+HTTPGET:": fields(HTTPResponse, int, int),
+    "+CHTTPCREATE:": fields(HTTPClient, int),
+    "+CHTTPERR:": fields(HTTPClient, int, int),
+    "+CHTTPNMIH:": fields(HTTPHeaders, int, int, int, _str),
+    "+CHTTPNMIC:": fields(HTTPContent, int, _bool, int, int, _hex),
+}
+
+
+def register(prefix: str, parser) -> None:
+    """
+    Adds or replaces the grammar for a response prefix.
+
+    Args:
+        prefix (str): Line prefix including the colon, e.g. "+CPIN:".
+        parser (Callable[[str], Record]): Parser taking the text after the prefix, e.g. built with ``fields``.
+    """
+    GRAMMARS[prefix] = parser
+
+
+def parse_line(line: str) -> Record | None:
+    """
+    Parses a single information response line.
+
+    Args:
+        line (str): A stripped response line, e.g. "+CSQ: 15,99".
+
+    Returns:
+        Record | None: The parsed record, or None if no grammar is registered for the prefix.
+
+    Raises:
+        ValueError: If the line does not match its grammar.
+    """
+    colon = line.find(":")
+    if colon < 0 or not line.startswith("+"):
+        return None
+    parser = GRAMMARS.get(line[:colon + 1])
+    if parser is None:
+        return None
+    try:
+        return parser(line[colon + 1:].strip())
+    except (ValueError, TypeError, IndexError) as e:
+        raise ValueError(f"Malformed response line '{line}': {e}")
+
+
+def find(response: list[str], prefix: str) -> Record | None:
+    """
+    Parses the first line of a reply starting with ``prefix``.
+
+    Args:
+        response (list[str]): Reply lines as returned by ``ATCommand.send_command``.
+        prefix (str): Line prefix including the colon, e.g. "+CSQ:".
+
+    Returns:
+        Record | None: The parsed record, or None if no line has the prefix.
+
+    Raises:
+        ValueError: If the line does not match its grammar.
+    """
+    for line in response:
+        if line.startswith(prefix):
+            return parse_line(line)
+    return None
+
+
+def find_all(response: list[str], prefix: str) -> list[Record]:
+    """
+    Parses every line of a reply starting with ``prefix``, e.g. all ``+CENG`` cells.
+
+    Args:
+        response (list[str]): Reply lines.
+        prefix (str): Line prefix including the colon.
+
+    Returns:
+        list[Record]: The parsed records in reply order.
+
+    Raises:
+        ValueError: If a line does not match its grammar.
+    """
+    return [parse_line(line) for line in response if line.startswith(prefix)]
+
+
+def parse_http(response: list[str]) -> HTTPResponse:
+    """
+    Parses the reply to ``AT+HTTPGET``: the ``+HTTPGET`` status line, if present, and the body lines after it.
+
+    Args:
+        response (list[str]): Reply lines.
+
+    Returns:
+        HTTPResponse: Status and length (None if the module sent no status line) and the body.
+
+    Raises:
+        ValueError: If the status line is malformed.
+    """
+    result = HTTPResponse()
+    body = []
+    for line in response:
+        if line.startswith("+HTTPGET:"):
+            result = parse_line(line)
+        elif line not in ("OK", "ERROR"):
+            body.append(line)
+    result.body = "\n".join(body)
+    return result
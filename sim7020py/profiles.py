@@ -0,0 +1,105 @@
+class CommandProfile:
+    """Timing and completion rules of one AT command, consulted by ``send_command`` unless overridden per call."""
+
+    __slots__ = ("timeout", "min_wait", "terminator", "urc")
+
+    def __init__(self, timeout: float | None = None, min_wait: float = 0.0, terminator: str | None = None,
+                 urc: str | None = None):
+        """
+        Args:
+            timeout (float | None, optional): Maximum wait for the final result code in seconds. Defaults to None
+                (the engine's ``timeout``).
+            min_wait (float, optional): Settle time before reading the reply in seconds. Defaults to 0.0.
+            terminator (str | None, optional): Additional line prefix that ends the reply. Defaults to None.
+            urc (str | None, optional): Prefix of the URC that completes the operation after the final result
+                code, e.g. "+CHTTPNMIC:" for AT+CHTTPSEND. Defaults to None.
+        """
+        self.timeout = timeout
+        self.min_wait = min_wait
+        self.terminator = terminator
+        self.urc = urc
+
+    def __repr__(self):
+        return (f"CommandProfile(timeout={self.timeout}, min_wait={self.min_wait}, "
+                f"terminator={self.terminator!r}, urc={self.urc!r})")
+
+
+# Profile of commands without an entry: the engine's timeout, no settle time
+DEFAULT_PROFILE = CommandProfile()
+
+# Profiles by command name. The entry for a name applies to its set and execute forms ("AT+CGATT=1");
+# read and test forms ("AT+CGATT?", "AT+CGATT=?") answer at once and use "<name>?" if present, otherwise
+# DEFAULT_PROFILE. Timeouts follow the maximum response times of the SIM7020 AT manual.
+PROFILES = {
+    "AT": CommandProfile(0.5),
+    "AT+CFUN": CommandProfile(10),
+    "AT+CPIN?": CommandProfile(5),
+    "AT+CGATT": CommandProfile(75),
+    "AT+CENG?": CommandProfile(2),
+    "AT+CMQNEW": CommandProfile(15),
+    "AT+CMQCON": CommandProfile(30),
+    "AT+CMQPUB": CommandProfile(15),
+    "AT+CMQSUB": CommandProfile(15),
+    "AT+CMQUNSUB": CommandProfile(15),
+    "AT+CMQDISCON": CommandProfile(5),
+    "AT+HTTPGET": CommandProfile(60),
+    "AT+CHTTPCREATE": CommandProfile(5),
+    "AT+CHTTPCON": CommandProfile(30),
+    "AT+CHTTPSEND": CommandProfile(10, urc="+CHTTPNMIC:"),
+    "AT+CHTTPDISCON": CommandProfile(5),
+    "AT+CHTTPDESTROY": CommandProfile(5),
+}
+
+
+def command_name(command: str) -> str:
+    """
+    Extracts the profile key of a single command: its name, with "?" for read and test forms.
+
+    Args:
+        command (str): Command such as "AT+CGATT=1", "AT+CGATT?" or "+CEREG?" (a chained part).
+
+    Returns:
+        str: E.g. "AT+CGATT" or "AT+CGATT?".
+    """
+    if not command.startswith("AT"):
+        command = "AT" + command
+    name, _, args = command.partition("=")
+    if name.endswith("?") or args == "?":
+        return name.rstrip("?") + "?"
+    return name
+
+
+def register_profile(name: str, profile: CommandProfile) -> None:
+    """
+    Adds or replaces the profile of a command.
+
+    Args:
+        name (str): Command name, e.g. "AT+CGATT", or "AT+CGATT?" for its read form.
+        profile (CommandProfile): The profile.
+    """
+    PROFILES[name] = profile
+
+
+def profile_for(command: str, default_timeout: float = 1, profiles: dict | None = None) -> CommandProfile:
+    """
+    Looks up the profile of a command line.
+
+    A chained line (``AT+CFUN=1;+CGATT=1``) runs its commands one after another, so its timeout is the sum
+    of theirs, its settle time the longest one, and its terminator and URC those of the last command.
+
+    Args:
+        command (str): Command line as sent.
+        default_timeout (float, optional): Timeout of chained commands without one. Defaults to 1.
+        profiles (dict | None, optional): Registry to use. Defaults to None (``PROFILES``).
+
+    Returns:
+        CommandProfile: The profile; a single command without a timeout leaves it to the engine.
+    """
+    if profiles is None:
+        profiles = PROFILES
+    parts = command.split(";")
+    if len(parts) == 1 or not all(part.startswith("+") for part in parts[1:]):  # ";" inside an argument
+        return profiles.get(command_name(command), DEFAULT_PROFILE)
+    parts = [profiles.get(command_name(part), DEFAULT_PROFILE) for part in parts]
+    timeout = sum(default_timeout if part.timeout is None else part.timeout for part in parts)
+    return CommandProfile(timeout, max(part.min_wait for part in parts), parts[-1].terminator, parts[-1].urc)
@@ -0,0 +1,166 @@
+import random
+import time
+
+from .errors import is_retryable
+from .logger import get_logger
+from .utils import ticks_ms, ticks_diff
+
+logger = get_logger("sim7020py.retry")
+
+
+def retry_all(error: Exception) -> bool:
+    """Retry predicate accepting every exception."""
+    return True
+
+
+class RetryPolicy:
+    """
+    Retries an operation with exponential backoff and jitter, bounded by an attempt count and a deadline.
+
+    The n-th retry waits ``base_delay * multiplier ** (n - 1)`` seconds, capped at ``max_delay`` and shortened
+    by a random fraction of up to ``jitter``, so devices that lost the network together do not retry in lockstep
+    when the cell comes back. No wait starts that would end after the deadline.
+
+    Use ``call()`` (or the policy as a decorator) from blocking code and ``acall()`` from coroutines.
+    """
+
+    def __init__(self, max_attempts: int | None = 3, base_delay: float = 1.0, multiplier: float = 2.0,
+                 max_delay: float = 30.0, jitter: float = 0.5, deadline: float | None = None,
+                 retry_on=is_retryable, sleep=None, async_sleep=None, clock=ticks_ms):
+        """
+        Args:
+            max_attempts (int | None, optional): Attempts including the first; None for no limit. Defaults to 3.
+            base_delay (float, optional): Wait before the first retry in seconds. Defaults to 1.0.
+            multiplier (float, optional): Growth factor of the wait per retry. Defaults to 2.0.
+            max_delay (float, optional): Upper bound of a single wait in seconds. Defaults to 30.0.
+            jitter (float, optional): Largest fraction randomly taken off a wait, 0 (none) to 1 (full jitter).
+                Defaults to 0.5.
+            deadline (float | None, optional): Overall time budget in seconds, from the first attempt.
+                Defaults to None (no deadline).
+            retry_on (Callable[[Exception], bool], optional): Tells whether an error is worth retrying.
+                Defaults to ``is_retryable`` (not SIM, subscription or configuration errors); ``retry_all``
+                retries everything.
+            sleep (Callable[[float], None] | None, optional): Blocking wait used by ``call()``.
+                Defaults to None (``time.sleep``).
+            async_sleep (Callable[[float], Awaitable] | None, optional): Wait awaited by ``acall()``.
+                Defaults to None (``asyncio.sleep``).
+            clock (Callable[[], int], optional): Millisecond tick source. Defaults to ``ticks_ms``.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.sleep = sleep
+        self.async_sleep = async_sleep
+        self.clock = clock
+
+    def backoff(self, retry: int) -> float:
+        """
+        Computes the wait before a retry.
+
+        Args:
+            retry (int): Number of the retry, starting at 1.
+
+        Returns:
+            float: Wait in seconds.
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        if self.jitter:
+            delay -= delay * self.jitter * random.getrandbits(16) / 65536
+        return delay
+
+    def _next_delay(self, attempt: int, start: int, error: Exception) -> float | None:
+        """
+        Decides whether to retry after a failed attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 1.
+            start (int): Tick of the first attempt.
+            error (Exception): The failure.
+
+        Returns:
+            float | None: Wait in seconds before the next attempt, or None to give up.
+        """
+        if not self.retry_on(error):
+            logger.warning("Attempt %s failed, not retrying: %s", attempt, error)
+            return None
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            logger.warning("Attempt %s failed, no attempts left: %s", attempt, error)
+            return None
+        delay = self.backoff(attempt)
+        if self.deadline is not None and ticks_diff(self.clock(), start) + delay * 1000 >= self.deadline * 1000:
+            logger.warning("Attempt %s failed, deadline reached: %s", attempt, error)
+            return None
+        logger.warning("Attempt %s failed, retrying in %.1f s: %s", attempt, delay, error)
+        return delay
+
+    def call(self, operation, *args, **kwargs):
+        """
+        Runs ``operation(*args, **kwargs)`` until it succeeds or the policy gives up.
+
+        Returns:
+            Any: The result of the first successful attempt.
+
+        Raises:
+            Exception: The last error once the policy gives up.
+        """
+        start = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return operation(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(attempt, start, e)
+                if delay is None:
+                    raise
+            (self.sleep or time.sleep)(delay)
+
+    async def acall(self, operation, *args, **kwargs):
+        """
+        Awaits ``operation(*args, **kwargs)`` until it succeeds or the policy gives up, waiting without
+        blocking other tasks.
+
+        Returns:
+            Any: The result of the first successful attempt.
+
+        Raises:
+            Exception: The last error once the policy gives up.
+        """
+        start = self.clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await operation(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(attempt, start, e)
+                if delay is None:
+                    raise
+            await (self.async_sleep or _asyncio_sleep)(delay)
+
+    def __call__(self, function):
+        """
+        Decorates a function so every call runs under this policy.
+
+        Args:
+            function (Callable): The function.
+
+        Returns:
+            Callable: The wrapped function.
+        """
+        def wrapper(*args, **kwargs):
+            return self.call(function, *args, **kwargs)
+        return wrapper
+
+
+def _asyncio_sleep(delay: float):
+    """Default wait of ``acall()``, imported lazily so blocking code does not pull in asyncio."""
+    try:
+        import uasyncio as asyncio
+    except ImportError:
+        import asyncio
+    return asyncio.sleep(delay)
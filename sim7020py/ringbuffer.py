@@ -0,0 +1,186 @@
+OVERFLOW_DROP_OLDEST = 0  # Discard the oldest buffered bytes to make room
+OVERFLOW_DROP_NEWEST = 1  # Discard incoming bytes while the buffer is full
+OVERFLOW_ERROR = 2  # Raise OverflowError
+
+
+class RingBuffer:
+    """Fixed-size byte ring buffer for the UART receive path; filling it allocates no new buffers."""
+
+    def __init__(self, size: int = 512, overflow: int = OVERFLOW_DROP_OLDEST):
+        """
+        Preallocates the buffer.
+
+        Args:
+            size (int, optional): Capacity in bytes. Defaults to 512.
+            overflow (int, optional): One of the ``OVERFLOW_*`` policies. Defaults to OVERFLOW_DROP_OLDEST.
+        """
+        self.size = size
+        self.overflow = overflow
+        self.dropped = 0  # Bytes lost to overflow since creation
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._scratch = bytearray(32)  # Sink for bytes discarded under OVERFLOW_DROP_NEWEST
+        self._head = 0  # Index of the oldest byte
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def free(self) -> int:
+        """
+        Returns:
+            int: Number of bytes that can be stored without overflowing.
+        """
+        return self.size - self._count
+
+    def clear(self) -> None:
+        """
+        Discards all buffered bytes.
+        """
+        self._head = 0
+        self._count = 0
+
+    def _make_room(self, nbytes: int) -> int:
+        """
+        Applies the overflow policy for an incoming block.
+
+        Args:
+            nbytes (int): Number of bytes about to be stored.
+
+        Returns:
+            int: Number of bytes that may be stored.
+
+        Raises:
+            OverflowError: Under OVERFLOW_ERROR, if the block does not fit.
+        """
+        excess = nbytes - self.free()
+        if excess <= 0:
+            return nbytes
+        if self.overflow == OVERFLOW_ERROR:
+            raise OverflowError("Receive buffer full")
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            excess = min(excess, self._count)
+            self._head = (self._head + excess) % self.size
+            self._count -= excess
+            self.dropped += excess
+            return min(nbytes, self.size)
+        return self.free()
+
+    def fill(self, stream, nbytes: int) -> int:
+        """
+        Reads up to ``nbytes`` from a stream straight into the buffer with ``readinto``.
+
+        Args:
+            stream: Object with ``readinto(buf)``, e.g. ``machine.UART``.
+            nbytes (int): Number of bytes the stream has available.
+
+        Returns:
+            int: Number of bytes stored.
+        """
+        room = self._make_room(nbytes)
+        if self.overflow == OVERFLOW_DROP_OLDEST:
+            self._discard(stream, nbytes - room)  # Oldest incoming bytes go first
+        stored = 0
+        while room > 0:
+            start = (self._head + self._count) % self.size
+            chunk = min(room, self.size - start)  # Contiguous free space up to the wrap point
+            received = stream.readinto(self._view[start:start + chunk]) or 0
+            self._count += received
+            stored += received
+            room -= received
+            if received < chunk:
+                break
+        if self.overflow == OVERFLOW_DROP_NEWEST:
+            self._discard(stream, nbytes - stored)
+        return stored
+
+    def _discard(self, stream, nbytes: int) -> None:
+        """
+        Reads and drops bytes from a stream without storing them.
+
+        Args:
+            stream: Object with ``readinto(buf)``.
+            nbytes (int): Number of bytes to drop.
+        """
+        while nbytes > 0:
+            if nbytes >= len(self._scratch):
+                received = stream.readinto(self._scratch)
+            else:
+                received = stream.readinto(memoryview(self._scratch)[:nbytes])
+            if not received:
+                break
+            nbytes -= received
+            self.dropped += received
+
+    def write(self, data) -> int:
+        """
+        Copies bytes into the buffer.
+
+        Args:
+            data (bytes | bytearray | memoryview): Bytes to store.
+
+        Returns:
+            int: Number of bytes stored.
+        """
+        room = self._make_room(len(data))
+        skipped = len(data) - room
+        self.dropped += skipped
+        offset = skipped if self.overflow == OVERFLOW_DROP_OLDEST else 0
+        for index in range(offset, offset + room):
+            self._buf[(self._head + self._count) % self.size] = data[index]
+            self._count += 1
+        return room
+
+    def find(self, value: bytes = b"\n") -> int:
+        """
+        Locates a single-byte delimiter.
+
+        Args:
+            value (bytes, optional): One-byte delimiter. Defaults to b"\\n".
+
+        Returns:
+            int: Offset from the oldest buffered byte, or -1 if not buffered.
+        """
+        # An index loop rather than bytearray.find(), which MicroPython does not provide
+        byte = value[0]
+        buf = self._buf
+        index = self._head
+        for offset in range(self._count):
+            if buf[index] == byte:
+                return offset
+            index += 1
+            if index == self.size:
+                index = 0
+        return -1
+
+    def read(self, nbytes: int) -> bytes:
+        """
+        Removes and returns the oldest bytes.
+
+        Args:
+            nbytes (int): Maximum number of bytes.
+
+        Returns:
+            bytes: Up to ``nbytes`` bytes.
+        """
+        nbytes = min(nbytes, self._count)
+        end = self._head + nbytes
+        if end <= self.size:
+            data = bytes(self._view[self._head:end])
+        else:
+            data = bytes(self._view[self._head:]) + bytes(self._view[:end - self.size])
+        self._head = end % self.size
+        self._count -= nbytes
+        return data
+
+    def readline(self) -> bytes | None:
+        """
+        Removes and returns one complete line, including the trailing newline.
+
+        Returns:
+            bytes | None: The line, or None if no complete line is buffered.
+        """
+        index = self.find()
+        if index < 0:
+            return None
+        return self.read(index + 1)
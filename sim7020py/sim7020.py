@@ -1,22 +1,73 @@
-from .commands import ATCommand, ATCommandError
-from machine import UART
-import binascii  # Добавьте этот импорт в начало файла
+from .commands import ATCommand, ATCommandError, first_failure, UART
+from .urc import parse_mqtt_message
+from .logger import get_logger
+from .outbox import Outbox, json_sender
+from .parsers import find, find_all
+
+logger = get_logger("sim7020py.sim7020")
+
+# Reads the attach state, the PDP contexts and the registration status in one round-trip
+PROBE_COMMAND = "AT+CGATT?;+CGDCONT?;+CEREG?"
+
+
+def attach_plan(response: list[str], apn: str) -> list[str]:
+    """
+    Works out which attach steps are still needed from the reply to ``PROBE_COMMAND``.
+
+    A module that is attached and registered with the requested APN needs nothing, e.g. after the host
+    woke from deep sleep while the module stayed powered. A wrong APN is replaced after detaching. A
+    module that reports ``+CGATT: 1`` is left to finish registering: repeating ``AT+CGATT=1`` would not
+    speed that up. A reply that cannot be parsed plans the full sequence.
+
+    Args:
+        response (list[str]): Reply lines to ``PROBE_COMMAND``; an empty list plans the full sequence.
+        apn (str): APN name for the network.
+
+    Returns:
+        list[str]: Commands to run in order, empty if the module is ready.
+    """
+    try:
+        attach = find(response, "+CGATT:")
+        registration = find(response, "+CEREG:")
+        contexts = [context for context in find_all(response, "+CGDCONT:") if context.cid == 1]
+    except ValueError as e:
+        logger.warning("Unexpected attach probe reply, running the full sequence: %s", e)
+        return attach_plan([], apn)
+    attached = attach is not None and attach.attached
+    steps = []
+    if not contexts or contexts[0].apn != apn:
+        if attached:
+            steps.append("AT+CGATT=0")
+            attached = False
+        steps.append(f'AT+CGDCONT=1,"IP","{apn}"')
+    if not attached:
+        return ["AT+CFUN=1"] + steps + ["AT+CGATT=1"]
+    if registration is None or not registration.registered:
+        logger.info("Attached, network registration still pending")
+    return steps
 
 
 class SIM7020:
     """Class for controlling the SIM7020 module using AT commands."""
 
-    def __init__(self, uart: UART, baudrate: int = 9600, timeout: int = 1):
+    def __init__(self, uart: UART = None, baudrate: int = 9600, timeout: int = 1, port: str | None = None,
+                 transport=None, latency=None):
         """
         Initializes the SIM7020 with the specified UART and parameters.
 
         Args:
-            uart (UART): UART instance for communication.
+            uart (UART, optional): UART instance for communication. Defaults to None.
             baudrate (int, optional): Data transmission rate. Defaults to 9600.
             timeout (int, optional): Response timeout. Defaults to 1.
+            port (str | None, optional): Host port instead of a UART (see ``open_transport``). Defaults to None.
+            transport (Transport | None, optional): Ready-made transport. Defaults to None.
+            latency (LatencyEstimator | None, optional): Learns command latency to shorten timeouts.
+                Defaults to None (fixed timeouts).
         """
-        # Инициализирует ATCommand с переданным UART объектом
-        self.at_command: ATCommand = ATCommand(uart, baudrate, timeout)
+        # Инициализирует ATCommand с переданным UART объектом или хостовым транспортом
+        self.at_command: ATCommand = ATCommand(uart, baudrate, timeout, port=port, transport=transport,
+                                               latency=latency)
+        self._mqtt_callbacks = {}
 
     def initialize(self) -> None:
         """
@@ -29,7 +80,7 @@ class SIM7020:
         if not self.at_command.check_connection():
             raise ATCommandError("Failed to establish connection with SIM7020 module")
 
-        print("SIM7020 module successfully connected")
+        logger.info("SIM7020 module successfully connected")
         self.enable_rf()  # Включение RF
 
     def enable_rf(self) -> None:
@@ -37,10 +88,10 @@ class SIM7020:
         Включает радиомодуль RF, отправляя команду AT+CFUN=1.
         """
         try:
-            self.at_command.send_command("AT+CFUN=1", expected_response="OK", delay=1)
-            print("AT+CFUN=1 успешно отправлена")
+            self.at_command.send_command("AT+CFUN=1", expected_response="OK")
+            logger.info("AT+CFUN=1 успешно отправлена")
         except ATCommandError as e:
-            print(f"Ошибка при отправке AT+CFUN=1: {e}")
+            logger.error("Ошибка при отправке AT+CFUN=1: %s", e)
             # Можно добавить дополнительную обработку, например, повторные попытки
 
     def set_apn(self, apn: str) -> None:
@@ -52,7 +103,7 @@ class SIM7020:
         """
         # Отправляет команду для установки APN
         self.at_command.set_apn(apn)
-        print(f"APN '{apn}' successfully set")
+        logger.info("APN '%s' successfully set", apn)
 
     def connect_network(self) -> None:
         """
@@ -60,7 +111,37 @@ class SIM7020:
         """
         # Отправляет команду для подключения к сети
         self.at_command.connect_network()
-        print("Network connection established")
+        logger.info("Network connection established")
+
+    def attach(self, apn: str) -> None:
+        """
+        Brings the module onto the network in as few round-trips as possible.
+
+        Probes the current state with one chained query (``PROBE_COMMAND``) and runs only the steps that
+        are still needed (see ``attach_plan``) as a single chained command line, at most
+        ``AT+CFUN=1;+CGDCONT=...;+CGATT=1``. A module that is already attached with ``apn`` is left alone.
+
+        Args:
+            apn (str): APN name for the network.
+
+        Raises:
+            ATCommandError: If the module does not respond or any step fails.
+        """
+        try:
+            steps = attach_plan(self.at_command.send_command(PROBE_COMMAND), apn)
+        except ATCommandError:
+            if not self.at_command.check_connection():
+                raise ATCommandError("Failed to establish connection with SIM7020 module")
+            steps = attach_plan([], apn)  # The probe is not supported; run the full sequence
+        if not steps:
+            logger.info("Already attached with APN '%s'", apn)
+            return
+
+        results = self.at_command.send_batch(steps)
+        failed = first_failure(results)
+        if failed is not None:
+            raise ATCommandError(f"'{failed.command}' failed: {failed.error}")
+        logger.info("Attached to network with APN '%s'", apn)
 
     def disconnect_network(self) -> None:
         """
@@ -68,7 +149,7 @@ class SIM7020:
         """
         # Отправляет команду для отключения от сети
         self.at_command.disconnect_network()
-        print("Network disconnection completed")
+        logger.info("Network disconnection completed")
 
     def get_signal_quality(self) -> tuple[int, int]:
         """
@@ -81,7 +162,7 @@ class SIM7020:
         rssi: int
         ber: int
         rssi, ber = self.at_command.get_signal_quality()
-        print(f"Signal quality: RSSI={rssi}, BER={ber}")
+        logger.info("Signal quality: RSSI=%s, BER=%s", rssi, ber)
         return rssi, ber
 
     def send_data(self, data: str) -> None:
@@ -97,17 +178,35 @@ class SIM7020:
         try:
             # Отправляет команду для передачи данных
             self.at_command.send_command(f'AT+SEND={data}', expected_response="SEND OK")
-            print("Data successfully sent")
+            logger.info("Data successfully sent")
         except ATCommandError:
-            print("Error occurred while sending data")
+            logger.error("Error occurred while sending data")
 
     def close(self) -> None:
         """
-        Terminates usage of the module and closes the UART connection.
+        Terminates usage of the module and closes the connection.
         """
         # Закрывает интерфейс AT команд и завершает соединение
         self.at_command.close()
-        print("Connection with the module closed")
+        logger.info("Connection with the module closed")
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the per-command metrics.
+
+        Returns:
+            dict: Command key -> counters and latency histogram (see ``CommandMetrics.stats``); empty if the
+                metrics are disabled.
+        """
+        metrics = self.at_command.metrics
+        return {} if metrics is None else metrics.stats()
+
+    def reset_stats(self) -> None:
+        """
+        Clears the per-command metrics, e.g. at the start of a wake cycle.
+        """
+        if self.at_command.metrics is not None:
+            self.at_command.metrics.reset()
 
     def mqtt_new(self, broker_address: str, port: int = 1883, keepalive: int = 12000, buffer_size: int = 1024):
         """
@@ -121,7 +220,7 @@ class SIM7020:
         """
         cmd = f'AT+CMQNEW="{broker_address}","{port}",{keepalive},{buffer_size}'
         self.at_command.send_command(cmd, expected_response="OK")
-        print("MQTT-соединение создано")
+        logger.info("MQTT-соединение создано")
 
     def mqtt_connect(self, client_id: str, clean_session: int = 1, keepalive: int = 12000, username: str = "",
                      password: str = ""):
@@ -137,32 +236,108 @@ class SIM7020:
         """
         cmd = f'AT+CMQCON=0,{clean_session},"{client_id}",{keepalive},1,0,"{username}","{password}"'
         self.at_command.send_command(cmd, expected_response="OK")
-        print("Подключение к MQTT-брокеру выполнено")
+        logger.info("Подключение к MQTT-брокеру выполнено")
 
-    def mqtt_publish(self, topic: str, message: str, qos: int = 1, retain: int = 0):
+    def mqtt_publish(self, topic: str, message, qos: int = 1, retain: int = 0):
         """
         Публикует сообщение в MQTT-топик.
 
         Args:
             topic (str): Топик для публикации.
-            message (str): Сообщение для отправки.
+            message (str | bytes | bytearray | memoryview): Сообщение для отправки; байты кодируются в hex
+                по частям, без промежуточных копий.
             qos (int, optional): QoS уровень. Defaults to 1.
             retain (int, optional): Флаг retain. Defaults to 0.
         """
-        hex_message = binascii.hexlify(message.encode()).decode()
-        hex_length = len(hex_message)
-        cmd = f'AT+CMQPUB=0,"{topic}",{qos},{retain},0,{hex_length},"{hex_message}"'
-        self.at_command.send_command(cmd, expected_response="OK")
-        print(f"Сообщение опубликовано в топик {topic}: {message}")
+        if isinstance(message, str):
+            message = message.encode()
+        cmd = f'AT+CMQPUB=0,"{topic}",{qos},{retain},0,{2 * len(message)},"'
+        self.at_command.send_hex_command(cmd, message, expected_response="OK")
+        logger.info("Сообщение опубликовано в топик %s (%d байт)", topic, len(message))
 
-    def mqtt_subscribe(self, topic: str, qos: int = 1):
+    def mqtt_publish_stats(self, topic: str, qos: int = 0, reset: bool = True):
+        """
+        Публикует метрики команд в компактном JSON (см. ``CommandMetrics.payload``).
+
+        Args:
+            topic (str): Топик для публикации.
+            qos (int, optional): QoS уровень. Defaults to 0.
+            reset (bool, optional): Сбросить метрики после публикации. Defaults to True.
+        """
+        metrics = self.at_command.metrics
+        if metrics is None:
+            return
+        self.mqtt_publish(topic, metrics.payload(), qos)
+        if reset:
+            metrics.reset()
+
+    def mqtt_outbox(self, topic: str, window: float = 1.0, max_latency: float = 5.0, max_items: int = 16) -> Outbox:
+        """
+        Создает очередь, объединяющую значения в одно JSON-сообщение ``{"ключ": значение, ...}``.
+
+        Значения, переданные в ``put()`` в пределах окна, публикуются одной командой AT+CMQPUB;
+        ``poll()`` очереди нужно вызывать из основного цикла.
+
+        Args:
+            topic (str): Топик для публикации.
+            window (float, optional): Время тишины в секундах перед отправкой. Defaults to 1.0.
+            max_latency (float, optional): Максимальная задержка значения в секундах. Defaults to 5.0.
+            max_items (int, optional): Число ключей, при котором очередь отправляется сразу. Defaults to 16.
+
+        Returns:
+            Outbox: Очередь исходящих значений.
+        """
+        return Outbox(json_sender(self.mqtt_publish, topic), window, max_latency, max_items)
+
+    def mqtt_subscribe(self, topic: str, qos: int = 1, callback=None):
         """
         Подписывается на MQTT-топик.
 
         Args:
             topic (str): Топик для подписки.
             qos (int, optional): QoS уровень. Defaults to 1.
+            callback (Callable[[str, bytes], None] | None, optional): Вызывается для каждого входящего
+                сообщения топика из ``poll()``. Defaults to None.
         """
         cmd = f'AT+CMQSUB=0,"{topic}",{qos}'
         self.at_command.send_command(cmd, expected_response="OK")
-        print(f"Подписка на топик {topic} выполнена")
+        if callback is not None:
+            if not self._mqtt_callbacks:
+                self.at_command.register_urc("+CMQPUB:", self._on_mqtt_message)
+            self._mqtt_callbacks[topic] = callback
+        logger.info("Подписка на топик %s выполнена", topic)
+
+    def mqtt_disconnect(self, mqtt_id: int = 0):
+        """
+        Отключается от MQTT-брокера и освобождает MQTT-соединение модуля.
+
+        Args:
+            mqtt_id (int, optional): Идентификатор MQTT-соединения. Defaults to 0.
+        """
+        self.at_command.send_command(f"AT+CMQDISCON={mqtt_id}", expected_response="OK")
+        logger.info("Отключение от MQTT-брокера выполнено")
+
+    def _on_mqtt_message(self, line: str):
+        """
+        Доставляет входящее MQTT-сообщение (URC +CMQPUB) подписчику топика.
+
+        Args:
+            line (str): Строка URC.
+        """
+        try:
+            topic, payload = parse_mqtt_message(line)
+        except ValueError:
+            logger.error("Некорректный URC: %s", line)
+            return
+        callback = self._mqtt_callbacks.get(topic)
+        if callback is not None:
+            callback(topic, payload)
+
+    def poll(self) -> int:
+        """
+        Processes unsolicited result codes received since the last command (e.g. MQTT downlink).
+
+        Returns:
+            int: Number of lines processed.
+        """
+        return self.at_command.poll()
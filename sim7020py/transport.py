@@ -0,0 +1,333 @@
+import os
+import time
+try:
+    from machine import idle
+except ImportError:  # Running on a host
+    idle = None
+
+from .utils import ticks_ms, ticks_diff
+
+
+def _sleep_ms(ms: int) -> None:
+    if hasattr(time, "sleep_ms"):
+        time.sleep_ms(ms)
+    else:
+        time.sleep(ms / 1000)
+
+
+def _selector(fileobj):
+    """Creates a selector watching ``fileobj`` for readability, or None where selectors are unavailable."""
+    try:
+        import selectors
+
+        selector = selectors.DefaultSelector()
+        selector.register(fileobj, selectors.EVENT_READ)
+        return selector
+    except (ImportError, AttributeError, TypeError, ValueError, OSError):  # E.g. no fileno() on Windows ports
+        return None
+
+
+class Transport:
+    """Byte stream between the AT command engine and the modem."""
+
+    def any(self) -> int:
+        """
+        Returns:
+            int: Number of bytes that can be read without blocking.
+        """
+        raise NotImplementedError
+
+    def readinto(self, buf) -> int | None:
+        """
+        Reads available bytes into a buffer without blocking.
+
+        Args:
+            buf (bytearray | memoryview): Destination buffer.
+
+        Returns:
+            int | None: Number of bytes read, or None if nothing was available.
+        """
+        raise NotImplementedError
+
+    def wait(self, timeout_ms: int) -> bool:
+        """
+        Blocks until bytes are readable or the timeout expires, without spinning.
+
+        This fallback sleeps in 1 ms steps between ``any()`` checks; transports override it to block on
+        readiness of the underlying device.
+
+        Args:
+            timeout_ms (int): Maximum wait in milliseconds.
+
+        Returns:
+            bool: True if bytes are readable.
+        """
+        start = ticks_ms()
+        while not self.any():
+            if ticks_diff(ticks_ms(), start) >= timeout_ms:
+                return False
+            _sleep_ms(1)
+        return True
+
+    def write(self, data) -> int:
+        """
+        Writes bytes to the modem.
+
+        Args:
+            data (bytes | bytearray | memoryview): Bytes to send.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Releases the underlying device.
+        """
+        raise NotImplementedError
+
+
+class UARTTransport(Transport):
+    """
+    Transport over a MicroPython ``machine.UART``.
+
+    Waits block in ``select.poll`` on the UART, or, with ``rx_idle_irq``, sleep in ``machine.idle()`` until the
+    UART's RX idle interrupt reports that the modem stopped sending, so the core is halted between bytes.
+    """
+
+    def __init__(self, uart, baudrate: int = 9600, timeout: int = 1, rx_idle_irq: bool = False):
+        """
+        Args:
+            uart (UART): UART instance from the machine module.
+            baudrate (int, optional): Data transfer rate. Defaults to 9600.
+            timeout (int, optional): UART read timeout in seconds. Defaults to 1.
+            rx_idle_irq (bool, optional): Wake waiters from the ``UART.IRQ_RXIDLE`` interrupt (ports that
+                provide it, e.g. rp2) instead of polling the stream. Defaults to False.
+        """
+        self.uart = uart
+        self.uart.init(baudrate=baudrate, timeout=timeout)
+        self._rx_idle = None  # Set by the RX idle interrupt; None when it is not used
+        self._poller = None
+        if rx_idle_irq and idle is not None and hasattr(uart, "IRQ_RXIDLE"):
+            self._rx_idle = False
+            uart.irq(handler=self._on_rx_idle, trigger=uart.IRQ_RXIDLE)
+        else:
+            try:
+                import select
+
+                self._poller = select.poll()
+                self._poller.register(uart, select.POLLIN)
+            except (ImportError, AttributeError, TypeError, ValueError, OSError):  # Stream without poll support
+                self._poller = None
+
+    def _on_rx_idle(self, uart) -> None:
+        self._rx_idle = True
+
+    def any(self) -> int:
+        return self.uart.any()
+
+    def wait(self, timeout_ms: int) -> bool:
+        if self._rx_idle is not None:
+            self._rx_idle = False  # Cleared before checking, so an interrupt in between is not missed
+            start = ticks_ms()
+            while not self.uart.any() and not self._rx_idle and ticks_diff(ticks_ms(), start) < timeout_ms:
+                idle()  # Halts the core until the next interrupt
+            return self.uart.any() > 0
+        if self._poller is not None:
+            return bool(self._poller.poll(timeout_ms))
+        return Transport.wait(self, timeout_ms)
+
+    def readinto(self, buf) -> int | None:
+        return self.uart.readinto(buf)
+
+    def write(self, data) -> int:
+        return self.uart.write(data)
+
+    def close(self) -> None:
+        self.uart.deinit()  # Deinitialize UART
+
+
+class SerialTransport(Transport):
+    """Transport over a host serial port (USB-serial adapter) using pyserial."""
+
+    def __init__(self, port: str, baudrate: int = 9600, timeout: int = 1):
+        """
+        Args:
+            port (str): Serial device, e.g. "/dev/ttyUSB0" or "COM3".
+            baudrate (int, optional): Data transfer rate. Defaults to 9600.
+            timeout (int, optional): Write timeout in seconds; reads never block. Defaults to 1.
+        """
+        import serial  # Only needed on hosts
+
+        self.serial = serial.Serial(port, baudrate=baudrate, timeout=0, write_timeout=timeout)
+        self._selector = _selector(self.serial)
+
+    def any(self) -> int:
+        return self.serial.in_waiting
+
+    def wait(self, timeout_ms: int) -> bool:
+        if self._selector is None or self.any():
+            return Transport.wait(self, timeout_ms)
+        return bool(self._selector.select(timeout_ms / 1000))
+
+    def readinto(self, buf) -> int | None:
+        return self.serial.readinto(buf) or None
+
+    def write(self, data) -> int:
+        return self.serial.write(data)
+
+    def close(self) -> None:
+        if self._selector is not None:
+            self._selector.close()
+        self.serial.close()
+
+
+class SocketTransport(Transport):
+    """Transport over a TCP connection, e.g. a serial-to-network bridge or the modem emulator."""
+
+    def __init__(self, host: str, port: int, timeout: int = 1, sock=None, buffer_size: int = 256):
+        """
+        Args:
+            host (str): Host name or address.
+            port (int): TCP port.
+            timeout (int, optional): Connect timeout in seconds. Defaults to 1.
+            sock (socket.socket | None, optional): Already connected socket to use instead. Defaults to None.
+            buffer_size (int, optional): Size of the staging buffer behind ``any()``. Defaults to 256.
+        """
+        import socket
+
+        if sock is None:
+            sock = socket.create_connection((host, port), timeout)
+        sock.setblocking(False)
+        self.sock = sock
+        self._staged = bytearray(buffer_size)  # Sockets cannot report pending bytes portably
+        self._view = memoryview(self._staged)
+        self._start = 0
+        self._end = 0
+        self._selector = _selector(sock)
+        self.eof = False  # Set once the peer closed the connection
+
+    def wait(self, timeout_ms: int) -> bool:
+        if self._selector is None or self._start != self._end:
+            return Transport.wait(self, timeout_ms)
+        if self.eof:
+            raise OSError("Connection closed by peer")
+        return bool(self._selector.select(timeout_ms / 1000))
+
+    def any(self) -> int:
+        """
+        Returns:
+            int: Number of bytes that can be read without blocking.
+
+        Raises:
+            OSError: If the peer closed the connection and everything it sent has been read. A closed socket
+                stays readable, so reporting "nothing pending" would make waiters spin.
+        """
+        if self._start == self._end:
+            if self.eof:
+                raise OSError("Connection closed by peer")
+            try:
+                received = self.sock.recv_into(self._staged)
+            except OSError:  # EAGAIN: nothing pending
+                received = None
+            if received == 0:
+                self.eof = True
+                raise OSError("Connection closed by peer")
+            self._start = 0
+            self._end = received or 0
+        return self._end - self._start
+
+    def readinto(self, buf) -> int | None:
+        available = self.any()
+        if not available:
+            return None
+        nbytes = min(len(buf), available)
+        buf[:nbytes] = self._view[self._start:self._start + nbytes]
+        self._start += nbytes
+        return nbytes
+
+    def write(self, data) -> int:
+        self.sock.setblocking(True)
+        try:
+            self.sock.sendall(data)
+        finally:
+            self.sock.setblocking(False)
+        return len(data)
+
+    def close(self) -> None:
+        if self._selector is not None:
+            self._selector.close()
+        self.sock.close()
+
+
+class PtyTransport(Transport):
+    """Transport over a POSIX pseudo-terminal, e.g. the slave side exposed by the modem emulator."""
+
+    def __init__(self, path: str, timeout: int = 1):
+        """
+        Args:
+            path (str): Terminal device path, e.g. "/dev/pts/3".
+            timeout (int, optional): Write timeout in seconds while the terminal buffer is full. Defaults to 1.
+        """
+        import tty
+
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        tty.setraw(self.fd)
+        self.timeout = timeout
+        self._selector = _selector(self.fd)
+
+    def wait(self, timeout_ms: int) -> bool:
+        if self._selector is None:
+            return Transport.wait(self, timeout_ms)
+        return bool(self._selector.select(timeout_ms / 1000))
+
+    def any(self) -> int:
+        import fcntl
+        import struct
+        import termios
+
+        return struct.unpack("i", fcntl.ioctl(self.fd, termios.FIONREAD, b"\0\0\0\0"))[0]
+
+    def readinto(self, buf) -> int | None:
+        try:
+            return os.readv(self.fd, [buf]) or None
+        except BlockingIOError:
+            return None
+
+    def write(self, data) -> int:
+        import select
+
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self.fd, view):]
+            except BlockingIOError:  # Terminal buffer full: sleep until the reader drains it
+                if not select.select((), (self.fd,), (), self.timeout)[1]:
+                    raise OSError("Write timeout")
+        return len(data)
+
+    def close(self) -> None:
+        if self._selector is not None:
+            self._selector.close()
+        os.close(self.fd)
+
+
+def open_transport(port: str, baudrate: int = 9600, timeout: int = 1) -> Transport:
+    """
+    Opens a host transport from a port specification.
+
+    Args:
+        port (str): "socket://host:port", "pty:/dev/pts/N", or a serial device name.
+        baudrate (int, optional): Data transfer rate for serial ports. Defaults to 9600.
+        timeout (int, optional): Timeout in seconds. Defaults to 1.
+
+    Returns:
+        Transport: The opened transport.
+    """
+    if port.startswith("socket://"):
+        host, _, tcp_port = port[len("socket://"):].rpartition(":")
+        return SocketTransport(host, int(tcp_port), timeout)
+    if port.startswith("pty:"):
+        return PtyTransport(port[len("pty:"):], timeout)
+    return SerialTransport(port, baudrate, timeout)
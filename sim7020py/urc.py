@@ -0,0 +1,165 @@
+from .logger import get_logger
+from .parsers import MQTTMessage, parse_line
+
+logger = get_logger("sim7020py.urc")
+
+# Unsolicited result codes the SIM7020 emits on its own
+URC_PREFIXES = ("+CMQPUB:", "+CMQDISCON:", "+CEREG:", "+CGREG:", "+CSQ:", "+CGEV:", "+CPIN:", "+CHTTPNMIH:",
+                "+CHTTPNMIC:", "+CHTTPERR:")
+
+# Prefixes that are never part of a command reply, even when the command has the same name
+ALWAYS_URC = ("+CMQPUB:", "+CHTTPNMIH:", "+CHTTPNMIC:", "+CHTTPERR:")
+
+
+def line_prefix(line: str) -> str | None:
+    """
+    Extracts the ``+NAME:`` prefix from a response line.
+
+    Args:
+        line (str): A single, stripped response line.
+
+    Returns:
+        str | None: The prefix including the colon, or None for lines without one.
+    """
+    if not line.startswith("+"):
+        return None
+    colon = line.find(":")
+    if colon < 0:
+        return None
+    return line[:colon + 1]
+
+
+def parse_mqtt_message(line: str) -> tuple[str, bytes]:
+    """
+    Parses a ``+CMQPUB`` downlink URC.
+
+    Args:
+        line (str): URC line, e.g. ``+CMQPUB: 0,"topic",1,0,0,4,"3130"``.
+
+    Returns:
+        tuple[str, bytes]: Topic and decoded payload.
+
+    Raises:
+        ValueError: If the line is not a well-formed ``+CMQPUB`` URC.
+    """
+    message = parse_line(line)
+    if not isinstance(message, MQTTMessage):
+        raise ValueError(f"Not a +CMQPUB URC: '{line}'")
+    return message.topic, message.payload
+
+
+class URCDispatcher:
+    """Routes unsolicited result codes to handlers registered by line prefix."""
+
+    def __init__(self, backlog_size: int = 16):
+        """
+        Initializes an empty dispatcher.
+
+        Args:
+            backlog_size (int, optional): Number of unhandled URCs kept for later inspection. Defaults to 16.
+        """
+        self.handlers = {}
+        self.backlog = []
+        self.backlog_size = backlog_size
+        self.held = None  # URCs queued while a command collects its reply; None when delivering directly
+
+    def register(self, prefix: str, handler) -> None:
+        """
+        Registers a handler for URCs starting with the given prefix.
+
+        Args:
+            prefix (str): URC prefix including the colon, e.g. "+CMQPUB:".
+            handler (Callable[[str], None]): Called with the full URC line.
+        """
+        self.handlers.setdefault(prefix, []).append(handler)
+
+    def unregister(self, prefix: str, handler=None) -> None:
+        """
+        Removes one handler, or all handlers, for a prefix.
+
+        Args:
+            prefix (str): URC prefix including the colon.
+            handler (Callable | None, optional): Handler to remove. Defaults to None (remove all).
+        """
+        if handler is None:
+            self.handlers.pop(prefix, None)
+        elif handler in self.handlers.get(prefix, ()):
+            self.handlers[prefix].remove(handler)
+
+    def is_urc(self, line: str, command: str | None = None) -> bool:
+        """
+        Decides whether a line is unsolicited or belongs to the pending command reply.
+
+        Args:
+            line (str): A single, stripped response line.
+            command (str | None, optional): The command awaiting a reply. Defaults to None.
+
+        Returns:
+            bool: True if the line should be dispatched rather than returned to the caller.
+        """
+        prefix = line_prefix(line)
+        if prefix is None or (prefix not in self.handlers and prefix not in URC_PREFIXES):
+            return False
+        if command is None or prefix in ALWAYS_URC:
+            return True
+        # "+CSQ: 15,99" answers "AT+CSQ" (also when chained), so it is only unsolicited for other commands
+        name = prefix[:-1]
+        for part in command[2:].split(";"):
+            if part.startswith(name):
+                return False
+        return True
+
+    def hold(self) -> bool:
+        """
+        Queues URCs instead of delivering them, until ``release()``.
+
+        Used while a command collects its reply: a handler that sends a command of its own would otherwise
+        run in the middle of the reply and consume it.
+
+        Returns:
+            bool: True if this call started holding; only that caller should release.
+        """
+        if self.held is not None:
+            return False
+        self.held = []
+        return True
+
+    def release(self) -> int:
+        """
+        Stops holding and delivers the queued URCs in arrival order.
+
+        Returns:
+            int: Number of URCs delivered.
+        """
+        held, self.held = self.held, None
+        for line in held or ():
+            self.dispatch(line)
+        return len(held or ())
+
+    def dispatch(self, line: str) -> bool:
+        """
+        Delivers a URC to its handlers, or stores it in the backlog if nobody listens. While held, the URC
+        is queued instead. An exception raised by a handler is logged and does not reach the caller, which
+        is usually the command engine in the middle of a reply.
+
+        Args:
+            line (str): URC line.
+
+        Returns:
+            bool: True if at least one handler was (or, when held, will be) called.
+        """
+        if self.held is not None:
+            self.held.append(line)
+            return bool(self.handlers.get(line_prefix(line)))
+        handlers = self.handlers.get(line_prefix(line))
+        if not handlers:
+            self.backlog.append(line)
+            if len(self.backlog) > self.backlog_size:
+                self.backlog.pop(0)
+            return False
+        for handler in handlers:
+            try:
+                handler(line)
+            except Exception as e:
+                logger.error("URC handler failed for %s: %s", line, e)
+        return True
@@ -1,9 +1,58 @@
 import time
 import json
 
-def log(level, message):
-    """Simple logging function for MicroPython."""
-    print(f"[{level}] {message}")
+from .logger import get_logger, level_of
+from .parsers import find
+
+logger = get_logger("sim7020py.utils")
+
+if hasattr(time, "ticks_ms"):
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+else:
+    def ticks_ms():
+        """Millisecond tick counter for CPython, mirroring MicroPython's time.ticks_ms()."""
+        return int(time.monotonic() * 1000)
+
+    def ticks_diff(end, start):
+        """Difference between two tick values, mirroring MicroPython's time.ticks_diff()."""
+        return end - start
+
+_HEX_DIGITS = b"0123456789abcdef"
+
+
+def hexlify_into(data, buf, start=0, end=None):
+    """
+    Hex-encodes ``data[start:end]`` into a preallocated buffer without creating intermediate objects.
+
+    Args:
+        data (bytes | bytearray | memoryview): Source bytes.
+        buf (bytearray | memoryview): Destination, at least twice as long as the encoded range.
+        start (int): First source index. Defaults to 0.
+        end (int | None): Source index to stop at. Defaults to None (end of ``data``).
+
+    Returns:
+        int: Number of hex digits written to ``buf``.
+    """
+    if end is None:
+        end = len(data)
+    digits = _HEX_DIGITS
+    j = 0
+    for i in range(start, end):
+        value = data[i]
+        buf[j] = digits[value >> 4]
+        buf[j + 1] = digits[value & 15]
+        j += 2
+    return j
+
+def log(level, message, *args):
+    """
+    Logs through the shared leveled logger; ``message`` is %-formatted with ``args`` only if ``level`` is enabled.
+
+    ``level`` is a level constant or its name in any case, including the aliases "WARN", "CRITICAL" and "FATAL";
+    an unknown name logs at INFO rather than failing the caller.
+    """
+    logger.log(level_of(level), message, *args)
 
 def save_state(filename, variable, mode='w'):
     """
@@ -66,15 +115,13 @@ def parse_signal_quality(response):
         tuple | None: Tuple (RSSI, BER) if successful, or None if parsing fails.
     """
     try:
-        for line in response:
-            if line.startswith("+CSQ:"):
-                _, signal_info = line.split(": ")
-                rssi, ber = map(int, signal_info.split(","))
-                return rssi, ber
-    except (ValueError, IndexError) as e:
-        log("ERROR", f"Error parsing signal quality: {e}")
-
-    return None
+        signal = find(response, "+CSQ:")
+    except ValueError as e:
+        log("ERROR", "Error parsing signal quality: %s", e)
+        return None
+    if signal is None:
+        return None
+    return signal.rssi, signal.ber
 
 def validate_response(response, expected_keyword="OK"):
     """
@@ -90,7 +137,7 @@ def validate_response(response, expected_keyword="OK"):
     if any(expected_keyword in line for line in response):
         return True
     else:
-        log("WARNING", f"Expected keyword '{expected_keyword}' not found in response: {response}")
+        log("WARNING", "Expected keyword '%s' not found in response: %s", expected_keyword, response)
         return False
 
 def parse_http_response(response):
@@ -107,31 +154,30 @@ def parse_http_response(response):
         data = response[-1].strip()
         return data
     except IndexError as e:
-        log("ERROR", f"Error parsing HTTP response: {e}")
+        log("ERROR", "Error parsing HTTP response: %s", e)
         return None
 
 def retry_operation(operation, max_retries=3, delay=1):
     """
     Retries an operation several times in case of failure.
 
+    A shorthand for ``RetryPolicy(max_retries, base_delay=delay).call(operation)`` that returns None instead
+    of raising; waits grow exponentially from ``delay`` and are jittered.
+
     Args:
         operation (Callable): A function or lambda expression to execute.
         max_retries (int): The maximum number of retry attempts. Defaults to 3.
-        delay (int): Delay between attempts (in seconds). Defaults to 1.
+        delay (int): Delay before the first retry (in seconds). Defaults to 1.
 
     Returns:
         Any | None: Result of the operation if successful, or None if all retries fail.
     """
-    for attempt in range(max_retries):
-        try:
-            result = operation()
-            return result
-        except Exception as e:
-            log("WARNING", f"Attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(delay)
-    log("ERROR", "Operation failed after all retry attempts")
-    return None
+    from .retry import RetryPolicy  # Deferred: retry imports this module
+    try:
+        return RetryPolicy(max_retries, base_delay=delay).call(operation)
+    except Exception:
+        log("ERROR", "Operation failed after all retry attempts")
+        return None
 
 def format_at_command(command, params=None):
     """
@@ -152,6 +198,8 @@ def handle_timeout(operation, timeout=5):
     """
     Executes an operation with a specified timeout.
 
+    Failed attempts are retried with backoff starting at 0.5 s until the time limit would be exceeded.
+
     Args:
         operation (Callable): Function to execute.
         timeout (int): Time limit for the operation (in seconds). Defaults to 5.
@@ -159,16 +207,12 @@ def handle_timeout(operation, timeout=5):
     Returns:
         Any | None: Result of the operation if successful within timeout, or None if timeout occurs.
     """
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            result = operation()
-            return result
-        except Exception as e:
-            log("WARNING", f"Operation failed, retrying within timeout: {e}")
-            time.sleep(0.5)
-    log("ERROR", "Operation timed out")
-    return None
+    from .retry import RetryPolicy
+    try:
+        return RetryPolicy(None, base_delay=0.5, max_delay=2.0, deadline=timeout).call(operation)
+    except Exception:
+        log("ERROR", "Operation timed out")
+        return None
 
 def extract_json_data(response):
     """
@@ -184,5 +228,5 @@ def extract_json_data(response):
         data = json.loads(response[-1])  # Assuming JSON is in the last line
         return data
     except (json.JSONDecodeError, IndexError) as e:
-        log("ERROR", f"Error parsing JSON data: {e}")
+        log("ERROR", "Error parsing JSON data: %s", e)
         return None
@@ -0,0 +1,30 @@
+# tests/mock_serial.py
+
+from unittest.mock import PropertyMock
+
+
+def answer_from_readlines(serial):
+    """
+    Makes a ``serial.Serial`` mock answer every command line written to it with the lines configured in
+    ``serial.readlines.return_value``, served through ``in_waiting``/``readinto`` like pyserial does.
+
+    Args:
+        serial (MagicMock): The mocked ``serial.Serial`` instance.
+    """
+    pending = bytearray()
+
+    def write(data):
+        if bytes(data).endswith(b"\r\n"):
+            pending.extend(b"".join(serial.readlines.return_value))
+        return len(data)
+
+    def readinto(buf):
+        nbytes = min(len(buf), len(pending))
+        buf[:nbytes] = pending[:nbytes]
+        del pending[:nbytes]
+        return nbytes
+
+    serial.readlines.return_value = []
+    serial.write.side_effect = write
+    serial.readinto.side_effect = readinto
+    type(serial).in_waiting = PropertyMock(side_effect=lambda: len(pending))
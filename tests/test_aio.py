@@ -0,0 +1,112 @@
+# tests/test_aio.py
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.aio import AsyncATCommand, AsyncSIM7020
+from sim7020py.commands import ATCommandError
+
+
+class FakeWriter:
+    """Stream writer stand-in that answers each command with a scripted reply."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.replies = []
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+        if self.replies:
+            self.reader.feed_data(self.replies.pop(0))
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.reader.feed_eof()
+
+
+class TestAsyncATCommand(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """
+        Set up an AsyncATCommand over an in-memory stream pair.
+        """
+        self.reader = asyncio.StreamReader()
+        self.writer = FakeWriter(self.reader)
+        self.at_command = AsyncATCommand(self.reader, self.writer, timeout=1)
+
+    async def asyncTearDown(self):
+        """
+        Clean up after each test.
+        """
+        await self.at_command.close()
+
+    async def test_send_command_success(self):
+        """
+        Test that send_command returns the reply lines up to OK.
+        """
+        self.writer.replies = [b"+CSQ: 15,99\r\nOK\r\n"]
+        response = await self.at_command.send_command("AT+CSQ")
+        self.assertEqual(response, ["+CSQ: 15,99", "OK"])
+        self.assertEqual(self.writer.written, [b"AT+CSQ\r\n"])
+
+    async def test_send_command_error(self):
+        """
+        Test that send_command raises ATCommandError on ERROR.
+        """
+        self.writer.replies = [b"ERROR\r\n"]
+        with self.assertRaises(ATCommandError):
+            await self.at_command.send_command("AT+CGATT=1")
+
+    async def test_send_command_timeout(self):
+        """
+        Test that a missing reply raises ATCommandError after the timeout.
+        """
+        self.at_command.timeout = 0.05
+        with self.assertRaises(ATCommandError):
+            await self.at_command.send_command("AT")
+
+    async def test_urc_between_commands_is_dispatched(self):
+        """
+        Test that the background reader delivers URCs received outside a command.
+        """
+        handler = MagicMock()
+        self.at_command.register_urc("+CEREG:", handler)
+        self.at_command.start()
+        self.reader.feed_data(b"+CEREG: 1\r\n")
+        await asyncio.sleep(0)
+        handler.assert_called_once_with("+CEREG: 1")
+
+    async def test_failing_handler_does_not_stop_the_reader(self):
+        """
+        Test that commands still work after a URC handler raised.
+        """
+        self.at_command.register_urc("+CEREG:", MagicMock(side_effect=RuntimeError("boom")))
+        self.at_command.start()
+        self.reader.feed_data(b"+CEREG: 1\r\n")
+        await asyncio.sleep(0)
+        self.writer.replies = [b"OK\r\n"]
+        self.assertEqual(await self.at_command.send_command("AT"), ["OK"])
+
+    async def test_sim7020_signal_quality(self):
+        """
+        Test that AsyncSIM7020 parses the +CSQ reply with the shared parser.
+        """
+        sim7020 = AsyncSIM7020(self.at_command)
+        self.writer.replies = [b"+CSQ: 20,0\r\nOK\r\n"]
+        self.assertEqual(await sim7020.get_signal_quality(), (20, 0))
+
+    async def test_sim7020_warm_attach(self):
+        """
+        Test that AsyncSIM7020.attach only probes a module already attached with the requested APN.
+        """
+        sim7020 = AsyncSIM7020(self.at_command)
+        self.writer.replies = [b'+CGATT: 1\r\n+CGDCONT: 1,"IP","nbiot",,0,0\r\n+CEREG: 0,1\r\nOK\r\n']
+        await sim7020.attach("nbiot")
+        self.assertEqual(self.writer.written, [b"AT+CGATT?;+CGDCONT?;+CEREG?\r\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from sim7020py.blynk_integration import BlynkIntegration
-from sim7020py.commands import ATCommandError
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.retry import RetryPolicy
+from tests.mock_serial import answer_from_readlines
 
 
 class TestBlynkIntegration(unittest.TestCase):
@@ -14,7 +16,9 @@ class TestBlynkIntegration(unittest.TestCase):
         Set up the BlynkIntegration instance with a mock serial connection for testing.
         """
         self.mock_serial = mock_serial.return_value
-        self.blynk = BlynkIntegration(port="COM_TEST", apn="test_apn", blynk_token="test_token")
+        answer_from_readlines(self.mock_serial)
+        self.blynk = BlynkIntegration(port="COM_TEST", apn="test_apn", blynk_token="test_token",
+                                      server="blynk-cloud.com", retry_policy=RetryPolicy(3, sleep=lambda delay: None))
 
     def test_connect_success(self):
         """
@@ -25,19 +29,18 @@ class TestBlynkIntegration(unittest.TestCase):
         # Call connect and ensure no exceptions are raised
         self.blynk.connect()
 
-        # Verify that the APN setup and network connection commands were sent
-        self.mock_serial.write.assert_any_call(b'AT+CGDCONT=1,"IP","test_apn"\r\n')
-        self.mock_serial.write.assert_any_call(b"AT+CGATT=1\r\n")
+        # Verify that the APN setup and network connection commands were sent (chained on one line)
+        self.mock_serial.write.assert_any_call(b'AT+CFUN=1;+CGDCONT=1,"IP","test_apn";+CGATT=1\r\n')
+        self.assertTrue(self.blynk.connected)
 
     def test_connect_failure(self):
         """
-        Test that connect raises ATCommandError if the network connection fails.
+        Test that connect logs the error and stays disconnected if the network connection fails.
         """
         self.mock_serial.readlines.return_value = [b"ERROR\r\n"]
 
-        # Expect an ATCommandError to be raised on connect
-        with self.assertRaises(ATCommandError):
-            self.blynk.connect()
+        self.blynk.connect()
+        self.assertFalse(self.blynk.connected)
 
     def test_send_value_success(self):
         """
@@ -50,20 +53,22 @@ class TestBlynkIntegration(unittest.TestCase):
         self.blynk.send_value(virtual_pin, value)
 
         expected_command = (
-            b'AT+HTTPGET="http://blynk-cloud.com/test_token/update/1?value=25"\r\n'
+            b'AT+HTTPGET="http://blynk-cloud.com/external/api/update?token=test_token&V1=25"\r\n'
         )
         self.mock_serial.write.assert_called_with(expected_command)
 
     def test_send_value_failure(self):
         """
-        Test that send_value handles failure when unable to send data.
+        Test that send_value retries and then gives up without raising when unable to send data.
         """
         self.mock_serial.readlines.return_value = [b"ERROR\r\n"]
 
         virtual_pin = 1
         value = 25
-        with self.assertRaises(ATCommandError):
-            self.blynk.send_value(virtual_pin, value)
+        self.blynk.send_value(virtual_pin, value)
+
+        expected_command = b'AT+HTTPGET="http://blynk-cloud.com/external/api/update?token=test_token&V1=25"\r\n'
+        self.assertEqual(self.mock_serial.write.call_args_list.count(((expected_command,),)), 3)
 
     def test_get_value_success(self):
         """
@@ -77,7 +82,7 @@ class TestBlynkIntegration(unittest.TestCase):
         self.assertEqual(result, "25")
 
         expected_command = (
-            b'AT+HTTPGET="http://blynk-cloud.com/test_token/get/1"\r\n'
+            b'AT+HTTPGET="http://blynk-cloud.com/external/api/get?token=test_token&V1"\r\n'
         )
         self.mock_serial.write.assert_called_with(expected_command)
 
@@ -108,6 +113,119 @@ class TestBlynkIntegration(unittest.TestCase):
         self.mock_serial.close.assert_called_once()
 
 
+class TestBlynkBatch(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a connected BlynkIntegration over the SIM7020 emulator.
+        """
+        self.emulator = SIM7020Emulator(valid_apns=("nbiot",))
+        self.blynk = BlynkIntegration(apn="nbiot", blynk_token="token", transport=self.emulator,
+                                      retry_policy=RetryPolicy(1, sleep=lambda delay: None))
+        self.blynk.connect()
+
+    def test_send_values_uses_one_request(self):
+        """
+        Test that send_values updates several pins with a single batch HTTP request.
+        """
+        sent = len(self.emulator.commands)
+        self.blynk.send_values({0: 21.5, 1: "on & off"})
+        self.assertEqual(len(self.emulator.commands), sent + 1)
+        self.assertIn("/external/api/batch/update?token=token&V0=21.5&V1=on%20%26%20off", self.emulator.commands[-1])
+        self.assertEqual(self.emulator.pins, {"0": "21.5", "1": "on & off"})
+
+    def test_send_value_encodes_value(self):
+        """
+        Test that a single value is sent URL-encoded to the same API family as the batch update.
+        """
+        self.blynk.send_value(4, "on & off")
+        self.assertIn("/external/api/update?token=token&V4=on%20%26%20off", self.emulator.commands[-1])
+        self.assertEqual(self.emulator.pins, {"4": "on & off"})
+        self.assertEqual(self.blynk.get_value(4), "on & off")
+
+    def test_send_values_validates_status(self):
+        """
+        Test that an HTTP error status counts as a failed send.
+        """
+        self.blynk.blynk_token = ""
+        self.blynk.send_values({0: 1})
+        self.assertEqual(self.emulator.pins, {})
+
+    def test_outbox_flushes_as_batch(self):
+        """
+        Test that the coalescing queue sends all pending pins in one request.
+        """
+        outbox = self.blynk.outbox()
+        outbox.put(2, 5)
+        outbox.put(3, 6)
+        sent = len(self.emulator.commands)
+        outbox.flush()
+        self.assertEqual(len(self.emulator.commands), sent + 1)
+        self.assertEqual(self.emulator.pins, {"2": "5", "3": "6"})
+
+
+class TestBlynkCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a connected BlynkIntegration with a one minute read cache over the SIM7020 emulator.
+        """
+        self.emulator = SIM7020Emulator(valid_apns=("nbiot",))
+        self.emulator.pins.update({"0": "1", "1": "2"})
+        self.blynk = BlynkIntegration(apn="nbiot", blynk_token="token", transport=self.emulator, max_retries=1,
+                                      cache_ttl=60)
+        self.blynk.connect()
+
+    def test_get_values_fetches_in_one_request(self):
+        """
+        Test that several pins are read with one request and then served from the cache.
+        """
+        sent = len(self.emulator.commands)
+        self.assertEqual(self.blynk.get_values([0, 1]), {0: "1", 1: "2"})
+        self.assertEqual(self.blynk.get_value(1), "2")
+        self.assertEqual(len(self.emulator.commands), sent + 1)
+        self.assertIn("/external/api/get?token=token&V0&V1", self.emulator.commands[-1])
+
+    def test_downlink_invalidates_pin(self):
+        """
+        Test that an MQTT downlink naming a pin forces the next read of that pin to go to Blynk.
+        """
+        self.blynk.get_values([0, 1])
+        self.emulator.pins["0"] = "5"
+        self.emulator.publish_downlink("downlink/ds/Integer V0", b"5")
+        self.blynk.sim7020.poll()
+        sent = len(self.emulator.commands)
+        self.assertEqual(self.blynk.get_values([0, 1]), {0: "5", 1: "2"})
+        self.assertIn("token=token&V0\"", self.emulator.commands[sent])
+
+    def test_sent_values_are_cached(self):
+        """
+        Test that a value written to a pin is returned without reading it back.
+        """
+        self.blynk.send_value(3, "7")
+        sent = len(self.emulator.commands)
+        self.assertEqual(self.blynk.get_value(3), "7")
+        self.assertEqual(len(self.emulator.commands), sent)
+
+    def test_get_values_single_pin(self):
+        """
+        Test that the bare value Blynk returns for a single pin is read.
+        """
+        self.assertEqual(self.emulator.http_handler("http://blynk.cloud/external/api/get?token=token&V1"),
+                         (200, "2"))
+        self.assertEqual(self.blynk.get_values([1]), {1: "2"})
+
+    def test_get_values_unexpected_reply_is_not_retried(self):
+        """
+        Test that a reply that is not a pin map is reported once instead of being retried.
+        """
+        self.blynk.retry = RetryPolicy(3, sleep=lambda delay: None)
+        self.emulator.http_handler = lambda url: (200, "<html>")
+        sent = len(self.emulator.commands)
+        self.assertEqual(self.blynk.get_values([0, 1]), {})
+        self.assertEqual(len(self.emulator.commands), sent + 1)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -2,7 +2,12 @@
 
 import unittest
 from unittest.mock import MagicMock, patch
-from sim7020py.commands import ATCommand, ATCommandError
+from sim7020py.commands import ATCommand, ATCommandError, HEX_BUFFER_SIZE, first_failure
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import ResponseTimeout, SIMError
+from sim7020py.metrics import OUTCOME_OK, OUTCOME_ERROR, OUTCOME_TIMEOUT
+from sim7020py.ringbuffer import OVERFLOW_ERROR
+from tests.mock_serial import answer_from_readlines
 
 
 class TestATCommand(unittest.TestCase):
@@ -12,6 +17,7 @@ class TestATCommand(unittest.TestCase):
         Set up the ATCommand instance with a mock serial connection for testing.
         """
         self.mock_serial = mock_serial.return_value
+        answer_from_readlines(self.mock_serial)
         self.at_command = ATCommand(port="COM_TEST")
 
     def test_send_command_success(self):
@@ -109,5 +115,333 @@ class TestATCommand(unittest.TestCase):
         self.mock_serial.close.assert_called_once()
 
 
+class FakeUART:
+    """Minimal stand-in for machine.UART that replays scripted reply chunks."""
+
+    def __init__(self, chunks=None):
+        self.chunks = list(chunks or [])  # Already received, readable right away
+        self.script = []  # Reply chunks that become readable after the next write
+        self.replies = []  # One reply per write, for multi-command exchanges
+        self.written = []
+
+    def init(self, **kwargs):
+        pass
+
+    def any(self):
+        return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, nbytes=None):
+        return self.chunks.pop(0) if self.chunks else None
+
+    def readinto(self, buf):
+        if not self.chunks:
+            return None
+        chunk = self.chunks.pop(0)
+        nbytes = min(len(buf), len(chunk))
+        buf[:nbytes] = chunk[:nbytes]
+        if nbytes < len(chunk):
+            self.chunks.insert(0, chunk[nbytes:])
+        return nbytes
+
+    def write(self, data):
+        self.written.append(bytes(data))
+        self.chunks.extend(self.script)
+        self.script = []
+        if self.replies:
+            self.chunks.append(self.replies.pop(0))
+        return len(data)
+
+    def deinit(self):
+        pass
+
+
+class TestSendCommandTermination(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an ATCommand instance over a scripted UART with a long timeout.
+        """
+        self.uart = FakeUART()
+        self.at_command = ATCommand(self.uart, timeout=5)
+
+    def test_returns_on_ok_before_timeout(self):
+        """
+        Test that send_command stops reading as soon as OK arrives instead of waiting for the timeout.
+        """
+        self.uart.script = [b"+CSQ: 15,99\r\n", b"OK\r\n", b"+CEREG: 1\r\n"]
+        response = self.at_command.send_command("AT+CSQ")
+        self.assertEqual(response, ["+CSQ: 15,99", "OK"])
+        self.assertEqual(self.uart.chunks, [b"+CEREG: 1\r\n"])
+
+    def test_returns_on_cme_error(self):
+        """
+        Test that a +CME ERROR line terminates the reply and raises ATCommandError.
+        """
+        self.uart.script = [b"+CME ERROR: 30\r\n"]
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_command("AT+CGATT=1")
+
+    def test_custom_terminator(self):
+        """
+        Test that a caller-supplied terminator ends the reply.
+        """
+        self.uart.script = [b"+CMQNEW: 0\r\n", b"OK\r\n"]
+        response = self.at_command.send_command("AT+CMQNEW?", expected_response="+CMQNEW: 0",
+                                                terminator="+CMQNEW:")
+        self.assertEqual(response, ["+CMQNEW: 0"])
+
+    def test_split_chunks_are_reassembled(self):
+        """
+        Test that lines split across UART reads are joined before matching.
+        """
+        self.uart.script = [b"O", b"K\r", b"\n"]
+        self.assertEqual(self.at_command.send_command("AT"), ["OK"])
+
+    def test_urc_is_routed_out_of_reply(self):
+        """
+        Test that URCs arriving during a command go to their handler instead of the reply.
+        """
+        handler = MagicMock()
+        self.at_command.register_urc("+CEREG:", handler)
+        self.uart.script = [b"+CEREG: 1\r\n+CSQ: 15,99\r\nOK\r\n"]
+        self.assertEqual(self.at_command.send_command("AT+CSQ"), ["+CSQ: 15,99", "OK"])
+        handler.assert_called_once_with("+CEREG: 1")
+
+    def test_poll_dispatches_between_commands(self):
+        """
+        Test that poll delivers URCs received while no command is running.
+        """
+        handler = MagicMock()
+        self.at_command.register_urc("+CMQPUB:", handler)
+        self.uart.chunks = [b'+CMQPUB: 0,"t",1,0,0,2,"31"\r\n']
+        self.assertEqual(self.at_command.poll(), 1)
+        handler.assert_called_once_with('+CMQPUB: 0,"t",1,0,0,2,"31"')
+
+    def test_overlong_reply_is_bounded(self):
+        """
+        Test that a reply longer than max_response_size keeps only the newest lines.
+        """
+        self.at_command.max_response_size = 12
+        self.uart.script = [b"line-1\r\nline-2\r\nline-3\r\nOK\r\n"]
+        self.assertEqual(self.at_command.send_command("AT+HTTPGET"), ["line-3", "OK"])
+
+    def test_overlong_reply_error_policy(self):
+        """
+        Test that OVERFLOW_ERROR turns an over-long reply into ATCommandError.
+        """
+        self.at_command.max_response_size = 4
+        self.at_command.overflow = OVERFLOW_ERROR
+        self.uart.script = [b"line-1\r\nOK\r\n"]
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_command("AT+HTTPGET")
+
+
+class TestSendBatch(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an ATCommand instance over a scripted UART.
+        """
+        self.uart = FakeUART()
+        self.at_command = ATCommand(self.uart, timeout=1)
+
+    def test_commands_are_chained_on_one_line(self):
+        """
+        Test that extended commands are concatenated and info lines attributed to their command.
+        """
+        self.uart.replies = [b"+CSQ: 15,99\r\nOK\r\n"]
+        results = self.at_command.send_batch(["AT+CFUN=1", "AT+CSQ"])
+        self.assertEqual(self.uart.written, [b"AT+CFUN=1;+CSQ\r\n"])
+        self.assertEqual(results[0].response, ["OK"])
+        self.assertEqual(results[1].response, ["+CSQ: 15,99", "OK"])
+        self.assertIsNone(first_failure(results))
+
+    def test_failed_line_is_replayed_to_find_culprit(self):
+        """
+        Test that a failing chained line is replayed one by one and the failing command reported.
+        """
+        self.uart.replies = [b"ERROR\r\n", b"OK\r\n", b"+CME ERROR: 30\r\n"]
+        results = self.at_command.send_batch(["AT+CFUN=1", "AT+CGATT=1", "AT+CSQ"])
+        self.assertEqual(self.uart.written[1:], [b"AT+CFUN=1\r\n", b"AT+CGATT=1\r\n"])
+        self.assertTrue(results[0].ok)
+        self.assertIs(first_failure(results), results[1])
+        self.assertIsNone(results[2].response)
+
+    def test_chain_syntax_error_is_replayed(self):
+        """
+        Test that a chained line rejected with a syntax CME code is replayed one by one.
+        """
+        self.uart.replies = [b"+CME ERROR: 50\r\n", b"OK\r\n", b"OK\r\n"]
+        results = self.at_command.send_batch(["AT+CFUN=1", "AT+CGATT=1"])
+        self.assertEqual(self.uart.written[1:], [b"AT+CFUN=1\r\n", b"AT+CGATT=1\r\n"])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_non_retryable_error_is_not_replayed(self):
+        """
+        Test that a chained line failing with a non-retryable error raises it without replaying.
+        """
+        self.uart.replies = [b"+CME ERROR: 10\r\n"]
+        with self.assertRaises(SIMError):
+            self.at_command.send_batch(["AT+CFUN=1", "AT+CGATT=1"])
+        self.assertEqual(self.uart.written, [b"AT+CFUN=1;+CGATT=1\r\n"])
+
+    def test_timeout_is_not_replayed(self):
+        """
+        Test that a chained line without a reply raises ResponseTimeout instead of repeating its commands.
+        """
+        at_command = ATCommand(self.uart, timeout=0.05)
+        with self.assertRaises(ResponseTimeout):
+            at_command.send_batch(["AT+CMEE=1", "AT+CSQ"])
+        self.assertEqual(self.uart.written, [b"AT+CMEE=1;+CSQ\r\n"])
+
+    def test_basic_commands_are_sent_separately(self):
+        """
+        Test that commands that cannot be chained are sent back-to-back.
+        """
+        self.uart.replies = [b"OK\r\n", b"OK\r\n"]
+        results = self.at_command.send_batch(["AT", "AT+CFUN=1"])
+        self.assertEqual(self.uart.written, [b"AT\r\n", b"AT+CFUN=1\r\n"])
+        self.assertTrue(all(result.ok for result in results))
+
+
+class TestSendHexCommand(unittest.TestCase):
+    def setUp(self):
+        """
+        Set up an ATCommand instance over a scripted UART.
+        """
+        self.uart = FakeUART()
+        self.at_command = ATCommand(self.uart, timeout=1)
+
+    def test_payload_is_written_in_pieces(self):
+        """
+        Test that header, hex chunks and trailer form one command line without a full copy of it.
+        """
+        payload = bytes(range(256)) * 2
+        self.uart.script = [b"OK\r\n"]
+        self.at_command.send_hex_command('AT+CMQPUB=0,"t",1,0,0,1024,"', payload)
+        line = b"".join(self.uart.written)
+        self.assertEqual(line, b'AT+CMQPUB=0,"t",1,0,0,1024,"' + payload.hex().encode() + b'"\r\n')
+        self.assertTrue(all(len(piece) <= HEX_BUFFER_SIZE for piece in self.uart.written[1:-1]))
+
+    def test_error_reply(self):
+        """
+        Test that a rejected hex command raises ATCommandError.
+        """
+        self.uart.script = [b"ERROR\r\n"]
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_hex_command('AT+CMQPUB=0,"t",1,0,0,4,"', b"hi")
+
+
+class TestReentrantHandlers(unittest.TestCase):
+
+    def test_handler_sending_a_command_during_a_reply(self):
+        """
+        Test that a URC handler which sends a command runs after the pending reply instead of consuming it.
+        """
+        uart = FakeUART()
+        at_command = ATCommand(uart, timeout=1)
+        acks = []
+
+        def ack(line):
+            uart.script = [b"OK\r\n"]
+            acks.append(at_command.send_command("AT"))
+
+        at_command.register_urc("+CMQPUB:", ack)
+        uart.script = [b'+CMQPUB: 0,"t",1,0,0,2,"31"\r\n', b"+CSQ: 15,99\r\n", b"OK\r\n"]
+        self.assertEqual(at_command.send_command("AT+CSQ"), ["+CSQ: 15,99", "OK"])
+        self.assertEqual(acks, [["OK"]])
+
+    def test_failing_handler_does_not_fail_the_command(self):
+        """
+        Test that a URC handler raising during a reply does not turn a successful command into a failure.
+        """
+        uart = FakeUART()
+        at_command = ATCommand(uart, timeout=1)
+        at_command.register_urc("+CEREG:", MagicMock(side_effect=RuntimeError("boom")))
+        uart.script = [b"+CEREG: 1\r\n", b"+CSQ: 15,99\r\n", b"OK\r\n"]
+        self.assertEqual(at_command.send_command("AT+CSQ"), ["+CSQ: 15,99", "OK"])
+
+
+class TestHooks(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an engine over the emulator and hooks that record their calls.
+        """
+        self.emulator = SIM7020Emulator()
+        self.at_command = ATCommand(transport=self.emulator, timeout=0.2)
+        self.before = []
+        self.after = []
+        self.at_command.add_hook(lambda *args: self.before.append(args), lambda *args: self.after.append(args))
+
+    def test_hooks_see_every_transaction(self):
+        """
+        Test that hooks receive the command, ticks, outcome and byte counts of each command.
+        """
+        self.at_command.send_command("AT+CSQ")
+        self.emulator.errors["+CSQ"] = "ERROR"
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_command("AT+CSQ")
+        with self.assertRaises(ATCommandError):  # No MQTT client
+            self.at_command.send_hex_command('AT+CMQPUB=0,"t",1,0,0,4,"', b"hi")
+        self.assertEqual([call[0] for call in self.before], ["AT+CSQ", "AT+CSQ", 'AT+CMQPUB=0,"t",1,0,0,4,"'])
+        command, start, end, outcome, sent, received = self.after[0]
+        self.assertEqual((command, outcome, sent), ("AT+CSQ", OUTCOME_OK, 8))
+        self.assertEqual(start, self.before[0][1])
+        self.assertGreaterEqual(end, start)
+        self.assertGreater(received, 0)
+        self.assertEqual(self.after[1][3], OUTCOME_ERROR)
+        self.assertEqual(self.after[2][4], len('AT+CMQPUB=0,"t",1,0,0,4,"') + 4 + 3)
+
+    def test_timeout_outcome(self):
+        """
+        Test that a command without a reply reports a timeout.
+        """
+        self.emulator.latency["+CSQ"] = 1
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_command("AT+CSQ", timeout=0.05)
+        self.assertEqual(self.after[0][3], OUTCOME_TIMEOUT)
+
+    def test_after_hooks_and_metrics_run_when_reading_fails(self):
+        """
+        Test that a reply overflowing under OVERFLOW_ERROR still reaches the after hooks and the metrics.
+        """
+        at_command = ATCommand(transport=self.emulator, timeout=0.2, max_response_size=5, overflow=OVERFLOW_ERROR)
+        events = []
+        at_command.add_hook(lambda *args: events.append("before"), lambda *args: events.append(args[3]))
+        with self.assertRaises(ATCommandError):
+            at_command.send_command("AT+CSQ")
+        self.assertEqual(events, ["before", OUTCOME_ERROR])
+        self.assertEqual(at_command.metrics.stats()["AT+CSQ"]["errors"], 1)
+
+    def test_after_hooks_run_when_writing_fails(self):
+        """
+        Test that a failing write is reported as an error with nothing sent.
+        """
+        self.emulator.write = MagicMock(side_effect=OSError("gone"))
+        with self.assertRaises(OSError):
+            self.at_command.send_command("AT")
+        self.assertEqual(len(self.before), 1)
+        self.assertEqual((self.after[0][3], self.after[0][4]), (OUTCOME_ERROR, 0))
+
+    def test_failing_hook_does_not_break_commands(self):
+        """
+        Test that an exception in a hook is logged and the command still returns its reply.
+        """
+        def broken(*args):
+            raise RuntimeError("boom")
+
+        self.at_command.add_hook(broken, broken)
+        self.assertEqual(self.at_command.send_command("AT")[-1], "OK")
+        self.assertEqual(len(self.after), 1)
+
+    def test_remove_hook(self):
+        """
+        Test that removed hooks are no longer called and the engine skips hook work.
+        """
+        self.at_command.remove_hook(self.at_command._before_hooks[0], self.at_command._after_hooks[0])
+        self.assertFalse(self.at_command._hooked)
+        self.at_command.send_command("AT")
+        self.assertEqual((self.before, self.after), ([], []))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+# tests/test_emulator.py
+
+import time
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.commands import ATCommand, ATCommandError
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.sim7020 import SIM7020
+
+
+class TestSIM7020Emulator(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a SIM7020 driven in-process by the emulator.
+        """
+        self.emulator = SIM7020Emulator(valid_apns=("nbiot",))
+        self.sim7020 = SIM7020(transport=self.emulator, timeout=1)
+
+    def test_attach(self):
+        """
+        Test that the chained attach sequence brings the emulated module onto the network.
+        """
+        self.sim7020.attach("nbiot")
+        self.assertTrue(self.emulator.attached)
+        self.assertEqual(self.emulator.commands[-1], 'AT+CFUN=1;+CGDCONT=1,"IP","nbiot";+CGATT=1')
+
+    def test_attach_invalid_apn(self):
+        """
+        Test that attaching with an APN the network rejects raises ATCommandError.
+        """
+        with self.assertRaises(ATCommandError):
+            self.sim7020.attach("invalid.apn")
+        self.assertFalse(self.emulator.attached)
+
+    def test_warm_attach_only_probes(self):
+        """
+        Test that attaching a module already attached with the same APN costs a single probe round-trip.
+        """
+        self.sim7020.attach("nbiot")
+        sent = len(self.emulator.commands)
+        self.sim7020.attach("nbiot")
+        self.assertEqual(self.emulator.commands[sent:], ["AT+CGATT?;+CGDCONT?;+CEREG?"])
+
+    def test_attach_pending_registration_only_probes(self):
+        """
+        Test that a module attached but not yet registered is not sent AT+CGATT=1 again.
+        """
+        self.sim7020.attach("nbiot")
+        self.emulator._cmd_cereg = lambda query, args: ["+CEREG: 0,2"]  # Searching
+        sent = len(self.emulator.commands)
+        self.sim7020.attach("nbiot")
+        self.assertEqual(self.emulator.commands[sent:], ["AT+CGATT?;+CGDCONT?;+CEREG?"])
+
+    def test_attach_malformed_probe_runs_full_sequence(self):
+        """
+        Test that a probe reply that cannot be parsed falls back to the full attach sequence.
+        """
+        self.emulator._cmd_cereg = lambda query, args: ["+CEREG: searching"]
+        self.sim7020.attach("nbiot")
+        self.assertTrue(self.emulator.attached)
+        self.assertEqual(self.emulator.commands[-1], 'AT+CFUN=1;+CGDCONT=1,"IP","nbiot";+CGATT=1')
+
+    def test_attach_replaces_apn(self):
+        """
+        Test that attaching with a different APN detaches, redefines the context and attaches again.
+        """
+        self.emulator.valid_apns = None
+        self.sim7020.attach("nbiot")
+        self.sim7020.attach("other")
+        self.assertEqual(self.emulator.commands[-1], 'AT+CFUN=1;+CGATT=0;+CGDCONT=1,"IP","other";+CGATT=1')
+        self.assertEqual((self.emulator.attached, self.emulator.apn), (True, "other"))
+
+    def test_signal_quality(self):
+        """
+        Test that AT+CSQ reports the configured signal.
+        """
+        self.emulator.signal = (20, 0)
+        self.assertEqual(self.sim7020.get_signal_quality(), (20, 0))
+
+    def test_mqtt_round_trip(self):
+        """
+        Test that a message published to a subscribed topic comes back as a downlink URC.
+        """
+        callback = MagicMock()
+        self.sim7020.attach("nbiot")
+        self.sim7020.mqtt_new("broker")
+        self.sim7020.mqtt_connect("client")
+        self.sim7020.mqtt_subscribe("t", callback=callback)
+        self.sim7020.mqtt_publish("t", "hello")
+        self.sim7020.poll()
+        self.assertEqual(self.emulator.published, [("t", b"hello")])
+        callback.assert_called_once_with("t", b"hello")
+
+    def test_latency(self):
+        """
+        Test that replies are held back for the configured per-command latency.
+        """
+        self.emulator.latency["+CSQ"] = 0.1
+        start = time.monotonic()
+        self.sim7020.get_signal_quality()
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+
+    def test_forced_error(self):
+        """
+        Test that scripted errors are returned for the chosen command.
+        """
+        self.emulator.errors["+CSQ"] = "+CME ERROR: 100"
+        with self.assertRaises(ATCommandError):
+            self.sim7020.get_signal_quality()
+
+
+class TestEmulatorServers(unittest.TestCase):
+
+    def test_serve_pty(self):
+        """
+        Test that the emulator can be reached through a pseudo-terminal.
+        """
+        emulator = SIM7020Emulator()
+        at_command = ATCommand(port="pty:" + emulator.serve_pty(), timeout=1)
+        try:
+            self.assertTrue(at_command.check_connection())
+        finally:
+            at_command.close()
+            emulator.stop()
+
+    def test_serve_socket(self):
+        """
+        Test that the emulator can be reached through a TCP socket.
+        """
+        emulator = SIM7020Emulator(echo=True)
+        host, port = emulator.serve_socket()
+        at_command = ATCommand(port=f"socket://{host}:{port}", timeout=1)
+        try:
+            self.assertEqual(at_command.send_command("AT+CSQ"), ["AT+CSQ", "+CSQ: 15,99", "OK"])
+        finally:
+            at_command.close()
+            emulator.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# tests/test_errors.py
+
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.commands import ATCommandError
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import (CMEError, ModemError, NetworkError, ParseError, PDPError, ResponseTimeout,
+                              SIMError, error_from_response, is_retryable)
+from sim7020py.retry import RetryPolicy
+from sim7020py.sim7020 import SIM7020
+
+
+class TestErrors(unittest.TestCase):
+
+    def test_cme_codes_map_to_classes(self):
+        """
+        Test that +CME ERROR codes become the matching exception class with their numeric code.
+        """
+        cases = {"+CME ERROR: 10": SIMError, "+CME ERROR: 30": NetworkError, "+CME ERROR: 133": PDPError,
+                 "+CME ERROR: 3": CMEError, "+CME ERROR: 999": CMEError}
+        for line, error_class in cases.items():
+            error = error_from_response([line], "AT+TEST")
+            self.assertIs(type(error), error_class)
+            self.assertEqual(error.code, int(line.split(":")[1]))
+            self.assertIsInstance(error, ATCommandError)
+
+    def test_verbose_cme_error(self):
+        """
+        Test that a verbose +CME ERROR text (AT+CMEE=2) is kept in the message without a code.
+        """
+        error = error_from_response(["+CME ERROR: SIM not inserted"], "AT+CPIN?")
+        self.assertIsNone(error.code)
+        self.assertIn("SIM not inserted", str(error))
+
+    def test_plain_error_and_timeout(self):
+        """
+        Test that ERROR becomes ModemError and a reply without a final result code ResponseTimeout.
+        """
+        self.assertIs(type(error_from_response(["ERROR"])), ModemError)
+        self.assertIs(type(error_from_response([])), ResponseTimeout)
+
+    def test_finished_reply_without_expected_response(self):
+        """
+        Test that a reply ending on a final result code or terminator, but lacking the expected response,
+        is a ParseError rather than a timeout.
+        """
+        self.assertIs(type(error_from_response(["OK"], "AT+CSQ", "+CSQ")), ParseError)
+        self.assertIs(type(error_from_response(["+CHTTPNMIH: 0,200"], "AT+X", "OK", finished=True)), ParseError)
+        self.assertIs(type(error_from_response(["+CSQ: 15,99"], "AT+CSQ", "OK", finished=False)), ResponseTimeout)
+        self.assertFalse(is_retryable(error_from_response(["OK"], "AT+CSQ", "+CSQ")))
+
+    def test_retry_classification(self):
+        """
+        Test that transient conditions are retryable and SIM or subscription errors are not.
+        """
+        self.assertTrue(is_retryable(error_from_response(["+CME ERROR: 30"])))
+        self.assertTrue(is_retryable(error_from_response(["+CME ERROR: 14"])))
+        self.assertTrue(is_retryable(error_from_response([])))
+        self.assertTrue(is_retryable(OSError()))
+        self.assertFalse(is_retryable(error_from_response(["+CME ERROR: 10"])))
+        self.assertFalse(is_retryable(error_from_response(["+CME ERROR: 33"])))
+
+    def test_send_command_raises_typed_error(self):
+        """
+        Test that send_command raises the typed error and RetryPolicy gives up on a fatal one at once.
+        """
+        emulator = SIM7020Emulator()
+        sim7020 = SIM7020(transport=emulator, timeout=1)
+        emulator.errors["+CPIN"] = "+CME ERROR: 10"
+        sleep = MagicMock()
+        with self.assertRaises(SIMError):
+            RetryPolicy(sleep=sleep).call(sim7020.at_command.send_command, "AT+CPIN?")
+        sleep.assert_not_called()
+        self.assertEqual(emulator.commands, ["AT+CPIN?"])
+
+    def test_get_signal_quality_keeps_typed_error(self):
+        """
+        Test that get_signal_quality raises the typed error of the failed query and ParseError for a reply
+        without a +CSQ line.
+        """
+        emulator = SIM7020Emulator()
+        sim7020 = SIM7020(transport=emulator, timeout=1)
+        emulator.errors["+CSQ"] = "+CME ERROR: 30"
+        with self.assertRaises(NetworkError):
+            sim7020.get_signal_quality()
+        emulator.errors["+CSQ"] = "OK"
+        with self.assertRaises(ParseError):
+            sim7020.get_signal_quality()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# tests/test_flashqueue.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from sim7020py.blynk_integration import BlynkIntegration
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.flashqueue import FlashQueue, OVERFLOW_DOWNSAMPLE
+from sim7020py.retry import RetryPolicy
+from sim7020py.ringbuffer import OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_ERROR
+
+
+class TestFlashQueue(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a temporary directory for the queue file.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "queue.dat")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_survive_reopen(self):
+        """
+        Test that records are recovered in order by a new instance.
+        """
+        queue = FlashQueue(self.filename)
+        queue.put([1, "a"])
+        queue.put({"pin": 2})
+        self.assertEqual(FlashQueue(self.filename).peek(), [[1, "a"], {"pin": 2}])
+
+    def test_put_syncs_only_its_file(self):
+        """
+        Test that a record is made durable with fsync of the queue file, not a global sync.
+        """
+        queue = FlashQueue(self.filename)
+        with patch("sim7020py.flashqueue.os.fsync") as fsync, patch("sim7020py.flashqueue.os.sync") as sync:
+            queue.put(1)
+        fsync.assert_called_once()
+        sync.assert_not_called()
+
+    def test_torn_and_corrupt_records_are_dropped(self):
+        """
+        Test that a record cut short by a power loss and a corrupted record are skipped on open.
+        """
+        queue = FlashQueue(self.filename)
+        queue.put([1, "a"])
+        queue.put([2, "b"])
+        with open(self.filename) as f:
+            first, second = f.readlines()
+        with open(self.filename, "w") as f:
+            f.write(first.replace('"a"', '"x"') + second + second[:7])
+        reopened = FlashQueue(self.filename)
+        self.assertEqual(reopened.peek(), [[2, "b"]])
+        reopened.put([3, "c"])
+        self.assertEqual(FlashQueue(self.filename).peek(), [[2, "b"], [3, "c"]])
+
+    def test_drain_removes_sent_records(self):
+        """
+        Test that drain hands out batches and keeps the records after a failing batch.
+        """
+        queue = FlashQueue(self.filename)
+        for i in range(5):
+            queue.put(i)
+        batches = []
+
+        def send(batch):
+            if len(batches) == 1:
+                raise OSError("link down")
+            batches.append(batch)
+
+        with self.assertRaises(OSError):
+            queue.drain(send, batch_size=2)
+        self.assertEqual(queue.peek(), [2, 3, 4])
+        self.assertEqual(queue.drain(batches.append), 3)
+        self.assertEqual(len(queue), 0)
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_interrupted_rewrite_is_recovered(self):
+        """
+        Test that a power loss between removing the queue file and renaming the synced temporary file over
+        it (filesystems without rename over an existing file) loses no records.
+        """
+        queue = FlashQueue(self.filename)
+        for i in range(3):
+            queue.put(i)
+        events = []
+
+        def send(batch):
+            if batch != [0]:
+                raise RuntimeError("link down")
+
+        def rename(source, target):
+            events.append("rename")
+            raise OSError("target exists" if os.path.exists(target) else "power lost")
+
+        with patch("sim7020py.flashqueue.os.fsync", side_effect=lambda fd: events.append("fsync")), \
+                patch("sim7020py.flashqueue.os.rename", side_effect=rename):
+            with self.assertRaises(OSError):
+                queue.drain(send, batch_size=1)  # Rewrites the file without the first record
+        self.assertEqual(events, ["fsync", "rename", "rename"])
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertEqual(FlashQueue(self.filename).peek(), [1, 2])
+        self.assertFalse(os.path.exists(self.filename + ".tmp"))
+
+    def test_overflow_policies(self):
+        """
+        Test downsampling, dropping the oldest or newest record, and the error policy on a full queue.
+        """
+        expected = {OVERFLOW_DOWNSAMPLE: [0, 2, 4], OVERFLOW_DROP_OLDEST: [1, 2, 3, 4],
+                    OVERFLOW_DROP_NEWEST: [0, 1, 2, 3]}
+        for overflow, records in expected.items():
+            queue = FlashQueue(self.filename, max_records=4, overflow=overflow)
+            for i in range(5):
+                queue.put(i)
+            self.assertEqual(queue.peek(), records)
+            queue.clear()
+        queue = FlashQueue(self.filename, max_records=1, overflow=OVERFLOW_ERROR)
+        queue.put(0)
+        with self.assertRaises(OverflowError):
+            queue.put(1)
+
+    def test_blynk_stores_and_forwards(self):
+        """
+        Test that values failing to send are queued and delivered after the next connect.
+        """
+        emulator = SIM7020Emulator(valid_apns=("nbiot",))
+        blynk = BlynkIntegration(apn="nbiot", blynk_token="token", transport=emulator,
+                                 retry_policy=RetryPolicy(1, sleep=lambda delay: None), queue=FlashQueue(self.filename))
+        blynk.connect()
+        emulator.errors["+HTTPGET"] = "+CME ERROR: 50"
+        blynk.send_value(1, "10")
+        blynk.send_value(2, "20")
+        self.assertEqual(len(blynk.queue), 2)
+
+        del emulator.errors["+HTTPGET"]
+        blynk.connect()
+        self.assertEqual(emulator.pins, {"1": "10", "2": "20"})
+        self.assertEqual(len(blynk.queue), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# tests/test_httpclient.py
+
+import unittest
+from sim7020py.blynk_integration import BlynkIntegration
+from sim7020py.commands import ATCommandError
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import ResponseTimeout
+from sim7020py.httpclient import HTTPSession
+from sim7020py.profiles import CommandProfile
+from sim7020py.sim7020 import SIM7020
+
+
+class TruncatingEmulator(SIM7020Emulator):
+    """Emulator whose HTTP responses stop after the first body chunk."""
+
+    def _cmd_chttpsend(self, query, args):
+        SIM7020Emulator._cmd_chttpsend(self, query, args)
+        self._urcs_after_reply[-1] = f'+CHTTPNMIC: {args[0]},1,8,2,"5b22"'
+
+
+class TestHTTPSession(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an attached SIM7020 emulator and a session that is not connected yet.
+        """
+        self.emulator = SIM7020Emulator()
+        self.emulator.attached = True
+        self.emulator.pins["1"] = "25"
+        self.sim7020 = SIM7020(transport=self.emulator, timeout=1)
+        self.session = HTTPSession(self.sim7020.at_command, "http://blynk.cloud", timeout=1)
+
+    def test_requests_reuse_one_connection(self):
+        """
+        Test that the handle is created and connected once and each request costs a single AT+CHTTPSEND.
+        """
+        self.assertEqual(self.session.get("/token/get/1").body, '["25"]')
+        sent = len(self.emulator.commands)
+        response = self.session.get("/token/get/1")
+        self.assertEqual((response.status, response.body), (200, '["25"]'))
+        self.assertEqual(self.emulator.commands[sent:], ['AT+CHTTPSEND=0,0,"/token/get/1"'])
+        self.assertEqual(sum(command.startswith("AT+CHTTPCREATE") for command in self.emulator.commands), 1)
+
+    def test_http_error_status_is_returned(self):
+        """
+        Test that an HTTP error status is a response, not a session failure.
+        """
+        response = self.session.get("/token/get/9")
+        self.assertEqual(response.status, 400)
+        self.assertTrue(self.session.connected)
+
+    def test_reconnects_after_connection_loss(self):
+        """
+        Test that a request after the server closed the connection reconnects and succeeds.
+        """
+        self.session.open()
+        self.emulator.drop_http(self.session.client_id)
+        self.sim7020.poll()
+        self.assertFalse(self.session.connected)
+        self.assertEqual(self.session.get("/token/get/1").body, '["25"]')
+        self.assertEqual(len(self.emulator.http_clients), 1)
+
+    def test_truncated_body_raises(self):
+        """
+        Test that a response whose last body chunk never arrives fails and leaves the session disconnected.
+        """
+        emulator = TruncatingEmulator()
+        emulator.attached = True
+        session = HTTPSession(SIM7020(transport=emulator, timeout=1).at_command, "http://blynk.cloud", timeout=0.1)
+        with self.assertRaises(ResponseTimeout):
+            session.get("/token/get/1")
+        self.assertFalse(session.connected)
+
+    def test_timeout_follows_send_profile(self):
+        """
+        Test that a session without its own timeout waits as long as the AT+CHTTPSEND profile allows.
+        """
+        emulator = TruncatingEmulator()
+        emulator.attached = True
+        at_command = SIM7020(transport=emulator, timeout=1).at_command
+        at_command.profiles = dict(at_command.profiles, **{"AT+CHTTPSEND": CommandProfile(0.2, urc="+CHTTPNMIC:")})
+        session = HTTPSession(at_command, "http://blynk.cloud")
+        with self.assertRaisesRegex(ResponseTimeout, "0.2 s"):
+            session.get("/token/get/1")
+
+    def test_failure_after_reconnect_raises(self):
+        """
+        Test that a request failing again after reconnecting raises ATCommandError.
+        """
+        self.session.open()
+        self.emulator.errors["+CHTTPSEND"] = "ERROR"
+        with self.assertRaises(ATCommandError):
+            self.session.get("/token/get/1")
+
+    def test_blynk_keep_alive(self):
+        """
+        Test that BlynkIntegration with keep_alive sends its requests over the session.
+        """
+        blynk = BlynkIntegration(apn="nbiot", blynk_token="token", transport=self.emulator, keep_alive=True)
+        blynk.connect()
+        blynk.send_value(2, "7")
+        blynk.send_values({3: "a b"})
+        self.assertEqual(blynk.get_value(2), "7")
+        self.assertEqual(blynk.get_values([2, 3]), {2: "7", 3: "a b"})
+        self.assertFalse(any(command.startswith("AT+HTTPGET") for command in self.emulator.commands))
+        blynk.disconnect()
+        self.assertEqual(self.emulator.http_clients, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# tests/test_latency.py
+
+import os
+import tempfile
+import unittest
+from sim7020py.commands import ATCommand
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import ATCommandError, ResponseTimeout
+from sim7020py.latency import LatencyEstimator, command_key
+
+
+class TestLatencyEstimator(unittest.TestCase):
+
+    def test_command_key(self):
+        """
+        Test that commands of one type share a key and chained lines keep their parts.
+        """
+        self.assertEqual(command_key("AT+CGATT=1"), "AT+CGATT")
+        self.assertEqual(command_key("AT+CGATT?;+CEREG?"), "AT+CGATT?;+CEREG?")
+        self.assertEqual(command_key('AT+CMQPUB=0,"a;b",1'), "AT+CMQPUB")
+
+    def test_timeout_follows_rtt(self):
+        """
+        Test that the timeout is srtt + 4 * rttvar, bounded by the minimum and the configured maximum.
+        """
+        estimator = LatencyEstimator(min_timeout=0.2)
+        self.assertEqual(estimator.timeout("AT+CSQ", 5), 5)
+        estimator.observe("AT+CSQ", 100)
+        self.assertAlmostEqual(estimator.timeout("AT+CSQ", 5), 0.3)  # 100 + 4 * 50 ms
+        for _ in range(50):
+            estimator.observe("AT+CSQ", 20)
+        self.assertAlmostEqual(estimator.timeout("AT+CSQ", 5), 0.2)
+        estimator.observe("AT+CSQ", 4000)
+        self.assertEqual(estimator.timeout("AT+CSQ", 1), 1)
+
+    def test_backoff_doubles_timeout(self):
+        """
+        Test that each timeout doubles the learned timeout until the next reply is measured.
+        """
+        estimator = LatencyEstimator()
+        estimator.observe("AT+CSQ", 100)
+        self.assertEqual(estimator.timeout("AT+CSQ", 60), 1.0)  # Floor
+        estimator.backoff("AT+CSQ")
+        self.assertEqual(estimator.timeout("AT+CSQ", 60), 2.0)
+        estimator.backoff("AT+CSQ")
+        self.assertEqual(estimator.timeout("AT+CSQ", 3), 3)
+        estimator.observe("AT+CSQ", 100)
+        self.assertEqual(estimator.timeout("AT+CSQ", 60), 1.0)
+
+    def test_persistence(self):
+        """
+        Test that estimates survive a restart through the state file and a damaged file is ignored.
+        """
+        filename = os.path.join(tempfile.mkdtemp(), "latency.json")
+        estimator = LatencyEstimator(filename)
+        self.assertEqual(estimator.estimates, {})
+        estimator.observe("AT+CGATT", 1500)
+        estimator.save()
+        self.assertEqual(LatencyEstimator(filename).estimates, {"AT+CGATT": [1500, 750]})
+        with open(filename, "w") as f:
+            f.write("{damaged")
+        self.assertEqual(LatencyEstimator(filename).estimates, {})
+
+    def test_save_every(self):
+        """
+        Test that the estimates are written after the configured number of samples.
+        """
+        filename = os.path.join(tempfile.mkdtemp(), "latency.json")
+        estimator = LatencyEstimator(filename, save_every=2)
+        estimator.observe("AT", 10)
+        self.assertEqual(LatencyEstimator(filename).estimates, {})
+        estimator.observe("AT", 10)
+        self.assertIn("AT", LatencyEstimator(filename).estimates)
+
+
+class TestAdaptiveCommands(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an engine that learns latency over the emulator.
+        """
+        self.emulator = SIM7020Emulator()
+        self.latency = LatencyEstimator(min_timeout=0.05)
+        self.at_command = ATCommand(transport=self.emulator, timeout=2, latency=self.latency)
+
+    def test_replies_are_measured(self):
+        """
+        Test that completed commands feed the estimator and shorten the next timeout.
+        """
+        self.at_command.get_signal_quality()
+        self.assertIn("AT+CSQ", self.latency.estimates)
+        self.assertLess(self.at_command._timeout("AT+CSQ", None), 2)
+
+    def test_learned_timeout_is_applied_and_backed_off(self):
+        """
+        Test that a reply slower than the learned timeout times out and doubles the next timeout.
+        """
+        self.latency.observe("AT+CSQ", 10)
+        self.emulator.latency["+CSQ"] = 0.3
+        with self.assertRaises(ResponseTimeout):
+            self.at_command.send_command("AT+CSQ")
+        self.assertAlmostEqual(self.at_command._timeout("AT+CSQ", 2), 0.1)
+
+    def test_late_result_is_not_taken_for_the_next_reply(self):
+        """
+        Test that the late OK of a timed-out command is discarded before the next command is written.
+        """
+        self.latency.observe("AT+CSQ", 10)
+        self.emulator.latency["+CSQ"] = 0.3
+        with self.assertRaises(ResponseTimeout):
+            self.at_command.send_command("AT+CSQ")
+        self.emulator.errors["+CGATT"] = "ERROR"
+        with self.assertRaises(ATCommandError):
+            self.at_command.send_command("AT+CGATT=1")
+        self.assertEqual(self.emulator.commands[-1], "AT+CGATT=1")
+
+
+if __name__ == '__main__':
+    unittest.main()
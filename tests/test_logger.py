@@ -0,0 +1,98 @@
+# tests/test_logger.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from sim7020py import logger as logging
+from sim7020py.aio import AsyncBlynkIntegration
+from sim7020py.blynk_integration import BlynkIntegration
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.logger import DEBUG, INFO, WARNING, ERROR, FlashSink, get_logger
+
+
+class Unprintable:
+    """Argument whose formatting fails the test."""
+
+    def __str__(self):
+        raise AssertionError("formatted a disabled record")
+
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.records = []
+        logging.set_level(INFO)
+        logging.set_sinks(lambda level, name, message: self.records.append((level, name, message)))
+
+    def tearDown(self):
+        logging.set_level(INFO)
+        logging.set_sinks(logging.ConsoleSink())
+
+    def test_disabled_level_is_not_formatted(self):
+        """Test that records below the level never format their arguments."""
+        log = get_logger("test")
+        log.debug("value %s", Unprintable())
+        self.assertEqual(self.records, [])
+
+    def test_enabled_level_reaches_sinks(self):
+        """Test that enabled records are formatted and passed to every sink."""
+        log = get_logger("test")
+        logging.set_level("DEBUG")
+        log.debug("Received %d bytes", 12)
+        self.assertEqual(self.records, [(DEBUG, "test", "Received 12 bytes")])
+
+    def test_logger_level_overrides_global(self):
+        """Test that a logger with its own level ignores the global one."""
+        log = get_logger("quiet")
+        log.level = ERROR
+        try:
+            log.info("hidden")
+            log.error("shown")
+        finally:
+            log.level = None
+        self.assertEqual(self.records, [(ERROR, "quiet", "shown")])
+
+    def test_utils_log_routes_to_logger(self):
+        """Test that utils.log accepts level names and lazy arguments."""
+        from sim7020py.utils import log
+        log("WARNING", "Attempt %s failed", 2)
+        self.assertEqual(self.records, [(logging.WARNING, "sim7020py.utils", "Attempt 2 failed")])
+
+    def test_level_names_in_any_case(self):
+        """Test that set_level and the Blynk log methods accept lower-case names and aliases."""
+        logging.set_level("warning")
+        self.assertFalse(get_logger("test").is_enabled_for(INFO))
+        self.assertTrue(get_logger("test").is_enabled_for(WARNING))
+        logging.set_level("debug")
+        blynk = BlynkIntegration(transport=SIM7020Emulator())
+        async_blynk = AsyncBlynkIntegration(MagicMock(), "", "")
+        blynk.log("warning", "sync %s", 1)
+        async_blynk.log("warn", "async %s", 2)
+        blynk.log("verbose", "unknown")
+        self.assertEqual([(level, message) for level, name, message in self.records],
+                         [(WARNING, "sync 1"), (WARNING, "async 2"), (INFO, "unknown")])
+
+    def test_flash_sink_rotates(self):
+        """Test that FlashSink rotates the file once it reaches max_bytes and keeps the order."""
+        with tempfile.TemporaryDirectory() as directory:
+            sink = FlashSink(os.path.join(directory, "log.txt"), max_bytes=40)
+            for i in range(4):
+                sink(INFO, "t", f"message {i}")
+            lines = sink.read()
+            self.assertEqual(lines[-1], "[INFO] t: message 3")
+            self.assertLessEqual(os.stat(sink.filename)[6], 40)
+            self.assertTrue(os.path.exists(sink.filename + ".1"))
+
+    def test_flash_sink_rotation_without_file(self):
+        """Test that FlashSink keeps logging when the file to rotate cannot be renamed."""
+        with tempfile.TemporaryDirectory() as directory:
+            sink = FlashSink(os.path.join(directory, "log.txt"), max_bytes=40)
+            sink.size = 40  # As if the file had been removed after its size was read
+            with patch("sim7020py.logger.os.rename", side_effect=OSError("ENOENT")):
+                sink(INFO, "t", "message")
+            self.assertEqual(sink.read(), ["[INFO] t: message"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_metrics.py
+
+import json
+import unittest
+from sim7020py.blynk_integration import BlynkIntegration
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import ATCommandError
+from sim7020py.metrics import CommandMetrics, OUTCOME_OK, OUTCOME_ERROR, OUTCOME_TIMEOUT
+from sim7020py.sim7020 import SIM7020
+
+
+class TestCommandMetrics(unittest.TestCase):
+
+    def test_record_and_histogram(self):
+        """
+        Test that calls are counted per outcome and sorted into latency buckets.
+        """
+        metrics = CommandMetrics(buckets=(10, 100))
+        metrics.record("AT+CSQ", OUTCOME_OK, 5, 8, 20)
+        metrics.record("AT+CSQ", OUTCOME_ERROR, 50, 8, 7)
+        metrics.record("AT+CSQ", OUTCOME_TIMEOUT, 1000, 8, 0)
+        stats = metrics.stats()["AT+CSQ"]
+        self.assertEqual((stats["calls"], stats["ok"], stats["errors"], stats["timeouts"]), (3, 1, 1, 1))
+        self.assertEqual((stats["tx_bytes"], stats["rx_bytes"]), (24, 27))
+        self.assertEqual((stats["total_ms"], stats["max_ms"]), (1055, 1000))
+        self.assertEqual(stats["histogram"], [1, 1, 1])
+
+    def test_payload_and_reset(self):
+        """
+        Test that the payload is compact JSON of the counter rows and reset clears them.
+        """
+        metrics = CommandMetrics(buckets=(10,))
+        metrics.record("AT", OUTCOME_OK, 3, 4, 6)
+        payload = metrics.payload()
+        self.assertNotIn(" ", payload)
+        self.assertEqual(json.loads(payload), {"b": [10], "c": {"AT": [1, 1, 0, 0, 4, 6, 3, 3, 1, 0]}})
+        metrics.reset()
+        self.assertEqual(metrics.stats(), {})
+
+
+class TestModuleMetrics(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a module over the emulator.
+        """
+        self.emulator = SIM7020Emulator()
+        self.sim7020 = SIM7020(transport=self.emulator)
+
+    def test_commands_are_counted(self):
+        """
+        Test that successes, errors and traffic of real commands are recorded.
+        """
+        self.sim7020.get_signal_quality()
+        self.emulator.errors["+CSQ"] = "+CME ERROR: 30"
+        with self.assertRaises(ATCommandError):
+            self.sim7020.get_signal_quality()
+        stats = self.sim7020.stats()["AT+CSQ"]
+        self.assertEqual((stats["calls"], stats["ok"], stats["errors"]), (2, 1, 1))
+        self.assertEqual(stats["tx_bytes"], 2 * len("AT+CSQ\r\n"))
+        self.assertGreater(stats["rx_bytes"], 0)
+        self.sim7020.reset_stats()
+        self.assertEqual(self.sim7020.stats(), {})
+
+    def test_latency_includes_settle_time(self):
+        """
+        Test that the recorded latency starts before the write, so a profile's settle time is included.
+        """
+        self.sim7020.at_command.send_command("AT", delay=0.1)
+        self.assertGreaterEqual(self.sim7020.stats()["AT"]["total_ms"], 100)
+
+    def test_publish_stats(self):
+        """
+        Test that the metrics are published over MQTT and then cleared.
+        """
+        self.sim7020.attach("nbiot")
+        self.sim7020.mqtt_new("broker")
+        self.sim7020.mqtt_connect("client")
+        self.sim7020.mqtt_publish_stats("stats")
+        topic, payload = self.emulator.published[-1]
+        self.assertEqual(topic, "stats")
+        self.assertIn("AT+CMQNEW", json.loads(payload)["c"])
+        self.assertEqual(list(self.sim7020.stats()), [])
+
+    def test_disabled(self):
+        """
+        Test that metrics can be switched off.
+        """
+        self.sim7020.at_command.metrics = None
+        self.sim7020.get_signal_quality()
+        self.assertEqual(self.sim7020.stats(), {})
+
+    def test_blynk_stats(self):
+        """
+        Test that BlynkIntegration exposes the module metrics.
+        """
+        blynk = BlynkIntegration(apn="nbiot", blynk_token="token", transport=self.emulator)
+        blynk.connect()
+        self.assertIn("AT+CGATT?;+CGDCONT?;+CEREG?", blynk.stats())
+        blynk.reset_stats()
+        self.assertEqual(blynk.stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_mqtt.py
+
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.mqtt import MQTTClient, topic_matches
+from sim7020py.sim7020 import SIM7020
+
+
+class TestMQTTClient(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an attached SIM7020 emulator and a client that is not connected yet.
+        """
+        self.emulator = SIM7020Emulator(valid_apns=("nbiot",))
+        self.emulator.apn = "nbiot"
+        self.emulator.attached = True
+        self.sim7020 = SIM7020(transport=self.emulator, timeout=1)
+        self.client = MQTTClient(self.sim7020.at_command, "broker", 1883, "client")
+
+    def test_connect_is_idempotent(self):
+        """
+        Test that connect() creates the handle once and costs nothing while connected.
+        """
+        self.client.connect()
+        sent = len(self.emulator.commands)
+        self.client.connect()
+        self.assertEqual(len(self.emulator.commands), sent)
+        self.assertTrue(self.client.is_connected())
+
+    def test_publish_bytes(self):
+        """
+        Test that bytes payloads are published unchanged and connect on demand.
+        """
+        self.client.publish("t", b"\x00\xff")
+        self.assertEqual(self.emulator.published, [("t", b"\x00\xff")])
+
+    def test_reconnect_restores_subscriptions(self):
+        """
+        Test that after the module drops the connection the next publish reconnects and resubscribes.
+        """
+        callback = MagicMock()
+        self.client.subscribe("a/+", callback=callback)
+        self.client.subscribe("b")
+        self.client.connect()
+        self.emulator.drop_mqtt(self.client.mqtt_id)
+        self.sim7020.poll()
+        self.assertFalse(self.client.connected)
+
+        self.client.publish("a/1", "x")
+        self.sim7020.poll()
+        self.assertEqual(self.emulator.mqtt[self.client.mqtt_id]["subscriptions"], ["a/+", "b"])
+        callback.assert_called_once_with("a/1", b"x")
+
+    def test_disconnect_keeps_subscriptions(self):
+        """
+        Test that disconnect() releases the module-side client but remembers the subscriptions.
+        """
+        self.client.subscribe("t")
+        self.client.connect()
+        self.client.disconnect()
+        self.assertEqual(self.emulator.mqtt, {})
+        self.assertIn("t", self.client.subscriptions)
+        self.assertEqual(self.emulator.commands[-1], "AT+CMQDISCON=0")
+
+    def test_topic_matches(self):
+        """
+        Test MQTT wildcard matching.
+        """
+        self.assertTrue(topic_matches("a/+/c", "a/b/c"))
+        self.assertTrue(topic_matches("a/#", "a/b/c"))
+        self.assertFalse(topic_matches("a/+", "a/b/c"))
+        self.assertFalse(topic_matches("a/b/c", "a/b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_outbox.py
+
+import json
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.outbox import Outbox
+from sim7020py.sim7020 import SIM7020
+
+
+class FakeClock:
+    """Millisecond tick source advanced by the test."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an outbox with a 1 s window and a 3 s latency bound on a fake clock.
+        """
+        self.clock = FakeClock()
+        self.send = MagicMock()
+        self.outbox = Outbox(self.send, window=1.0, max_latency=3.0, max_items=3, clock=self.clock)
+
+    def test_values_are_coalesced_after_window(self):
+        """
+        Test that values put within the window leave as one message, the latest value per key winning.
+        """
+        self.outbox.put("V1", 1)
+        self.clock.now = 500
+        self.outbox.put("V2", 2)
+        self.outbox.put("V1", 3)
+        self.assertFalse(self.outbox.poll())
+        self.clock.now = 1500
+        self.assertTrue(self.outbox.poll())
+        self.send.assert_called_once_with({"V1": 3, "V2": 2})
+        self.assertFalse(self.outbox.poll())
+
+    def test_max_latency_bounds_a_busy_stream(self):
+        """
+        Test that a steady stream of updates is still sent once the oldest value reaches max_latency.
+        """
+        for self.clock.now in range(0, 3000, 500):
+            self.outbox.put("V1", self.clock.now)
+            self.assertFalse(self.outbox.poll())
+        self.clock.now = 3000
+        self.assertTrue(self.outbox.poll())
+        self.send.assert_called_once_with({"V1": 2500})
+
+    def test_max_items_flushes_immediately(self):
+        """
+        Test that reaching max_items pending keys sends without waiting.
+        """
+        for pin in range(3):
+            self.outbox.put(pin, pin)
+        self.send.assert_called_once_with({0: 0, 1: 1, 2: 2})
+
+    def test_failed_send_keeps_values(self):
+        """
+        Test that values stay pending when the sender fails.
+        """
+        self.send.side_effect = OSError("no network")
+        self.outbox.put("V1", 1)
+        with self.assertRaises(OSError):
+            self.outbox.flush()
+        self.assertEqual(self.outbox.pending, {"V1": 1})
+
+    def test_mqtt_outbox_publishes_json(self):
+        """
+        Test that SIM7020.mqtt_outbox publishes the pending values as one JSON message.
+        """
+        emulator = SIM7020Emulator()
+        emulator.attached = True
+        sim7020 = SIM7020(transport=emulator)
+        sim7020.mqtt_new("broker")
+        sim7020.mqtt_connect("client")
+        outbox = sim7020.mqtt_outbox("ds/state")
+        outbox.put("temperature", 21.5)
+        outbox.put("lamp", 1)
+        outbox.flush()
+        self.assertEqual(len(emulator.published), 1)
+        topic, payload = emulator.published[0]
+        self.assertEqual((topic, json.loads(payload)), ("ds/state", {"temperature": 21.5, "lamp": 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# tests/test_parsers.py
+
+import unittest
+from sim7020py.blynk_integration import parse_pin_value
+from sim7020py.commands import ATCommandError
+from sim7020py.parsers import (
+    AttachState, CellInfo, NeighbourCell, PDPContext, Registration, SignalQuality,
+    find, find_all, parse_http, parse_line, split_fields,
+)
+
+
+class TestParsers(unittest.TestCase):
+
+    def test_split_fields_respects_quotes(self):
+        """Test that commas inside quoted strings do not split fields."""
+        self.assertEqual(split_fields('1,"a,b",3'), ["1", '"a,b"', "3"])
+        self.assertEqual(split_fields('1,"a,b",3', 1), ["1", '"a,b",3'])
+
+    def test_signal_quality(self):
+        """Test that +CSQ is parsed into integers."""
+        self.assertEqual(parse_line("+CSQ: 15,99"), SignalQuality(15, 99))
+
+    def test_attach_state(self):
+        """Test that +CGATT is parsed into a flag."""
+        self.assertEqual(find(["+CGATT: 1", "OK"], "+CGATT:"), AttachState(True))
+
+    def test_registration_query_and_urc(self):
+        """Test that the +CEREG query reply and URC forms are told apart."""
+        query = parse_line("+CEREG: 0,1")
+        self.assertEqual((query.n, query.stat), (0, 1))
+        self.assertTrue(query.registered)
+        urc = parse_line('+CEREG: 5,"1A2B","0C3D4E5F",9')
+        self.assertEqual(urc, Registration(None, 5, "1A2B", "0C3D4E5F", 9))
+
+    def test_pdp_context(self):
+        """Test that +CGCONTRDP yields the APN and the address without the subnet mask."""
+        context = parse_line('+CGCONTRDP: 1,5,"nbiot","10.0.0.2.255.255.255.0"')
+        self.assertIsInstance(context, PDPContext)
+        self.assertEqual(context.apn, "nbiot")
+        self.assertEqual(context.ip, "10.0.0.2")
+        self.assertIsNone(context.gateway)
+
+    def test_mqtt_message(self):
+        """Test that the +CMQPUB payload is decoded from hex."""
+        message = parse_line('+CMQPUB: 0,"ds/V0",1,0,0,4,"3235"')
+        self.assertEqual((message.topic, message.qos, message.payload), ("ds/V0", 1, b"25"))
+
+    def test_engineering_info(self):
+        """Test that +CENG serving and neighbour cell lines get their own records."""
+        cells = find_all(['+CENG: 2506,2,252,"0EE2A1C",-87,-9,-79,6,8,"2B0D",0,-11', "+CENG: 2506,2,101,-95",
+                          "OK"], "+CENG:")
+        self.assertIsInstance(cells[0], CellInfo)
+        self.assertEqual((cells[0].cell_id, cells[0].rsrp, cells[0].tac), ("0EE2A1C", -87, "2B0D"))
+        self.assertEqual(cells[1], NeighbourCell(2506, 2, 101, -95))
+
+    def test_http_response(self):
+        """Test that the status line and body of an HTTP reply are separated."""
+        http = parse_http(["+HTTPGET: 200,6", '["25"]', "OK"])
+        self.assertEqual((http.status, http.length, http.body), (200, 6, '["25"]'))
+
+    def test_http_headers(self):
+        """Test that header values are looked up case-insensitively."""
+        headers = parse_line('+CHTTPNMIH: 0,200,30,"Content-Type: application/json"')
+        self.assertEqual(headers.get("content-type"), "application/json")
+
+    def test_unknown_and_malformed_lines(self):
+        """Test that unknown prefixes are ignored and malformed lines raise ValueError."""
+        self.assertIsNone(parse_line("+CPIN: READY"))
+        self.assertIsNone(parse_line("OK"))
+        with self.assertRaises(ValueError):
+            parse_line("+CSQ: high,99")
+
+    def test_blynk_pin_value(self):
+        """Test that Blynk pin values are extracted from JSON array and bare bodies."""
+        self.assertEqual(parse_pin_value(["+HTTPGET: 200,6", '["25"]', "OK"]), "25")
+        self.assertEqual(parse_pin_value(['"25"', "OK"]), "25")
+        with self.assertRaises(ATCommandError):
+            parse_pin_value(["+HTTPGET: 400,5", "error", "OK"])
+
+
+if __name__ == '__main__':
+    unittest.main()
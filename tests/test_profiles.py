@@ -0,0 +1,81 @@
+# tests/test_profiles.py
+
+import time
+import unittest
+from sim7020py.commands import ATCommand
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.errors import ResponseTimeout
+from sim7020py.profiles import CommandProfile, PROFILES, command_name, profile_for
+
+
+class TestProfiles(unittest.TestCase):
+
+    def test_command_name(self):
+        """
+        Test that set, read and test forms and chained parts map to their profile keys.
+        """
+        self.assertEqual(command_name("AT+CGATT=1"), "AT+CGATT")
+        self.assertEqual(command_name("AT+CGATT?"), "AT+CGATT?")
+        self.assertEqual(command_name("AT+CGATT=?"), "AT+CGATT?")
+        self.assertEqual(command_name("+CEREG?"), "AT+CEREG?")
+        self.assertEqual(command_name("AT"), "AT")
+
+    def test_lookup(self):
+        """
+        Test that queries of slow commands are fast and unknown commands fall back to the engine timeout.
+        """
+        self.assertEqual(profile_for("AT+CGATT=1").timeout, 75)
+        self.assertIsNone(profile_for("AT+CGATT?").timeout)
+        self.assertIsNone(profile_for("AT+CSQ").timeout)
+        self.assertEqual(profile_for("AT+CHTTPSEND=0,0,\"/\"").urc, "+CHTTPNMIC:")
+
+    def test_chained_line_adds_timeouts(self):
+        """
+        Test that a chained line waits for the sum of its commands' timeouts.
+        """
+        profile = profile_for('AT+CFUN=1;+CGDCONT=1,"IP","nbiot";+CGATT=1', default_timeout=2)
+        self.assertEqual(profile.timeout, 10 + 2 + 75)
+        self.assertEqual(profile_for('AT+CMQPUB=0,"a;b",1,0,0,2,"3030"').timeout, 15)
+
+
+class TestProfiledCommands(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an engine with a short default timeout over the emulator.
+        """
+        self.emulator = SIM7020Emulator(latency={"+CSQ": 0.3})
+        self.profiles = dict(PROFILES)
+        self.at_command = ATCommand(transport=self.emulator, timeout=0.1, profiles=self.profiles)
+
+    def test_slow_command_uses_profile_timeout(self):
+        """
+        Test that a command slower than the engine timeout succeeds within its profile timeout.
+        """
+        self.profiles["AT+CSQ"] = CommandProfile(1)
+        self.assertEqual(self.at_command.get_signal_quality(), (15, 99))
+
+    def test_wait_for_completing_urc(self):
+        """
+        Test that wait_urc returns the reply followed by the profile's URC, and times out without it.
+        """
+        self.profiles["AT+CSQ"] = CommandProfile(0.5, urc="+CEREG:")
+        self.emulator.inject_urc("+CEREG: 1", delay=0.35)
+        self.assertEqual(self.at_command.send_command("AT+CSQ", wait_urc=True), ["+CSQ: 15,99", "OK", "+CEREG: 1"])
+        with self.assertRaises(ResponseTimeout):
+            self.at_command.send_command("AT+CSQ", wait_urc=True)
+
+    def test_default_and_per_call_timeout(self):
+        """
+        Test that commands without a profile use the engine timeout and a per-call timeout wins.
+        """
+        start = time.monotonic()
+        with self.assertRaises(ResponseTimeout):
+            self.at_command.send_command("AT+CSQ")
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.at_command.poll(1)  # Drain the late reply
+        self.assertIn("+CSQ: 15,99", self.at_command.send_command("AT+CSQ", timeout=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# tests/test_retry.py
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.retry import RetryPolicy
+
+
+class FakeClock:
+    """Millisecond tick source advanced by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += int(seconds * 1000)
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a fake clock whose sleep advances time instantly.
+        """
+        self.clock = FakeClock()
+
+    def policy(self, **kwargs):
+        return RetryPolicy(sleep=self.clock.sleep, clock=self.clock, **kwargs)
+
+    def test_exponential_backoff_until_success(self):
+        """
+        Test that waits double per retry and the result of the successful attempt is returned.
+        """
+        operation = MagicMock(side_effect=[OSError(), OSError(), OSError(), "ok"])
+        self.assertEqual(self.policy(max_attempts=5, jitter=0).call(operation, 1, key=2), "ok")
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0, 4.0])
+        operation.assert_called_with(1, key=2)
+
+    def test_gives_up_after_max_attempts(self):
+        """
+        Test that the last error is raised once the attempts are used up, without a final wait.
+        """
+        operation = MagicMock(side_effect=OSError("down"))
+        with self.assertRaises(OSError):
+            self.policy(max_attempts=3).call(operation)
+        self.assertEqual(operation.call_count, 3)
+        self.assertEqual(len(self.clock.sleeps), 2)
+
+    def test_deadline_bounds_total_time(self):
+        """
+        Test that no wait is started that would end after the deadline.
+        """
+        operation = MagicMock(side_effect=OSError())
+        with self.assertRaises(OSError):
+            self.policy(max_attempts=None, jitter=0, deadline=10).call(operation)
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0, 4.0])
+        self.assertLess(self.clock.now, 10000)
+
+    def test_jitter_and_max_delay(self):
+        """
+        Test that jittered waits stay within the configured fraction below the capped backoff.
+        """
+        policy = self.policy(jitter=0.5, max_delay=5.0)
+        for retry in range(1, 8):
+            delay = policy.backoff(retry)
+            expected = min(5.0, 2.0 ** (retry - 1))
+            self.assertTrue(expected / 2 <= delay <= expected)
+
+    def test_non_retryable_error_is_raised_immediately(self):
+        """
+        Test that errors rejected by the predicate are not retried.
+        """
+        operation = MagicMock(side_effect=ValueError())
+        with self.assertRaises(ValueError):
+            self.policy(retry_on=lambda e: isinstance(e, OSError)).call(operation)
+        operation.assert_called_once()
+
+    def test_decorator(self):
+        """
+        Test that the policy wraps a function.
+        """
+        calls = []
+
+        @self.policy()
+        def flaky(value):
+            calls.append(value)
+            if len(calls) < 2:
+                raise OSError()
+            return value * 2
+
+        self.assertEqual(flaky(21), 42)
+        self.assertEqual(calls, [21, 21])
+
+    def test_acall_awaits_injected_sleep(self):
+        """
+        Test that acall awaits the injected sleep instead of blocking.
+        """
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+
+        operation = MagicMock(side_effect=[OSError(), "ok"])
+
+        async def attempt():
+            return operation()
+
+        policy = RetryPolicy(jitter=0, sleep=self.fail, async_sleep=sleep)
+        self.assertEqual(asyncio.run(policy.acall(attempt)), "ok")
+        self.assertEqual(waits, [1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# tests/test_ringbuffer.py
+
+import io
+import unittest
+from sim7020py.ringbuffer import RingBuffer, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_ERROR
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_readline_across_wrap(self):
+        """Test that a line wrapping around the end of the buffer is returned intact."""
+        ring = RingBuffer(8)
+        ring.write(b"abcdef")
+        self.assertEqual(ring.read(5), b"abcde")
+        ring.write(b"gh\r\nij")
+        self.assertEqual(ring.readline(), b"fgh\r\n")
+        self.assertIsNone(ring.readline())
+        self.assertEqual(len(ring), 2)
+
+    def test_find_without_bytearray_find(self):
+        """Test that delimiters are found on buffers lacking find(), like MicroPython's bytearray."""
+        ring = RingBuffer(8)
+        ring._buf = memoryview(ring._buf)  # Indexable, but no find()
+        ring.write(b"abcdef")
+        ring.read(5)
+        ring.write(b"gh\nij")
+        self.assertEqual(ring.find(), 3)
+        self.assertEqual(ring.find(b"j"), 5)
+        self.assertEqual(ring.find(b"x"), -1)
+
+    def test_fill_uses_readinto(self):
+        """Test that fill reads from the stream directly into the buffer."""
+        ring = RingBuffer(16)
+        stream = io.BytesIO(b"OK\r\n")
+        self.assertEqual(ring.fill(stream, 4), 4)
+        self.assertEqual(ring.readline(), b"OK\r\n")
+
+    def test_drop_oldest(self):
+        """Test that OVERFLOW_DROP_OLDEST keeps the newest bytes."""
+        ring = RingBuffer(4, OVERFLOW_DROP_OLDEST)
+        ring.write(b"abcdef")
+        self.assertEqual(ring.read(4), b"cdef")
+        self.assertEqual(ring.dropped, 2)
+
+    def test_drop_newest(self):
+        """Test that OVERFLOW_DROP_NEWEST discards incoming bytes, also from the stream."""
+        ring = RingBuffer(4, OVERFLOW_DROP_NEWEST)
+        stream = io.BytesIO(b"abcdef")
+        self.assertEqual(ring.fill(stream, 6), 4)
+        self.assertEqual(ring.read(4), b"abcd")
+        self.assertEqual(stream.read(), b"")
+        self.assertEqual(ring.dropped, 2)
+
+    def test_error_policy(self):
+        """Test that OVERFLOW_ERROR raises OverflowError when full."""
+        ring = RingBuffer(4, OVERFLOW_ERROR)
+        ring.write(b"abc")
+        with self.assertRaises(OverflowError):
+            ring.write(b"de")
+
+
+if __name__ == "__main__":
+    unittest.main()
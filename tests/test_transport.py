@@ -0,0 +1,177 @@
+# tests/test_transport.py
+
+import os
+import pty
+import socket
+import threading
+import time
+import unittest
+from sim7020py.commands import ATCommand
+from sim7020py.emulator import SIM7020Emulator
+from sim7020py.transport import SocketTransport, PtyTransport
+
+
+class TestSocketTransport(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up a transport over one end of a connected socket pair.
+        """
+        self.modem, host_side = socket.socketpair()
+        self.transport = SocketTransport(None, None, sock=host_side)
+
+    def tearDown(self):
+        """
+        Clean up after each test.
+        """
+        self.transport.close()
+        self.modem.close()
+
+    def test_write_and_read(self):
+        """
+        Test that bytes travel both ways and any() reports pending input.
+        """
+        self.transport.write(b"AT\r\n")
+        self.assertEqual(self.modem.recv(16), b"AT\r\n")
+        self.assertEqual(self.transport.any(), 0)
+
+        self.modem.sendall(b"OK\r\n")
+        self.assertEqual(self.transport.any(), 4)
+        buf = bytearray(2)
+        self.assertEqual(self.transport.readinto(buf), 2)
+        self.assertEqual(bytes(buf), b"OK")
+        self.assertEqual(self.transport.any(), 2)
+
+    def test_at_command_over_socket(self):
+        """
+        Test that ATCommand runs unchanged over a socket transport.
+        """
+        def modem():
+            received.append(self.modem.recv(16))
+            self.modem.sendall(b"+CSQ: 15,99\r\nOK\r\n")
+
+        received = []
+        responder = threading.Thread(target=modem)
+        responder.start()
+        at_command = ATCommand(transport=self.transport)
+        self.assertEqual(at_command.get_signal_quality(), (15, 99))
+        responder.join()
+        self.assertEqual(received, [b"AT+CSQ\r\n"])
+
+    def test_wait_blocks_until_readable(self):
+        """
+        Test that wait() returns as soon as data arrives and False after the timeout.
+        """
+        self.assertFalse(self.transport.wait(20))
+        timer = threading.Timer(0.05, self.modem.sendall, (b"OK\r\n",))
+        timer.start()
+        self.assertTrue(self.transport.wait(1000))
+        self.assertEqual(self.transport.any(), 4)
+        timer.join()
+
+    def test_peer_close_raises_instead_of_spinning(self):
+        """
+        Test that data sent before the peer closed is still read, then any() and wait() raise.
+        """
+        self.modem.sendall(b"OK\r\n")
+        self.modem.close()
+        self.assertEqual(self.transport.any(), 4)
+        self.assertEqual(self.transport.readinto(bytearray(4)), 4)
+        with self.assertRaises(OSError):
+            self.transport.any()
+        with self.assertRaises(OSError):
+            self.transport.wait(1000)
+        with self.assertRaises(OSError):
+            ATCommand(transport=self.transport, timeout=1).send_command("AT")
+
+
+class CountingEmulator(SIM7020Emulator):
+    """Emulator counting how often the engine checks for input."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.checks = 0
+
+    def any(self) -> int:
+        self.checks += 1
+        return super().any()
+
+
+class TestWaiting(unittest.TestCase):
+
+    def test_command_wait_does_not_spin(self):
+        """
+        Test that a slow reply is awaited by blocking on the transport instead of polling it in a loop.
+        """
+        emulator = CountingEmulator(latency={"+CSQ": 0.2})
+        at_command = ATCommand(transport=emulator, timeout=1)
+        start = time.monotonic()
+        self.assertEqual(at_command.get_signal_quality(), (15, 99))
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertLess(emulator.checks, 10)
+
+    def test_poll_with_timeout_waits_for_urc(self):
+        """
+        Test that poll(timeout) sleeps until a delayed URC arrives and dispatches it.
+        """
+        emulator = SIM7020Emulator()
+        at_command = ATCommand(transport=emulator, timeout=1)
+        received = []
+        at_command.register_urc("+CEREG:", received.append)
+        emulator.inject_urc("+CEREG: 1", delay=0.05)
+        self.assertEqual(at_command.poll(0), 0)
+        self.assertEqual(at_command.poll(1), 1)
+        self.assertEqual(received, ["+CEREG: 1"])
+
+
+class TestPtyTransport(unittest.TestCase):
+
+    def test_write_and_read(self):
+        """
+        Test that the transport talks to the master side of a pseudo-terminal.
+        """
+        master, slave = pty.openpty()
+        transport = PtyTransport(os.ttyname(slave))
+        try:
+            transport.write(b"AT\r\n")
+            self.assertEqual(os.read(master, 16), b"AT\r\n")
+            os.write(master, b"OK\r\n")
+            buf = bytearray(8)
+            while not transport.any():
+                pass
+            self.assertEqual(transport.readinto(buf), 4)
+            self.assertEqual(bytes(buf[:4]), b"OK\r\n")
+        finally:
+            transport.close()
+            os.close(slave)
+            os.close(master)
+
+    def test_write_waits_for_full_buffer(self):
+        """
+        Test that a write larger than the terminal buffer blocks until the other side reads it.
+        """
+        master, slave = pty.openpty()
+        transport = PtyTransport(os.ttyname(slave))
+        data = b"x" * 65536
+        received = bytearray()
+
+        def reader():
+            while len(received) < len(data):
+                received.extend(os.read(master, 4096))
+
+        thread = threading.Thread(target=reader)
+        try:
+            timer = threading.Timer(0.05, thread.start)
+            timer.start()
+            self.assertEqual(transport.write(data), len(data))
+            timer.join()
+            thread.join(5)
+            self.assertEqual(bytes(received), data)
+        finally:
+            transport.close()
+            os.close(slave)
+            os.close(master)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/test_urc.py
+
+import unittest
+from unittest.mock import MagicMock
+from sim7020py.urc import URCDispatcher, parse_mqtt_message
+
+
+class TestURCDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Set up an empty dispatcher for each test.
+        """
+        self.dispatcher = URCDispatcher(backlog_size=2)
+
+    def test_solicited_line_is_not_urc(self):
+        """
+        Test that a line answering the pending command is kept in the reply.
+        """
+        self.assertFalse(self.dispatcher.is_urc("+CSQ: 15,99", "AT+CSQ"))
+        self.assertTrue(self.dispatcher.is_urc("+CSQ: 15,99", "AT+CGATT=1"))
+        self.assertFalse(self.dispatcher.is_urc("OK", "AT"))
+
+    def test_mqtt_downlink_is_always_urc(self):
+        """
+        Test that +CMQPUB is treated as unsolicited even while publishing.
+        """
+        self.assertTrue(self.dispatcher.is_urc('+CMQPUB: 0,"t",1,0,0,2,"31"', 'AT+CMQPUB=0,"t",1,0,0,2,"31"'))
+
+    def test_dispatch_to_registered_handler(self):
+        """
+        Test that dispatch calls the handlers registered for the line prefix.
+        """
+        handler = MagicMock()
+        self.dispatcher.register("+CEREG:", handler)
+        self.assertTrue(self.dispatcher.dispatch("+CEREG: 1"))
+        handler.assert_called_once_with("+CEREG: 1")
+
+        self.dispatcher.unregister("+CEREG:", handler)
+        self.assertFalse(self.dispatcher.dispatch("+CEREG: 5"))
+
+    def test_failing_handler_is_isolated(self):
+        """
+        Test that an exception in one handler is logged and the other handlers still run.
+        """
+        handler = MagicMock()
+        self.dispatcher.register("+CEREG:", MagicMock(side_effect=RuntimeError("boom")))
+        self.dispatcher.register("+CEREG:", handler)
+        self.assertTrue(self.dispatcher.dispatch("+CEREG: 1"))
+        handler.assert_called_once_with("+CEREG: 1")
+
+    def test_backlog_is_bounded(self):
+        """
+        Test that unhandled URCs are kept in a bounded backlog.
+        """
+        for stat in range(4):
+            self.dispatcher.dispatch(f"+CEREG: {stat}")
+        self.assertEqual(self.dispatcher.backlog, ["+CEREG: 2", "+CEREG: 3"])
+
+    def test_hold_and_release(self):
+        """
+        Test that held URCs are delivered in order on release, and only the first holder releases.
+        """
+        handler = MagicMock()
+        self.dispatcher.register("+CEREG:", handler)
+        self.assertTrue(self.dispatcher.hold())
+        self.assertFalse(self.dispatcher.hold())
+        self.dispatcher.dispatch("+CEREG: 1")
+        self.dispatcher.dispatch("+CEREG: 5")
+        handler.assert_not_called()
+        self.assertEqual(self.dispatcher.release(), 2)
+        self.assertEqual([call.args[0] for call in handler.call_args_list], ["+CEREG: 1", "+CEREG: 5"])
+
+    def test_parse_mqtt_message(self):
+        """
+        Test that a +CMQPUB URC is decoded into topic and payload.
+        """
+        topic, payload = parse_mqtt_message('+CMQPUB: 0,"downlink/ds/Integer V0",1,0,0,2,"31"')
+        self.assertEqual(topic, "downlink/ds/Integer V0")
+        self.assertEqual(payload, b"1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,10 @@ from sim7020py.utils import (
     format_at_command,
     handle_timeout,
     extract_json_data,
+    hexlify_into,
+    log,
 )
+from sim7020py.logger import INFO, WARNING, ERROR
 
 class TestUtils(unittest.TestCase):
 
@@ -100,6 +103,19 @@ class TestUtils(unittest.TestCase):
     #     response = ["Invalid JSON"]
     #     result = extract_json_data(response)
     #     self.assertIsNone(result)
+    def test_hexlify_into(self):
+        """Test hexlify_into encodes a slice into a preallocated buffer."""
+        buf = bytearray(8)
+        self.assertEqual(hexlify_into(b"\x00\xab\x10\xff", buf, 1, 3), 4)
+        self.assertEqual(buf[:4], b"ab10")
+
+    @patch("sim7020py.utils.logger")
+    def test_log_level_names(self, mock_logger):
+        """Test log maps level aliases and lowercase names, and falls back to INFO for unknown names."""
+        cases = (("WARN", WARNING), ("warning", WARNING), ("CRITICAL", ERROR), ("NOTICE", INFO), (ERROR, ERROR))
+        for name, level in cases:
+            log(name, "message %s", 1)
+            mock_logger.log.assert_called_with(level, "message %s", 1)
 
 if __name__ == "__main__":
     unittest.main()